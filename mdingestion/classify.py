@@ -1,5 +1,7 @@
 import os
+import math
 import json
+import functools
 import Levenshtein as lvs
 # import textdistance
 import networkx as nx
@@ -9,6 +11,9 @@ from .format import format_value
 import logging
 
 CFG_DIR = os.path.join(os.path.abspath(os.path.dirname(__file__)), '..', 'etc')
+CLASSIFIER = None
+# size of the memo of the matched disciplines of each token
+TOKEN_CACHE_SIZE = 8192
 
 
 def similarity(string1, string2):
@@ -28,10 +33,58 @@ def tokenize(text):
     return tokens
 
 
+class DisciplineIndex(object):
+    """
+    Index over the normalized discipline names to find all names with a
+    similarity ratio >= threshold to a token.
+
+    Names are bucketed by length and only the buckets which can reach the
+    threshold are compared with the Levenshtein ratio, so the result is
+    the same as comparing against all names.
+    """
+    def __init__(self, disciplines, threshold=0.9):
+        self.threshold = threshold
+        self.names = list(disciplines)
+        self._buckets = {}
+        self._candidates = {}
+        for name in self.names:
+            normalized = name.lower()
+            self._buckets.setdefault(len(normalized), []).append((normalized, name))
+
+    def candidates(self, length):
+        """Returns all (normalized, name) pairs which may match a token of the given length."""
+        if length not in self._candidates:
+            # ratio = 2 * lcs / (len1 + len2) <= 2 * min(len1, len2) / (len1 + len2)
+            min_length = math.floor(length * self.threshold / (2 - self.threshold))
+            max_length = math.ceil(length * (2 - self.threshold) / self.threshold)
+            candidates = []
+            for _length in range(min_length, max_length + 1):
+                candidates.extend(self._buckets.get(_length, []))
+            self._candidates[length] = candidates
+        return self._candidates[length]
+
+    def match(self, token):
+        token = token.lower()
+        return [name for normalized, name in self.candidates(len(token))
+                if lvs.ratio(token, normalized) >= self.threshold]
+
+
+def get_classifier():
+    """Returns the classifier shared by all readers of this process."""
+    global CLASSIFIER
+    if not CLASSIFIER:
+        CLASSIFIER = Classify()
+    return CLASSIFIER
+
+
 class Classify(object):
     def __init__(self):
         self._disc_graph = None
         self._discipines = None
+        self._ancestors = None
+        self._index = None
+        # bounded LRU memo of the matches of each token across records
+        self._token_matches = functools.lru_cache(maxsize=TOKEN_CACHE_SIZE)(self._match_token)
 
     def load_disciplines(self):
         fname = os.path.join(CFG_DIR, 'b2find_disciplines.json')
@@ -48,6 +101,10 @@ class Classify(object):
                 end = nodes[2]
                 if start != end:
                     self._disc_graph.add_edge(start, end)
+            # precompute ancestor closure of each discipline
+            self._ancestors = {
+                node: set(nx.ancestors(self._disc_graph, node)) for node in self._disc_graph.nodes}
+            self._index = DisciplineIndex(self._disc_graph.nodes)
         return self._disc_graph.nodes
 
     @property
@@ -64,18 +121,26 @@ class Classify(object):
         matches = set()
         tokens = tokenize(text)
         for token in tokens:
-            for discipline in self.discipines:
-                try:
-                    ratio = similarity(token, discipline)
-                except Exception:
-                    logging.warning(f'{token} can not be compared to {discipline}')
-                    continue
-                if ratio >= 0.9:
-                    matches.add(discipline)
-                    matches.update(nx.ancestors(self._disc_graph, discipline))
+            matches.update(self.match_token(token))
         result = list(matches)
         if not result:
             result = [default]
         else:
             result.sort()
         return result
+
+    def match_token(self, token):
+        """
+        Returns the disciplines (with ancestors) matching a single token.
+        Results are memoized across records.
+        """
+        return self._token_matches(token)
+
+    def _match_token(self, token):
+        if self._index is None:
+            self._discipines = self.load_disciplines()
+        matches = set()
+        for discipline in self._index.match(token):
+            matches.add(discipline)
+            matches.update(self._ancestors[discipline])
+        return frozenset(matches)
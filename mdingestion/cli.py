@@ -68,8 +68,15 @@ def list(ctx, community, summary, productive, out):
 @click.option('--insecure', '-k', is_flag=True, help='Disable SSL verification')
 @click.option('--username', '-u', help='Username for secured OAI server')
 @click.option('--password', '-p', help='Password for secured OAI server')
+@click.option('--workers', '-w', type=click.IntRange(min=1), default=1,
+              help='Number of communities harvested concurrently')
+@click.option('--per-host', type=click.IntRange(min=1), default=1, help='Number of concurrent harvests on the same host')
+@click.option('--incremental', is_flag=True, help='Harvest only records changed since the last harvest')
+@click.option('--resume', is_flag=True, help='Resume an interrupted OAI harvest')
+@click.option('--store', is_flag=True, help='Write raw records to a packed record store')
 @click.pass_context
-def harvest(ctx, community, url, fromdate, clean, limit, insecure, username, password):
+def harvest(ctx, community, url, fromdate, clean, limit, insecure, username, password, workers, per_host,
+            incremental, resume, store):
     try:
         cmd = Harvest(
             community=community,
@@ -81,7 +88,8 @@ def harvest(ctx, community, url, fromdate, clean, limit, insecure, username, pas
             fromdate = str(fromdate.date())
         cmd.harvest(fromdate=fromdate, clean=clean, limit=limit,
                     dry_run=ctx.obj['dry_run'], silent=ctx.obj['silent'],
-                    username=username, password=password)
+                    username=username, password=password, workers=workers, per_host=per_host,
+                    incremental=incremental, resume=resume, store=store)
     except UserInfo as e:
         click.echo(f'{e}')
     except Exception as e:
@@ -95,14 +103,16 @@ def harvest(ctx, community, url, fromdate, clean, limit, insecure, username, pas
 @click.option('--limit', type=int, help='Limit')
 @click.option('--force', is_flag=True, help='force')
 @click.option('--linkcheck/--no-linkcheck', default=False, is_flag=True, help='do not check if URLs resolve in validation')
+@click.option('--workers', '-w', type=int, default=1, help='Number of worker processes')
+@click.option('--incremental', is_flag=True, help='Map only records changed since the last map')
 @click.pass_context
-def map(ctx, community, format, limit, force, linkcheck):
+def map(ctx, community, format, limit, force, linkcheck, workers, incremental):
     try:
         map = Map(
             community=community,
             outdir=ctx.obj['outdir'],)
         map.run(format=format, force=force, linkcheck=linkcheck, limit=limit,
-                silent=ctx.obj['silent'])
+                silent=ctx.obj['silent'], workers=workers, incremental=incremental)
     except Exception as e:
         logging.critical(f"map: {e}", exc_info=True)
         raise click.ClickException(f"{e}")
@@ -118,13 +128,19 @@ def map(ctx, community, format, limit, force, linkcheck):
 @click.option('--no-update', is_flag=True, help='do not update existing record')
 @click.option('--https', '-s', is_flag=True, help='enable upload on https')
 @click.option('--insecure', '-k', is_flag=True, help='Disable SSL verification')
+@click.option('--incremental', is_flag=True, help='Upload only records changed since the last upload')
+@click.option('--pool-size', type=click.IntRange(min=1), default=10, help='Number of connections kept alive to CKAN')
+@click.option('--workers', '-w', type=click.IntRange(min=1), default=1, help='Number of concurrent uploads')
+@click.option('--prefetch', is_flag=True, help='Fetch existing datasets first to create, update or skip records')
 @click.pass_context
-def upload(ctx, community, iphost, auth, target, from_, limit, no_update, https, insecure):
+def upload(ctx, community, iphost, auth, target, from_, limit, no_update, https, insecure, incremental, pool_size,
+           workers, prefetch):
     try:
         upload = Upload(outdir=ctx.obj['outdir'], community=community)
         upload.run(iphost=iphost, auth=auth, target=target, from_=from_, limit=limit,
                    no_update=no_update, verify=not insecure,
-                   silent=ctx.obj['silent'], https=https)
+                   silent=ctx.obj['silent'], https=https, incremental=incremental, pool_size=pool_size,
+                   workers=workers, prefetch=prefetch)
     except Exception as e:
         logging.critical(f"upload: {e}", exc_info=True)
         raise click.ClickException(f"{e}")
@@ -137,14 +153,20 @@ def upload(ctx, community, iphost, auth, target, from_, limit, no_update, https,
 @click.option('--fromdate', type=click.DateTime(formats=["%Y-%m-%d"]),
               help='Harvest records not older than given date.')
 @click.option('--fromdays', type=int, help='Harvest records not older than given days ago.')
+@click.option('--incremental', is_flag=True, help='Harvest, map and upload only records changed since the last run')
 @click.option('--clean', is_flag=True, help='Clean output folder before harvesting')
 @click.option('--limit', type=int, help='Limit')
 @click.option('--linkcheck/--no-linkcheck', default=False, is_flag=True, help='do not check if URLs resolve in validation')
 @click.option('--no-update', is_flag=True, help='do not update existing record')
 @click.option('--https', '-s', is_flag=True, help='enable upload on https')
 @click.option('--insecure', '-k', is_flag=True, help='Disable SSL verification')
+@click.option('--workers', '-w', type=int, default=1, help='Number of worker processes for mapping')
+@click.option('--store', is_flag=True, help='Write raw records to a packed record store')
+@click.option('--upload-workers', type=click.IntRange(min=1), default=1, help='Number of concurrent uploads')
+@click.option('--prefetch', is_flag=True, help='Fetch existing datasets first to create, update or skip records')
 @click.pass_context
-def combine(ctx, community, iphost, auth, fromdate, fromdays, clean, limit, linkcheck, no_update, https, insecure):
+def combine(ctx, community, iphost, auth, fromdate, fromdays, incremental, clean, limit, linkcheck, no_update, https,
+            insecure, workers, store, upload_workers, prefetch):
     try:
         # harvest
         cmd = Harvest(
@@ -157,18 +179,20 @@ def combine(ctx, community, iphost, auth, fromdate, fromdays, clean, limit, link
         if fromdate:
             fromdate = str(fromdate.date())
         cmd.harvest(fromdate=fromdate, clean=clean, limit=limit,
-                    dry_run=ctx.obj['dry_run'], silent=ctx.obj['silent'])
+                    dry_run=ctx.obj['dry_run'], silent=ctx.obj['silent'], incremental=incremental,
+                    store=store)
         # map
         cmd = Map(
             community=community,
             outdir=ctx.obj['outdir'],)
         cmd.run(format='ckan', force=False, linkcheck=linkcheck, limit=limit,
-                silent=ctx.obj['silent'])
+                silent=ctx.obj['silent'], workers=workers, incremental=incremental)
         # upload
         upload = Upload(outdir=ctx.obj['outdir'], community=community)
         upload.run(iphost=iphost, auth=auth, target='ckan', from_=None, limit=limit,
                    no_update=no_update, verify=not insecure,
-                   silent=ctx.obj['silent'], https=https)
+                   silent=ctx.obj['silent'], https=https, incremental=incremental,
+                   workers=upload_workers, prefetch=prefetch)
     except UserInfo as e:
         click.echo(f'{e}')
     except Exception as e:
@@ -183,11 +207,15 @@ def combine(ctx, community, iphost, auth, fromdate, fromdays, clean, limit, link
 @click.option('--iphost', '-i', required=True, help='IP address of CKAN instance')
 @click.option('--auth', required=True, help='CKAN API key')
 @click.option('--insecure', '-k', is_flag=True, help='Disable SSL verification')
+@click.option('--https', '-s', is_flag=True, help='enable purge on https')
+@click.option('--workers', '-w', type=click.IntRange(min=1), default=1,
+              help='Number of concurrent purge requests')
 @click.pass_context
-def purge(ctx, community, dataset, iphost, auth, insecure):
+def purge(ctx, community, dataset, iphost, auth, insecure, https, workers):
     try:
-        purge = Purge(community=community)
-        purge.run(iphost=iphost, dataset=dataset, auth=auth, verify=not insecure, silent=ctx.obj['silent'])
+        purge = Purge(community=community, outdir=ctx.obj['outdir'])
+        purge.run(iphost=iphost, dataset=dataset, auth=auth, verify=not insecure, silent=ctx.obj['silent'],
+                  https=https, workers=workers)
     except Exception as e:
         logging.critical(f"purge: {e}", exc_info=True)
         raise click.ClickException(f"{e}")
@@ -8,4 +8,5 @@ class Command(object):
         self.outdir = outdir or os.path.curdir
         self.datadir = os.path.join(self.outdir, 'oaidata')
         self.summary_dir = os.path.join(self.outdir, 'summary')
+        self.state_dir = os.path.join(self.outdir, 'state')
         self.verify = verify
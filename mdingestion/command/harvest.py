@@ -1,36 +1,131 @@
+import os
+from datetime import datetime
 from tqdm import tqdm
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 from .base import Command
 from ..harvester import harvester
-from ..exceptions import UserInfo
+from ..harvester.state import HarvestState
+from ..exceptions import UserInfo, HarvesterError
 from ..community import community, communities
 
 import logging
 
 
+class Scheduler(object):
+    """
+    Runs jobs of several communities concurrently.
+
+    Not more than `workers` jobs run at the same time and not more than `per_host`
+    jobs on the same host. Jobs with the same URL are never run at the same time.
+    """
+    def __init__(self, workers=4, per_host=1):
+        if workers < 1 or per_host < 1:
+            raise ValueError(f"workers and per_host must be at least 1: workers={workers}, per_host={per_host}")
+        self.workers = workers
+        self.per_host = per_host
+
+    def is_ready(self, url, running):
+        host = urlparse(url).netloc
+        if url in running:
+            return False
+        return len([_url for _url in running if urlparse(_url).netloc == host]) < self.per_host
+
+    def run(self, jobs, func, silent=False):
+        """
+        Runs func(identifier) for each (identifier, url) in jobs.
+        Returns a report with status, records and error for each identifier.
+        """
+        report = {}
+        pending = list(jobs)
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.workers) as executor, \
+                tqdm(total=len(pending), ascii=True, desc="Harvesting", unit=' community',
+                     disable=silent) as progress:
+            while pending or running:
+                for identifier, url in list(pending):
+                    if len(running) >= self.workers:
+                        break
+                    if self.is_ready(url, [_url for _, _url in running.values()]):
+                        pending.remove((identifier, url))
+                        running[executor.submit(func, identifier)] = (identifier, url)
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    identifier, _ = running.pop(future)
+                    try:
+                        report[identifier] = dict(status='ok', records=future.result(), error=None)
+                    except Exception as e:
+                        logging.error(f"Harvesting of {identifier} failed.", exc_info=e)
+                        report[identifier] = dict(status='failed', records=0, error=f"{e}")
+                    progress.update(1)
+        return report
+
+
 class Harvest(Command):
 
     def harvest(self, fromdate=None, clean=False, limit=None, dry_run=False, silent=False,
-                username=None, password=None):
+                username=None, password=None, workers=1, per_host=1, incremental=False, resume=False, store=False):
         _communities = communities(self.community)
-        for identifier in tqdm(_communities,
-                               ascii=True,
-                               desc=f"Harvesting {self.community}",
-                               # position=0,
-                               unit=' community',
-                               total=len(_communities),
-                               disable=len(_communities) == 1 or silent):
+        if len(_communities) > 1:
+            # several communities: report per community and continue after failures (also with one worker)
+            self.harvest_concurrent(_communities, workers=workers, per_host=per_host,
+                                    fromdate=fromdate, clean=clean, limit=limit, dry_run=dry_run, silent=silent,
+                                    username=username, password=password, incremental=incremental,
+                                    resume=resume, store=store)
+            return
+        for identifier in _communities:
             try:
-                self._harvest(identifier, fromdate=fromdate, clean=clean, limit=limit,
-                              dry_run=dry_run, silent=silent, username=username, password=password)
+                count = self._harvest(identifier, fromdate=fromdate, clean=clean, limit=limit,
+                                      dry_run=dry_run, silent=silent, username=username, password=password,
+                                      incremental=incremental, resume=resume, store=store)
             except Exception:
                 msg = f"Harvesting of {identifier} failed."
                 logging.exception(msg)
                 raise Exception(msg)
+            if dry_run:
+                raise UserInfo(f'Found records={count}')
+
+    def harvest_concurrent(self, _communities, workers=4, per_host=1, fromdate=None, clean=False, limit=None,
+                           dry_run=False, silent=False, username=None, password=None, incremental=False,
+                           resume=False, store=False):
+        def _harvest(identifier):
+            # no progress bars per community
+            return self._harvest(identifier, fromdate=fromdate, clean=clean, limit=limit,
+                                 dry_run=dry_run, silent=True, username=username, password=password,
+                                 incremental=incremental, resume=resume, store=store)
+
+        jobs = [(identifier, community(identifier).url or '') for identifier in _communities]
+        report = Scheduler(workers=workers, per_host=per_host).run(jobs, _harvest, silent=silent)
+        if not silent:
+            self.print_report(report)
+        failed = [identifier for identifier, result in report.items() if result['status'] != 'ok']
+        if failed:
+            raise HarvesterError(f"Harvesting failed for {len(failed)}/{len(report)} communities: {', '.join(failed)}")
+
+    def print_report(self, report):
+        print(f"\nHarvesting Summary for {self.community}:")
+        for identifier in sorted(report.keys()):
+            result = report[identifier]
+            if result['status'] == 'ok':
+                print(f"\t{identifier}: ok, records={result['records']}")
+            else:
+                print(f"\t{identifier}: failed, {result['error']}")
+
+    def state(self, identifier):
+        return HarvestState(os.path.join(self.state_dir, f"{identifier}.json"))
 
     def _harvest(self, identifier, fromdate=None, clean=False, limit=None, dry_run=False, silent=False,
-                 username=None, password=None):
+                 username=None, password=None, incremental=False, resume=False, store=False):
         _community = community(identifier)
+        state = self.state(identifier)
+        if resume and clean:
+            logging.warning(f"clean is ignored when resuming. community={identifier}")
+            clean = False
+        if incremental and not fromdate:
+            fromdate = state.fromdate
+            logging.info(f"incremental harvesting of {identifier} from {fromdate}")
+        started = datetime.now().isoformat(timespec='seconds')
         _harvester = harvester(
             community=_community.identifier,
             url=_community.url,
@@ -45,13 +140,29 @@ class Harvest(Command):
             outdir=self.datadir,
             verify=self.verify,
             username=username,
-            password=password)
+            password=password,
+            state=state,
+            resume=resume,
+            store=store)
         if dry_run:
-            raise UserInfo(f'Found records={_harvester.total(limited=False)}')
-        for record in tqdm(_harvester.harvest(),
-                           ascii=True,
-                           desc=f"Harvesting {identifier}",
-                           unit=' records',
-                           total=_harvester.total(),
-                           disable=silent):
-            _harvester.write_record(record, pretty_print=True)
+            # number of records found, nothing is harvested
+            return _harvester.total(limited=False)
+        count = 0
+        with _harvester.write_behind():
+            for record in tqdm(_harvester.harvest(),
+                               ascii=True,
+                               desc=f"Harvesting {identifier}",
+                               unit=' records',
+                               total=_harvester.total(),
+                               disable=silent):
+                _harvester.write_record(record, pretty_print=True)
+                count += 1
+        # a limited harvest is incomplete and must not move the watermark
+        if not limit:
+            state.update(
+                watermark=_harvester.watermark or state.watermark,
+                fromdate=fromdate,
+                started=started,
+                finished=datetime.now().isoformat(timespec='seconds'),
+                records=count)
+        return count
@@ -1,4 +1,8 @@
 import os
+import pathlib
+import itertools
+import collections
+import multiprocessing
 from tqdm import tqdm
 
 from .base import Command
@@ -6,9 +10,73 @@ from ..walker import Walker
 from ..community import community, communities
 from ..writer import writer
 from ..validator import Validator
+from ..manifest import Manifest
+from ..store import record_hash
+from ..format import cache_stats
 
 import logging
 
+# files per task sent to a worker process
+CHUNK_SIZE = 100
+# mapper of a worker process
+MAPPER = None
+
+
+def init_worker(format, force, linkcheck):
+    global MAPPER
+    MAPPER = Mapper(format=format, force=force, linkcheck=linkcheck)
+
+
+def map_chunk(args):
+    identifier, filenames = args
+    return MAPPER.map_files(identifier, filenames)
+
+
+def chunks(items, size):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class Mapper(object):
+    """
+    Maps, validates and writes records.
+    Used by the map command in the main process or in the worker processes.
+    """
+    def __init__(self, format, force=False, linkcheck=True, validator=None):
+        self.writer = writer(format)
+        self.validator = validator or Validator(linkcheck=linkcheck)
+        self.force = force
+
+    def map_file(self, _community, filename):
+        logging.info(f'mapping {filename}')
+        stats = cache_stats()
+        doc = _community.read(filename)
+        logging.info(f'map: community={_community.identifier}, file={filename}')
+        result = self.validator.check(doc)
+        result['raw'] = record_hash(filename)
+        result['timings'] = _community.reader.timings
+        result['format_cache'] = cache_stats(since=stats)
+        result['version'] = None
+        result['written'] = self.force or result['valid']
+        if result['written']:
+            # the fields validated above are mapped and written, not built again from the doc
+            data = self.writer.write(doc, filename, fields=result['fields'])
+            result['version'] = data.get('version')
+        return result
+
+    def map_files(self, identifier, filenames):
+        _community = community(identifier)
+        results = [(filename, self.map_file(_community, filename)) for filename in filenames]
+        # the links of the chunk are checked in threads, the broken links are complete when they are done
+        self.validator.lc.wait()
+        return results, _community.errors, dict(self.validator.lc.broken)
+
 
 class Map(Command):
     def __init__(self, **args):
@@ -18,7 +86,8 @@ class Map(Command):
         self.writer = None
         self.summary = {}
 
-    def run(self, format=format, force=False, linkcheck=True, limit=None, silent=False):
+    def run(self, format=format, force=False, linkcheck=True, limit=None, silent=False, workers=1,
+            incremental=False):
         # TODO: refactor community loop
         _communities = communities(self.community)
         show = len(_communities) == 1 and not silent
@@ -31,7 +100,7 @@ class Map(Command):
                                disable=len(_communities) == 1 or silent):
             self._community = community(identifier)
             self._run(format=format, force=force, linkcheck=linkcheck, limit=limit,
-                      show=show, silent=silent)
+                      show=show, silent=silent, workers=workers, incremental=incremental)
         if len(_communities) > 1 and not silent:
             self.print_concise_summary()
 
@@ -41,37 +110,107 @@ class Map(Command):
             summary = self.summary[name]
             print(f"\t{name}: {summary['valid']}/{summary['total']}")
 
+    def manifest(self, identifier):
+        return Manifest(os.path.join(self.state_dir, f"{identifier}.manifest.jsonl"))
+
     def _run(self, format=format, force=False, linkcheck=True, limit=None,
-             show=True, silent=False):
+             show=True, silent=False, workers=1, incremental=False):
         limit = limit or -1
-        # TODO: refactor writer init
-        self.writer = writer(format)
+        manifest = self.manifest(self._community.identifier)
         # TODO: refactor validator usage
         validator = Validator(linkcheck=linkcheck)
         validator.summary['_invalid_files_'] = []
-        count = 0
+        mapper = Mapper(format, force=force, validator=validator)
+        # TODO: refactor writer init
+        self.writer = mapper.writer
+        filenames = self.walk()
+        if limit > 0:
+            filenames = itertools.islice(filenames, limit)
+        if incremental:
+            records = self.skip_unchanged(filenames, manifest, mapper.writer, force=force)
+        else:
+            records = ((filename, None) for filename in filenames)
+        if workers > 1:
+            results = self.map_parallel(records, format, force=force, linkcheck=linkcheck,
+                                        workers=workers, validator=validator)
+        else:
+            results = self.map_serial(records, mapper)
         success = True
-        for filename in tqdm(self.walk(), ascii=True, desc=f"Map {self._community.identifier} to {format}",
-                             unit=' records', total=limit, disable=silent):
-            if limit > 0 and count >= limit:
-                break
-            logging.info(f'mapping {filename}')
-            doc = self.map(filename)
-            is_valid = validator.validate(doc)
-            if force or is_valid:
-                self.writer.write(doc, filename)
+        for filename, result in tqdm(results, ascii=True, desc=f"Map {self._community.identifier} to {format}",
+                                     unit=' records', total=limit, disable=silent):
+            validator.update(result)
+            if result['written']:
                 validator.summary['written'] += 1
-            else:
+            if not result['valid'] and not force:
                 logging.warning(f"validation failed: {filename}")
                 success = False
                 validator.summary['_invalid_files_'].append(filename)
-            count += 1
+            if not result.get('skipped'):
+                manifest.update(pathlib.Path(filename).stem, raw=result['raw'], format=format,
+                                valid=result['valid'], written=result['written'], version=result['version'],
+                                fields=validator.summary_fields(result['fields']), invalid=result['invalid'])
+        manifest.save()
+        if linkcheck:
+            # the links of a serial map are still checked in threads
+            validator.lc.wait()
         validator.summary['_errors_'] = self._community.errors
         validator.write_summary(prefix=self._community.identifier, outdir=self.summary_dir, show=show)
         self.summary[self._community.identifier] = validator.concise_summary()
         if not success:
             logging.warning(f"some files are not valid. community={self._community.identifier}")
 
+    def skip_unchanged(self, filenames, manifest, writer, force=False):
+        """
+        Yields (filename, result) with the result of the last map for records
+        which are not changed since and (filename, None) for all other records.
+        The result of a skipped record has the fields of the last map for the summary,
+        records mapped without stored fields are mapped again.
+        """
+        for filename in filenames:
+            uid = pathlib.Path(filename).stem
+            entry = manifest.get(uid)
+            if manifest.is_mapped(uid, record_hash(filename), writer.format) and 'fields' in entry \
+                    and (entry['valid'] or force) and writer.output(filename).exists():
+                logging.info(f'skipping unchanged {filename}')
+                yield filename, dict(valid=entry['valid'], written=False, skipped=True, fields=entry['fields'],
+                                     invalid=entry.get('invalid'), raw=entry['raw'], version=entry.get('version'))
+            else:
+                yield filename, None
+
+    def map_serial(self, records, mapper):
+        for filename, result in records:
+            yield filename, result or mapper.map_file(self._community, filename)
+
+    def map_parallel(self, records, format, force=False, linkcheck=True, workers=2, validator=None):
+        """
+        Maps the records in worker processes.
+        The results are returned in the order of the walk, so that the summary
+        is the same as with a serial run.
+        """
+        # the reader of this process is not used, collect the errors of the workers in it
+        errors = self._community.errors
+        broken_links = {}
+        # chunks of (filename, result) in the order of the walk, filled by the task handler thread of the pool
+        pending = collections.deque()
+
+        def _tasks():
+            for chunk in chunks(records, CHUNK_SIZE):
+                pending.append(chunk)
+                # only the records without the result of the last map are mapped in the workers
+                yield self._community.identifier, [filename for filename, result in chunk if not result]
+
+        with multiprocessing.Pool(workers, initializer=init_worker, initargs=(format, force, linkcheck)) as pool:
+            for results, _errors, _broken_links in pool.imap(map_chunk, _tasks()):
+                for key, values in _errors.items():
+                    errors.setdefault(key, []).extend(values)
+                broken_links.update(_broken_links)
+                # skipped records keep their place in the walk between the mapped ones
+                mapped = iter(results)
+                for filename, result in pending.popleft():
+                    yield (filename, result) if result else next(mapped)
+        if linkcheck:
+            validator.summary['broken_links'] = broken_links
+
     def walk(self):
         path = os.path.join(self._community.identifier, 'raw')
         for filename in self.walker.walk(path=path, ext=self._community.extension):
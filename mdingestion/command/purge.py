@@ -1,49 +1,124 @@
 import os
-from tqdm import tqdm
 import json
-from urllib import parse
-from ckanapi import RemoteCKAN, NotFound, NotAuthorized
-from requests.exceptions import ConnectionError
+import pathlib
+from itertools import repeat
+from concurrent.futures import ThreadPoolExecutor
+from tqdm import tqdm
+from ckanapi import NotFound, NotAuthorized
 
 from .base import Command
-from ..community import community, communities
+from .upload import connect
 
 import logging
 
 agent = 'b2f'
 
 
-def get_dataset_list(group, iphost):
-    '''get_dataset_list'''
-    dataset_list = []
+def dataset_pages(ckan, group, start_after=None, rows=1000, verify=True):
+    """
+    Yields pages of the dataset names of the group sorted by name.
+    The pages continue after the last name of the previous page,
+    so that purging the datasets does not change the following pages.
+    """
+    requests_kwargs = {'verify': verify}
+    last = start_after
+    while True:
+        fq = f'groups:{group}'
+        if last:
+            fq += f' AND name:{{"{last}" TO *]'
+        answer = ckan.call_action('package_search', {
+            'fq': fq,
+            'fl': 'name',
+            'sort': 'name asc',
+            'rows': rows,
+            'include_private': True,
+        }, requests_kwargs=requests_kwargs)
+        names = [dataset['name'] for dataset in answer['results']]
+        if not names:
+            break
+        yield names
+        last = names[-1]
+
 
-    with RemoteCKAN(f"http://{iphost}", user_agent=agent) as ckan:
-        packages = ckan.action.member_list(id=group, object_type='package')
-        for p in packages:
-            dataset_list.append(p[0])
+def purge_dataset(ckan, dataset_id, verify=True):
+    """Purges the dataset and returns the status."""
+    try:
+        ckan.call_action('dataset_purge', {'id': dataset_id}, requests_kwargs={'verify': verify})
+        logging.info(f"Dataset '{dataset_id}' purged")
+        status = 'purged'
+    except NotAuthorized:
+        logging.warning(f"Dataset '{dataset_id}' not authorized")
+        status = 'not authorized'
+    except NotFound:
+        logging.warning(f"Dataset '{dataset_id}' not found")
+        status = 'not found'
+    return status
 
-    return dataset_list
 
+class PurgeLog(object):
+    """
+    Progress log of the purge of a group, written as JSON lines.
+    An interrupted purge continues after the last completed page
+    and skips the datasets already purged.
+    """
+    def __init__(self, filename):
+        self.filename = pathlib.Path(filename)
+        self.last = None
+        self.done = set()
+        self.load()
 
-def purge_dataset_list(dataset_list, iphost, apikey):
-    '''purge_dataset_list'''
-    with RemoteCKAN(f"http://{iphost}", apikey=apikey, user_agent=agent) as ckan:
-        for dataset_id in dataset_list:
-            try:
-                ckan.action.dataset_purge(id=dataset_id)
-                print('Dataset \'' + dataset_id + '\' purged')
-            except NotAuthorized:
-                print('Dataset \'' + dataset_id + '\' not authorized')
-            except NotFound:
-                print('Dataset \'' + dataset_id + '\' not found')
-    return True
+    def load(self):
+        if not self.filename.exists():
+            return
+        with self.filename.open() as fp:
+            for line in fp:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if 'last' in entry:
+                    self.last = entry['last']
+                else:
+                    self.done.add(entry['id'])
+
+    def write(self, **entry):
+        self.filename.parent.mkdir(parents=True, exist_ok=True)
+        with self.filename.open('a') as fp:
+            fp.write(json.dumps(entry) + '\n')
+
+    def remove(self):
+        if self.filename.exists():
+            self.filename.unlink()
 
 
 class Purge(Command):
     def run(self, iphost=None, dataset=None, auth=None, verify=True,
-            silent=False):
-        if self.community:
-            datasets = get_dataset_list(self.community, iphost=iphost)
-        else:
-            datasets = [dataset]
-        purge_dataset_list(datasets, iphost=iphost, apikey=auth)
+            silent=False, https=False, workers=1):
+        ckan = connect(host=iphost, apikey=auth, https=https, pool_size=max(10, workers), user_agent=agent)
+        try:
+            if self.community:
+                self.purge_group(ckan, self.community, verify=verify, silent=silent, workers=workers)
+            else:
+                print(f"Dataset '{dataset}' {purge_dataset(ckan, dataset, verify=verify)}")
+        finally:
+            ckan.close()
+
+    def purge_group(self, ckan, group, verify=True, silent=False, workers=1):
+        log = PurgeLog(os.path.join(self.state_dir, f"purge_{group}.jsonl"))
+        if log.last or log.done:
+            logging.info(f"Resuming purge of {group} after '{log.last}'")
+        stats = {}
+        with ThreadPoolExecutor(max_workers=workers) as executor, \
+                tqdm(ascii=True, desc=f"Purging {group}", unit=' datasets', disable=silent) as progress:
+            for names in dataset_pages(ckan, group, start_after=log.last, verify=verify):
+                todo = [name for name in names if name not in log.done]
+                # a page is purged by the workers, the results are returned in order
+                for name, status in zip(todo, executor.map(purge_dataset, repeat(ckan), todo, repeat(verify))):
+                    log.write(id=name, status=status)
+                    stats[status] = stats.get(status, 0) + 1
+                    progress.update(1)
+                log.write(last=names[-1])
+        log.remove()
+        if not silent:
+            print(f"Purged {group}: " + ', '.join(f"{key}={value}" for key, value in sorted(stats.items())))
+        return stats
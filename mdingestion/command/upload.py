@@ -1,38 +1,107 @@
 import os
+import time
+import pathlib
 from tqdm import tqdm
 import json
 from urllib import parse
-from ckanapi import RemoteCKAN, NotFound, NotAuthorized
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import requests
+from requests.adapters import HTTPAdapter
+from ckanapi import RemoteCKAN, NotFound, NotAuthorized, ValidationError
 from requests.exceptions import ConnectionError
 
 from .base import Command
 from ..walker import Walker
 from ..community import community, communities
+from ..manifest import Manifest
 
 import logging
 
 
-def upload(data, host=None, apikey=None, no_update=False, verify=True, https=False):
-    requests_kwargs = {'verify': verify}
+def session(pool_size=10):
+    """Returns a requests session which keeps up to pool_size connections alive."""
+    _session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    _session.mount('http://', adapter)
+    _session.mount('https://', adapter)
+    return _session
+
+
+def connect(host=None, apikey=None, https=False, pool_size=10, user_agent=None):
     proto = 'https' if https else 'http'
-    try:
-        with RemoteCKAN(f'{proto}://{host}', apikey=apikey) as ckan:
-            if no_update:
-                ckan.call_action('package_show', {'id': data['name']}, requests_kwargs=requests_kwargs)
-                logging.info("upload skip update")
-            else:
-                ckan.call_action('package_update', data, requests_kwargs=requests_kwargs)
-                logging.info("upload update")
-    except NotFound:
-        # TODO: clean up code ...
-        with RemoteCKAN(f'{proto}://{host}', apikey=apikey) as ckan:
+    return RemoteCKAN(f'{proto}://{host}', apikey=apikey, user_agent=user_agent, session=session(pool_size))
+
+
+def existing_datasets(ckan, group, verify=True, rows=1000):
+    """
+    Returns the names and versions of the datasets of the group with paged package_search.
+    Returns the datasets and the number of requests.
+    """
+    requests_kwargs = {'verify': verify}
+    datasets = {}
+    requests_count = 0
+    while True:
+        answer = ckan.call_action('package_search', {
+            'fq': f'groups:{group}',
+            'fl': 'name,version',
+            'sort': 'name asc',
+            'rows': rows,
+            'start': len(datasets),
+            'include_private': True,
+        }, requests_kwargs=requests_kwargs)
+        requests_count += 1
+        for dataset in answer['results']:
+            datasets[dataset['name']] = dataset.get('version')
+        if not answer['results'] or len(datasets) >= answer['count']:
+            break
+    return datasets, requests_count
+
+
+def name_in_use(error):
+    """Returns True if the ValidationError of package_create is a conflict with an existing dataset name."""
+    errors = getattr(error, 'error_dict', None) or {}
+    return any('already in use' in f"{message}" for message in errors.get('name', []))
+
+
+def upload(ckan, data, no_update=False, verify=True, exists=None):
+    """
+    Uploads the data with the ckan client. Returns the number of requests.
+    exists is True or False if it is known whether the dataset exists.
+    """
+    requests_kwargs = {'verify': verify}
+    requests_count = 0
+    if exists is False:
+        try:
             ckan.call_action('package_create', data, requests_kwargs=requests_kwargs)
             logging.info("upload create")
+            return 1
+        except ValidationError as e:
+            if not name_in_use(e):
+                raise
+            # the dataset might be created since the existing datasets were fetched
+            logging.info("upload create failed, trying update")
+            requests_count += 1
+            exists = True
+    if exists and no_update:
+        logging.info("upload skip update")
+        return requests_count
+    try:
+        if no_update:
+            ckan.call_action('package_show', {'id': data['name']}, requests_kwargs=requests_kwargs)
+            logging.info("upload skip update")
+        else:
+            ckan.call_action('package_update', data, requests_kwargs=requests_kwargs)
+            logging.info("upload update")
+    except NotFound:
+        ckan.call_action('package_create', data, requests_kwargs=requests_kwargs)
+        logging.info("upload create")
+        return requests_count + 2
+    return requests_count + 1
 
 
 class Upload(Command):
     def run(self, iphost=None, auth=None, target=None, from_=None, limit=None, no_update=False, verify=True,
-            silent=False, https=False):
+            silent=False, https=False, incremental=False, pool_size=10, workers=1, prefetch=False):
         # TODO: refactor community loop
         _communities = communities(self.community)
         for identifier in tqdm(_communities,
@@ -45,39 +114,110 @@ class Upload(Command):
             self._community = community(identifier)
             self.upload_to_ckan(iphost=iphost, auth=auth, from_=from_, limit=limit,
                                 no_update=no_update, verify=verify,
-                                silent=silent, https=https)
+                                silent=silent, https=https, incremental=incremental, pool_size=pool_size,
+                                workers=workers, prefetch=prefetch)
+
+    def manifest(self, identifier):
+        return Manifest(os.path.join(self.state_dir, f"{identifier}.manifest.jsonl"))
 
     def upload_to_ckan(self, iphost, auth, from_=None, limit=None, no_update=False, verify=True,
-                       silent=False, https=False):
+                       silent=False, https=False, incremental=False, pool_size=10, workers=1, prefetch=False):
+        """
+        Uploads the records with workers threads.
+        Not more than two records per worker are waiting for upload, the walk waits otherwise.
+
+        With prefetch the names and versions of the existing datasets are fetched first
+        to decide locally whether a dataset is created, updated or skipped.
+        """
         self.walker = Walker(self.datadir)
+        manifest = self.manifest(self._community.identifier)
         limit = limit or -1
         count = 0
-        success = True
-        for filename in tqdm(self.walk(), ascii=True, desc=f"Uploading {self._community.identifier}",
-                             unit=' records', total=limit, disable=silent):
-            if from_ and count < from_:
-                logging.info(f"skipping {filename}")
+        stats = dict(uploaded=0, requests=0, failed=[])
+        running = {}
+        start = time.time()
+        # one session for all records to keep the connections alive
+        ckan = connect(host=iphost, apikey=auth, https=https, pool_size=max(pool_size, workers))
+        existing = None
+        if prefetch:
+            existing, stats['requests'] = existing_datasets(ckan, self._community.group, verify=verify)
+            logging.info(f"found {len(existing)} datasets. community={self._community.identifier}")
+        executor = ThreadPoolExecutor(max_workers=workers)
+        progress = tqdm(ascii=True, desc=f"Uploading {self._community.identifier}",
+                        unit=' records', total=limit, disable=silent)
+        try:
+            for filename in self.walk():
+                if from_ and count < from_:
+                    logging.info(f"skipping {filename}")
+                    count += 1
+                    progress.update(1)
+                    continue
+                if limit > 0 and count >= limit:
+                    break
+                uid = pathlib.Path(filename).stem
+                with open(filename, 'rb') as fp:
+                    data = json.load(fp)
                 count += 1
-                continue
-            if limit > 0 and count >= limit:
-                break
-            logging.info(f"uploading {filename}")
-            with open(filename, 'rb') as fp:
-                data = json.load(fp)
-                try:
-                    upload(data=data, host=iphost, apikey=auth, no_update=no_update, verify=verify, https=https)
-                except ConnectionError:
-                    logging.exception('upload connection error.')
-                    raise
-                except NotAuthorized:
-                    logging.exception('upload not authorized.')
-                    raise
-                except Exception:
-                    logging.exception(f'upload failed: {filename}.')
-                    success = False
-            count += 1
-        if not success:
-            raise Exception(f'upload of some files failed. community={self._community.identifier}')
+                if incremental and manifest.is_uploaded(uid, data.get('version')):
+                    logging.info(f"skipping unchanged {filename}")
+                    progress.update(1)
+                    continue
+                exists = None
+                if existing is not None:
+                    exists = data['name'] in existing
+                    if exists and existing[data['name']] == data.get('version'):
+                        logging.info(f"skipping unchanged dataset {filename}")
+                        manifest.update(uid, uploaded=data.get('version'))
+                        progress.update(1)
+                        continue
+                logging.info(f"uploading {filename}")
+                future = executor.submit(upload, ckan, data, no_update=no_update, verify=verify, exists=exists)
+                running[future] = (filename, uid, data.get('version'))
+                if len(running) >= 2 * workers:
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    self.collect(done, running, manifest, stats, no_update=no_update, progress=progress)
+            done, _ = wait(running)
+            self.collect(done, running, manifest, stats, no_update=no_update, progress=progress)
+        finally:
+            # uploads which are not started yet are cancelled after a failure
+            for future in running:
+                future.cancel()
+            executor.shutdown(wait=True)
+            progress.close()
+            ckan.close()
+            manifest.save()
+            self.report(stats['uploaded'], stats['requests'], time.time() - start, silent=silent)
+        if stats['failed']:
+            raise Exception(f"upload of {len(stats['failed'])} files failed. community={self._community.identifier}")
+
+    def collect(self, done, running, manifest, stats, no_update=False, progress=None):
+        for future in done:
+            filename, uid, version = running.pop(future)
+            try:
+                stats['requests'] += future.result()
+                stats['uploaded'] += 1
+                # with no_update an existing record may still have an older version
+                if not no_update:
+                    manifest.update(uid, uploaded=version)
+            except ConnectionError:
+                logging.exception('upload connection error.')
+                raise
+            except NotAuthorized:
+                logging.exception('upload not authorized.')
+                raise
+            except Exception:
+                logging.exception(f'upload failed: {filename}.')
+                stats['failed'].append(filename)
+            if progress:
+                progress.update(1)
+
+    def report(self, uploaded, requests_count, seconds, silent=False):
+        rate = requests_count / seconds if seconds > 0 else 0
+        msg = f"Uploaded {self._community.identifier}: records={uploaded}, requests={requests_count}, " \
+              f"{rate:.1f} requests/sec"
+        logging.info(msg)
+        if not silent:
+            print(msg)
 
     def walk(self):
         path = os.path.join(self._community.identifier, 'ckan')
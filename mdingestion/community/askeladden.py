@@ -21,7 +21,7 @@ class Askeladden(BaseNordicar):
         doc.discipline = ['Archaeology']
         doc.description = self.find('properties.informasjon')
         doc.source = self.find('properties.linkKulturminnesok')
-        doc.relatedIdentifier = self.find('linkAskeladden')
+        doc.related_identifier = self.find('linkAskeladden')
         doc.publisher = ['Askeladden']
         doc.publication_year = self.find('properties.forsteDigitaliseringsdato')
         doc.language = ['Norwegian']
@@ -18,6 +18,14 @@ class Community(object):
     DATE = ''
     DESCRIPTION = None
     LOGO = None
+    # use the lxml XPath parser for XML records of the schemas in reader.XPATH_SCHEMAS, BeautifulSoup otherwise
+    XPATH = True
+    # use the streaming parser for large XML records (ISO19139, DDI25)
+    STREAM = False
+    # names searched in update() in addition to the names searched by the reader
+    PATHS = []
+    # number of decimals of the geometry in the mapped record, None keeps the full precision
+    WKT_PRECISION = None
 
     def __init__(self):
         self._reader = None
@@ -61,7 +69,8 @@ class Community(object):
     @property
     def reader(self):
         if not self._reader:
-            self._reader = build_reader(self.schema, self.service_type)
+            self._reader = build_reader(
+                self.schema, self.service_type, xpath=self.XPATH, stream=self.STREAM, paths=self.PATHS)
         return self._reader
 
     def read(self, filename):
@@ -71,6 +80,7 @@ class Community(object):
             url=self.url,
             oai_metadata_prefix=self.oai_metadata_prefix)
         doc.groups = self.group
+        doc.wkt_precision = self.WKT_PRECISION
         self.update(doc)
         return doc
 
@@ -10,6 +10,7 @@ class CessdaDDI25(Community):
     SERVICE_TYPE = ServiceType.OAI
     OAI_METADATA_PREFIX = 'oai_ddi25'
     OAI_SET = None
+    PATHS = ['distrbtr']
 #   PRODUCTIVE = True
 #   DATE = '2021-10-20'
 
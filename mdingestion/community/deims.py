@@ -10,6 +10,8 @@ class Deims(Community):
     SCHEMA = SchemaType.ISO19139
     SERVICE_TYPE = ServiceType.CSW
     PRODUCTIVE = True
+    STREAM = True
+    PATHS = ['linkage', 'MD_Identifier']
 
     def update(self, doc):
         doc.doi = self.find_doi('linkage')
@@ -12,6 +12,8 @@ class Enes(Community):
     OAI_METADATA_PREFIX = 'iso'
     OAI_SET = 'iso-old-doi'
     PRODUCTIVE = True
+    STREAM = True
+    PATHS = ['linkage', 'CI_ResponsibleParty.organisationName', 'transferSize', 'unitsOfDistribution']
 
     def update(self, doc):
         doc.doi = self.find_doi('linkage')
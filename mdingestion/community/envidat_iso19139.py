@@ -11,6 +11,8 @@ class Envidat(Community):
     SERVICE_TYPE = ServiceType.OAI
     OAI_METADATA_PREFIX = 'iso19139'
     OAI_SET = None
+    STREAM = True
+    PATHS = ['MD_Metadata.fileIdentifier', 'linkage']
 
     def update(self, doc):
         doc.doi = self.find_doi('MD_Metadata.fileIdentifier')
@@ -8,6 +8,7 @@ import logging
 ETC_DIR = path.abspath(path.join(path.dirname(__file__), '..', 'etc'))
 IGNORE_LIST = path.join(ETC_DIR, 'ignore_urls.txt')
 TO_IGNORE = None
+IGNORE_MATCHER = None
 
 
 def read_ignore_list():
@@ -15,7 +16,7 @@ def read_ignore_list():
     try:
         df = pd.read_csv(
             IGNORE_LIST,
-            delim_whitespace=True,
+            sep=r'\s+',
             comment='#',
             header=None,
             names=['url'])
@@ -28,6 +29,31 @@ def read_ignore_list():
 def to_ignore():
     global TO_IGNORE
 
-    if not TO_IGNORE:
+    # the list is read once, also when it is empty or could not be read
+    if TO_IGNORE is None:
         TO_IGNORE = read_ignore_list()
     return TO_IGNORE
+
+
+def compile_matcher(patterns):
+    """
+    Combines the patterns in one alternation regex.
+    The returned function is True if one of the patterns matches the start of the url like rex.match().
+    """
+    if not patterns:
+        return lambda url: False
+    try:
+        rex = re.compile('|'.join(f"(?:{pattern.pattern})" for pattern in patterns))
+    except re.error:
+        # patterns with group names or inline flags can not be combined
+        logging.warning("Could not combine ignore list, matching each pattern")
+        return lambda url: any(pattern.match(url) for pattern in patterns)
+    return lambda url: rex.match(url) is not None
+
+
+def ignore_matcher():
+    global IGNORE_MATCHER
+
+    if IGNORE_MATCHER is None:
+        IGNORE_MATCHER = compile_matcher(to_ignore())
+    return IGNORE_MATCHER
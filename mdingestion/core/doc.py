@@ -9,7 +9,46 @@ from ..format import format_value
 from ..rights import is_open_access
 
 
+class Unformatted(object):
+    """
+    Value of a field which is formatted when the field is read for the first time.
+    A list is copied, so that later changes of the list by the reader are not seen.
+    """
+    __slots__ = ('value', 'formatter', 'kwargs')
+
+    def __init__(self, value, formatter=None, **kwargs):
+        self.value = list(value) if isinstance(value, list) else value
+        self.formatter = formatter
+        self.kwargs = kwargs
+
+    def format(self):
+        if self.formatter:
+            return self.formatter(self.value, **self.kwargs)
+        return format_value(self.value, **self.kwargs)
+
+
+def format_keywords(value):
+    # TODO: clean up code
+    _keywords = []
+    delchars = {8347: None}
+    for val in value:
+        val = val.translate(delchars)
+        _keywords.extend(val.split(','))
+    return format_value(_keywords, type='string_words', min_length=2, max_length=100)
+
+
 class BaseDoc(object):
+    """
+    The fields are formatted when they are read (by the writer) and not when they are set.
+    A field set several times is only formatted once and fields which are not read are not formatted.
+    """
+    __slots__ = (
+        '_community', '_groups', '_title', '_description', '_keywords', '_doi', '_pid', '_source',
+        '_related_identifier', '_metadata_access', '_creator', '_publisher', '_contributor', '_instrument',
+        '_publication_year', '_funding_reference', '_rights', '_open_access', '_contact', '_language',
+        '_resource_type', '_format', '_size', '_version', '_discipline',
+    )
+
     def __init__(self):
         self._community = None
         self._groups = []
@@ -37,88 +76,91 @@ class BaseDoc(object):
         self._version = None
         self._discipline = None
 
+    def formatted(self, slot):
+        """Returns the formatted value of the field stored in slot."""
+        value = getattr(self, slot)
+        if type(value) is Unformatted:
+            value = value.format()
+            setattr(self, slot, value)
+        return value
+
     @property
     def community(self):
-        return self._community
+        return self.formatted('_community')
 
     @community.setter
     def community(self, value):
-        self._community = format_value(value, one=True)
+        self._community = Unformatted(value, one=True)
 
     @property
     def groups(self):
-        return self._groups
+        return self.formatted('_groups')
 
     @groups.setter
     def groups(self, value):
-        self._groups = format_value(value)
+        self._groups = Unformatted(value)
 
     @property
     def identifier(self):
-        return self._doi or self._pid or self._source
+        return self.formatted('_doi') or self.formatted('_pid') or self.formatted('_source')
 
     @property
     def title(self):
-        return self._title
+        return self.formatted('_title')
 
     @title.setter
     def title(self, value):
-        self._title = format_value(value)
+        self._title = Unformatted(value)
 
     @property
     def description(self):
-        return self._description
+        return self.formatted('_description')
 
     @description.setter
     def description(self, value):
-        self._description = format_value(value)
+        self._description = Unformatted(value)
 
     @property
     def keywords(self):
-        return self._keywords
+        return self.formatted('_keywords')
 
     @keywords.setter
     def keywords(self, value):
-        # TODO: clean up code
-        _keywords = []
-        delchars = {8347: None}
-        for val in value:
-            val = val.translate(delchars)
-            _keywords.extend(val.split(','))
-        self._keywords = format_value(_keywords, type='string_words', min_length=2, max_length=100)
+        self._keywords = Unformatted(value, formatter=format_keywords)
 
     @property
     def doi(self):
-        return self._doi or ''
+        return self.formatted('_doi') or ''
 
     @doi.setter
     def doi(self, value):
-        self._doi = format_value(value, type='url', one=True)
+        self._doi = Unformatted(value, type='url', one=True)
 
     @property
     def pid(self):
-        return self._pid or ''
+        return self.formatted('_pid') or ''
 
     @pid.setter
     def pid(self, value):
-        self._pid = format_value(value, type='url', one=True)
+        self._pid = Unformatted(value, type='url', one=True)
 
     @property
     def source(self):
-        url = self._source or ''
+        url = self.formatted('_source') or ''
         if url in [self.pid, self.doi]:
             url = ''
         return url
 
     @source.setter
     def source(self, value):
-        self._source = format_value(value, type='url', one=True)
+        self._source = Unformatted(value, type='url', one=True)
 
     @property
     def related_identifier(self):
         urls = []
-        if self._related_identifier:
-            for url in self._related_identifier:
+        related_identifier = self.formatted('_related_identifier')
+        if related_identifier:
+            for url in related_identifier:
                 if self.doi and self.doi in url:
                     continue
                 if self.pid and self.pid in url:
@@ -132,72 +174,72 @@ class BaseDoc(object):
 
     @related_identifier.setter
     def related_identifier(self, value):
-        self._related_identifier = format_value(value, type='url')
+        self._related_identifier = Unformatted(value, type='url')
 
     @property
     def metadata_access(self):
-        return self._metadata_access
+        return self.formatted('_metadata_access')
 
     @metadata_access.setter
     def metadata_access(self, value):
-        self._metadata_access = format_value(value, type='url', one=True)
+        self._metadata_access = Unformatted(value, type='url', one=True)
 #        print('value', value, 'md', self._metadata_access)
 
     @property
     def creator(self):
-        return self._creator
+        return self.formatted('_creator')
 
     @creator.setter
     def creator(self, value):
-        self._creator = format_value(value)
+        self._creator = Unformatted(value)
 
     @property
     def publisher(self):
-        return self._publisher
+        return self.formatted('_publisher')
 
     @publisher.setter
     def publisher(self, value):
-        self._publisher = format_value(value)
+        self._publisher = Unformatted(value)
 
     @property
     def contributor(self):
-        return self._contributor
+        return self.formatted('_contributor')
 
     @contributor.setter
     def contributor(self, value):
-        self._contributor = format_value(value, type='email')
+        self._contributor = Unformatted(value, type='email')
 
     @property
     def instrument(self):
-        return self._instrument
+        return self.formatted('_instrument')
 
     @instrument.setter
     def instrument(self, value):
-        self._instrument = format_value(value)
+        self._instrument = Unformatted(value)
 
     @property
     def publication_year(self):
-        return self._publication_year
+        return self.formatted('_publication_year')
 
     @publication_year.setter
     def publication_year(self, value):
-        self._publication_year = format_value(value, type='date_year', one=True)
+        self._publication_year = Unformatted(value, type='date_year', one=True)
 
     @property
     def funding_reference(self):
-        return self._funding_reference
+        return self.formatted('_funding_reference')
 
     @funding_reference.setter
     def funding_reference(self, value):
-        self._funding_reference = format_value(value)
+        self._funding_reference = Unformatted(value)
 
     @property
     def rights(self):
-        return self._rights
+        return self.formatted('_rights')
 
     @rights.setter
     def rights(self, value):
-        self._rights = format_value(value)
+        self._rights = Unformatted(value)
 
     @property
     def open_access(self):
@@ -209,65 +251,74 @@ class BaseDoc(object):
 
     @property
     def contact(self):
-        return self._contact
+        return self.formatted('_contact')
 
     @contact.setter
     def contact(self, value):
-        self._contact = format_value(value, type='email')
+        self._contact = Unformatted(value, type='email')
 
     @property
     def language(self):
-        return self._language
+        return self.formatted('_language')
 
     @language.setter
     def language(self, value):
-        self._language = format_value(value, type='language')
+        self._language = Unformatted(value, type='language')
 
     @property
     def resource_type(self):
-        return self._resource_type
+        return self.formatted('_resource_type')
 
     @resource_type.setter
     def resource_type(self, value):
-        self._resource_type = format_value(value)
+        self._resource_type = Unformatted(value)
 
     @property
     def format(self):
-        return self._format
+        return self.formatted('_format')
 
     @format.setter
     def format(self, value):
-        self._format = format_value(value)
+        self._format = Unformatted(value)
 
     @property
     def size(self):
-        return self._size
+        return self.formatted('_size')
 
     @size.setter
     def size(self, value):
-        self._size = format_value(value)
+        self._size = Unformatted(value)
 
     @property
     def version(self):
-        return self._version or ''
+        return self.formatted('_version') or ''
 
     @version.setter
     def version(self, value):
-        self._version = format_value(value, one=True)
+        self._version = Unformatted(value, one=True)
 
     @property
     def discipline(self):
-        return self._discipline or ["Other"]
+        return self.formatted('_discipline') or ["Other"]
 
     @discipline.setter
     def discipline(self, value):
-        self._discipline = format_value(value)
+        self._discipline = Unformatted(value)
 
 
 class GeoDoc(BaseDoc):
+    """
+    The serializations of the geometry (wkt, wkt_simple, bbox and envelope) are computed once
+    and rounded to wkt_precision decimals if it is set.
+    """
+    __slots__ = ('_geometry', '_places', '_temporal_coverage', '_begin_date', '_end_date', '_wkt_precision',
+                 '_geometry_cache')
+
     def __init__(self):
         super().__init__()
         self._geometry = None
+        self._wkt_precision = None
+        self._geometry_cache = {}
         self._places = None
         self._temporal_coverage = None
         self._begin_date = None
@@ -291,22 +342,48 @@ class GeoDoc(BaseDoc):
                 point = self.geometry
                 geom = f"({point.x:.3f} LON, {point.y:.3f} LAT)"
             else:
-                bounds = self.geometry.bounds
+                bounds = self.bounds
                 # print(f"{bounds}")
                 geom = f"({bounds[0]:.3f}W, {bounds[1]:.3f}S, {bounds[2]:.3f}E, {bounds[3]:.3f}N)"
         return geom
 
+    def cached(self, key, func):
+        """Returns func(geometry) computed once for the current geometry and precision."""
+        if key not in self._geometry_cache:
+            self._geometry_cache[key] = func(self.geometry) if self.geometry else None
+        return self._geometry_cache[key]
+
+    def dumps(self, geometry):
+        if self.wkt_precision is None:
+            return wkt.dumps(geometry)
+        return wkt.dumps(geometry, trim=True, rounding_precision=self.wkt_precision)
+
     @property
     def wkt(self):
-        if not self.geometry:
-            return None
-        return wkt.dumps(self.geometry)
+        return self.cached('wkt', self.dumps)
 
     @property
     def wkt_simple(self):
-        if not self.geometry:
-            return None
-        return wkt.dumps(self.geometry.centroid)
+        return self.cached('wkt_simple', lambda geometry: self.dumps(geometry.centroid))
+
+    @property
+    def wkt_precision(self):
+        """number of decimals of the serialized geometry, None for the full precision"""
+        return self._wkt_precision
+
+    @wkt_precision.setter
+    def wkt_precision(self, value):
+        self._wkt_precision = value
+        self._geometry_cache = {}
+
+    @property
+    def bounds(self):
+        """bounds of the geometry (minx, miny, maxx, maxy) rounded to wkt_precision"""
+        def bounds(geometry):
+            if self.wkt_precision is None:
+                return geometry.bounds
+            return tuple(round(value, self.wkt_precision) for value in geometry.bounds)
+        return self.cached('bounds', bounds)
 
     @property
     def geometry(self):
@@ -315,6 +392,7 @@ class GeoDoc(BaseDoc):
     @geometry.setter
     def geometry(self, value):
         self._geometry = value
+        self._geometry_cache = {}
 
     @property
     def places(self):
@@ -328,17 +406,14 @@ class GeoDoc(BaseDoc):
     def bbox(self):
         if not self.geometry:
             return None
-        bbox = shapely.geometry.box(*self.geometry.bounds)
+        bbox = shapely.geometry.box(*self.bounds)
         return shapely.geometry.mapping(bbox)
 
     @property
     def envelope(self):
-        if not self.geometry:
-            return None
         # bounds: minx, miny, maxx, maxy
         # envelop: minX, maxX, maxY, minY
-        return "ENVELOPE({0}, {2}, {3}, {1})".format(
-            *self.geometry.bounds)
+        return self.cached('envelope', lambda geometry: "ENVELOPE({0}, {2}, {3}, {1})".format(*self.bounds))
 
     @property
     def temporal_coverage(self):
@@ -362,23 +437,25 @@ class GeoDoc(BaseDoc):
     @property
     def temporal_coverage_begin_date(self):
         """field begin datetime in utc format in single record"""
-        return self._begin_date or ''
+        return self.formatted('_begin_date') or ''
 
     @temporal_coverage_begin_date.setter
     def temporal_coverage_begin_date(self, value):
-        self._begin_date = format_value(value, type='datetime', one=True)
+        self._begin_date = Unformatted(value, type='datetime', one=True)
 
     @property
     def temporal_coverage_end_date(self):
         """field end datetime in utc format in single record"""
-        return self._end_date or ''
+        return self.formatted('_end_date') or ''
 
     @temporal_coverage_end_date.setter
     def temporal_coverage_end_date(self, value):
-        self._end_date = format_value(value, type='datetime', one=True)
+        self._end_date = Unformatted(value, type='datetime', one=True)
 
 
 class B2FDoc(GeoDoc):
+    __slots__ = ('filename', '_url', '_oai_metadata_prefix', '_oai_set', '_oai_identifier', '_file_identifier',
+                 '_fulltext')
 
     def __init__(self, filename, community=None, url=None, oai_metadata_prefix=None):
         super().__init__()
@@ -413,24 +490,24 @@ class B2FDoc(GeoDoc):
 
     @property
     def oai_set(self):
-        return self._oai_set
+        return self.formatted('_oai_set')
 
     @oai_set.setter
     def oai_set(self, value):
-        self._oai_set = format_value(value, one=True)
+        self._oai_set = Unformatted(value, one=True)
 
     @property
     def oai_identifier(self):
-        return self._oai_identifier
+        return self.formatted('_oai_identifier')
 
     @oai_identifier.setter
     def oai_identifier(self, value):
-        self._oai_identifier = format_value(value, one=True)
+        self._oai_identifier = Unformatted(value, one=True)
 
     @property
     def file_identifier(self):
-        return self._file_identifier
+        return self.formatted('_file_identifier')
 
     @file_identifier.setter
     def file_identifier(self, value):
-        self._file_identifier = format_value(value, one=True)
+        self._file_identifier = Unformatted(value, one=True)
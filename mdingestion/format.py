@@ -1,6 +1,9 @@
 from dateutil import parser as date_parser
 from shapely.geometry import shape
+from datetime import datetime
+from calendar import monthrange
 import re
+import functools
 from urllib.parse import urlparse
 import iso639
 
@@ -23,6 +26,53 @@ NULL_VALUES = (
     'not available',
 )
 
+# dates parsed without dateutil: a year with an optional month and ISO 8601 dates and times
+# (dateutil reads years before 100 as two-digit years)
+YEAR_MONTH = re.compile(r'([1-9]\d{3})(?:-(\d{2}))?')
+ISO_DATETIME = re.compile(r'[1-9]\d{3}-?\d{2}-?\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}(?::?\d{2})?)?)?')
+
+# size of the cache of each memoized formatter
+CACHE_SIZE = 4096
+# memoized formatters
+MEMOIZED = []
+
+
+def memoize(func):
+    """
+    Bounded LRU cache for a pure formatter of one value.
+    Values which can not be hashed are formatted without the cache.
+    """
+    cached = functools.lru_cache(maxsize=CACHE_SIZE, typed=True)(func)
+
+    @functools.wraps(func)
+    def wrapper(text):
+        try:
+            hash(text)
+        except TypeError:
+            return func(text)
+        return cached(text)
+
+    wrapper.cache_info = cached.cache_info
+    wrapper.cache_clear = cached.cache_clear
+    MEMOIZED.append(wrapper)
+    return wrapper
+
+
+def cache_stats(since=None):
+    """
+    Hits and misses of the memoized formatters by name,
+    counted since the stats passed as since.
+    """
+    since = since or {}
+    stats = {}
+    for func in MEMOIZED:
+        info = func.cache_info()
+        _since = since.get(func.__name__, {})
+        stats[func.__name__] = dict(
+            hits=info.hits - _since.get('hits', 0),
+            misses=info.misses - _since.get('misses', 0))
+    return stats
+
 
 def is_null_value(text):
     if isinstance(text, bool):
@@ -134,9 +184,33 @@ def format_bool(text):
     return val
 
 
+def parse_datetime(text):
+    """
+    Parses the date like dateutil.parser.parse(text).
+    A year, a year and month and ISO 8601 dates are parsed without dateutil.
+    Like dateutil the missing month and day are taken from today.
+    """
+    if isinstance(text, str):
+        _text = text.strip()
+        try:
+            match = YEAR_MONTH.fullmatch(_text)
+            if match:
+                today = datetime.now()
+                year = int(match.group(1))
+                month = int(match.group(2) or today.month)
+                day = min(today.day, monthrange(year, month)[1])
+                return datetime(year, month, day)
+            if ISO_DATETIME.fullmatch(_text):
+                return datetime.fromisoformat(_text)
+        except ValueError:
+            pass
+    return date_parser.parse(text)
+
+
+@memoize
 def format_datetime(text):
     try:
-        parsed = date_parser.parse(text)
+        parsed = parse_datetime(text)
         val = parsed.isoformat(timespec='seconds')
         val = val.split('+')[0]
         val = f"{val}Z"
@@ -164,6 +238,7 @@ def format_date_year(text):
     return val
 
 
+@memoize
 def format_language(text):
     try:
         # TODO: use https://pypi.org/project/pycountry/
@@ -174,6 +249,7 @@ def format_language(text):
     return val
 
 
+@memoize
 def format_email(text):
     email = format_string(text)
     if email and is_valid_email(email):
@@ -184,6 +260,7 @@ def format_email(text):
     return email
 
 
+@memoize
 def format_url(text):
     url = format_string(text)
     parsed = urlparse(url)
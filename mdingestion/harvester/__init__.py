@@ -22,7 +22,10 @@ def harvester(community,
               outdir,
               verify,
               username=None,
-              password=None):
+              password=None,
+              state=None,
+              resume=False,
+              store=False):
     if service_type == ServiceType.HERBADROP:
         harvester = HerbadropHarvester(
             community=community,
@@ -34,7 +37,7 @@ def harvester(community,
             verify=verify)
     elif service_type == ServiceType.OAI:
         harvester = OAIHarvester(community, url, oai_metadata_prefix, oai_set, fromdate, clean, limit, outdir, verify,
-                                 username, password)
+                                 username, password, state=state, resume=resume)
     elif service_type == ServiceType.CSW:
         harvester = CSWHarvester(community, url, schema, fromdate, clean, limit, outdir, verify)
     elif service_type == ServiceType.ArcGIS:
@@ -59,4 +62,6 @@ def harvester(community,
             verify=verify)
     else:
         raise HarvesterNotSupported()
+    if store:
+        harvester.use_store()
     return harvester
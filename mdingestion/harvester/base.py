@@ -1,13 +1,51 @@
+import io
 import uuid
 import pathlib
 import shutil
 import os
+import queue
+import threading
+from contextlib import contextmanager
+from datetime import timezone
 
 from ..exceptions import HarvesterError
+from ..format import parse_datetime
+from ..store import RecordStore, STORE_DIR
 
 import logging
 
 
+class WriteBehind(object):
+    """
+    Runs the tasks for writing records in a background thread.
+    Tasks run in the order they were added. The queue is bounded, so that
+    harvesting waits when writing does not keep up.
+    """
+    def __init__(self, maxsize=1000):
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def run(self):
+        while True:
+            task = self.queue.get()
+            if task is None:
+                break
+            func, args, kwargs = task
+            try:
+                func(*args, **kwargs)
+            except Exception:
+                logging.exception("write behind task failed")
+
+    def put(self, func, *args, **kwargs):
+        self.queue.put((func, args, kwargs))
+
+    def close(self):
+        """Waits until all tasks are done."""
+        self.queue.put(None)
+        self.thread.join()
+
+
 class Harvester(object):
     def __init__(self, community, url, fromdate, clean, limit, outdir, verify=True,
                  username=None, password=None):
@@ -21,10 +59,45 @@ class Harvester(object):
         self.ext = 'xml'
         self.username = username
         self.password = password
+        self.watermark = None
+        self._watermark = None
+        self._write_behind = None
+        self.record_store = None
+
+    def use_store(self):
+        """Writes the records to a record store instead of one file per record."""
+        self.record_store = RecordStore(pathlib.Path(self.outdir, self.community, "raw", STORE_DIR))
 
     def identifier(self, record):
         raise NotImplementedError
 
+    def datestamp(self, record):
+        """Returns the modification date of the record used for the watermark."""
+        return None
+
+    def record_datestamp(self, record):
+        """Returns the datestamp of the record written to the record store."""
+        return self.datestamp(record)
+
+    def update_watermark(self, datestamp):
+        """
+        Keeps the latest datestamp as watermark in UTC.
+        Datestamps with a time zone offset are converted, datestamps without are taken as UTC.
+        """
+        if not datestamp:
+            return
+        try:
+            parsed = parse_datetime(datestamp)
+        except Exception:
+            logging.warning(f"could not parse datestamp: {datestamp}")
+            return
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        parsed = parsed.astimezone(timezone.utc)
+        if self._watermark is None or parsed > self._watermark:
+            self._watermark = parsed
+            self.watermark = f"{parsed.replace(tzinfo=None).isoformat(timespec='seconds')}Z"
+
     def matches(self):
         return self.limit
 
@@ -63,6 +136,7 @@ class Harvester(object):
                 count += 1
                 if self.limit >= 0 and count > self.limit:
                     break
+                self.update_watermark(self.datestamp(record))
                 yield record
         except Exception as e:
             msg = f"Harvester failed: {e}. community={self.community}, url={self.url}"
@@ -72,7 +146,41 @@ class Harvester(object):
     def get_records(self):
         raise NotImplementedError
 
+    @contextmanager
+    def write_behind(self, maxsize=1000):
+        """Records are written in a background thread while harvesting in this context."""
+        self._write_behind = WriteBehind(maxsize=maxsize)
+        try:
+            yield self
+        finally:
+            self._write_behind.close()
+            self._write_behind = None
+
+    def defer(self, func, *args, **kwargs):
+        """Runs func after all records written so far, also in write behind mode."""
+        if self._write_behind:
+            self._write_behind.put(func, *args, **kwargs)
+        else:
+            func(*args, **kwargs)
+
     def write_record(self, record, pretty_print=True):
+        if self.record_store is not None:
+            self.defer(self.write_store, record, pretty_print)
+        else:
+            self.defer(self.write_file, record, pretty_print)
+
+    def write_store(self, record, pretty_print=True):
+        uid = self.uid(record)
+        try:
+            fp = io.StringIO()
+            self._write_record(fp, record, pretty_print)
+            self.record_store.put(uid, fp.getvalue().encode('utf8'), ext=self.ext,
+                                  datestamp=self.record_datestamp(record))
+            logging.debug(f'record {uid} written to {self.record_store.path}')
+        except Exception:
+            logging.warning(f"Could not write record {uid} to {self.record_store.path}", exc_info=True)
+
+    def write_file(self, record, pretty_print=True):
         out = self.filename(record)
         try:
             out.parent.mkdir(parents=True, exist_ok=True)
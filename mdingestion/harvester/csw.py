@@ -25,6 +25,10 @@ class CSWHarvester(Harvester):
     def identifier(self, record):
         return record.identifier
 
+    def datestamp(self, record):
+        # csw: dct:modified, iso19139: gmd:dateStamp
+        return getattr(record, 'modified', None) or getattr(record, 'datestamp', None)
+
     def matches(self):
         self.csw.getrecords2(
             maxrecords=0,
@@ -56,6 +56,9 @@ class HerbadropHarvester(Harvester):
     def identifier(self, record):
         return record['depositIdentifier']
 
+    def datestamp(self, record):
+        return record.get('metadata', {}).get('aip.meta.archivingDate')
+
     def matches(self):
         data = {
             "page": 1,
@@ -1,8 +1,12 @@
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from dateutil import parser as date_parser
 from sickle import Sickle
 from sickle.oaiexceptions import (
     NoRecordsMatch,
     NoSetHierarchy,
     CannotDisseminateFormat,
+    BadResumptionToken,
 )
 from lxml import etree
 
@@ -12,25 +16,105 @@ from ..exceptions import HarvesterError
 import logging
 
 
+def is_expired(expiration_date):
+    if not expiration_date:
+        return False
+    try:
+        expires = date_parser.parse(expiration_date)
+    except Exception:
+        logging.warning(f"could not parse expiration date of resumption token: {expiration_date}")
+        return False
+    if not expires.tzinfo:
+        expires = expires.replace(tzinfo=timezone.utc)
+    return expires <= datetime.now(timezone.utc)
+
+
+class PrefetchSickle(Sickle):
+    """
+    Sickle client which requests the next ListRecords page in a background
+    thread while the current page is processed.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._executor = None
+        self._prefetched = None
+
+    def harvest(self, **kwargs):
+        if self._prefetched and self._prefetched[0] == kwargs:
+            response = self._prefetched[1].result()
+        else:
+            response = super().harvest(**kwargs)
+        self._prefetched = None
+        if kwargs.get('verb') == 'ListRecords':
+            self.prefetch(response)
+        return response
+
+    def prefetch(self, response):
+        element = response.xml.find(f'.//{self.oai_namespace}resumptionToken')
+        if element is None or not element.text:
+            return
+        params = {'resumptionToken': element.text, 'verb': 'ListRecords'}
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1)
+        self._prefetched = (params, self._executor.submit(super().harvest, **params))
+
+    def close(self):
+        """
+        Drops the prefetched page and shuts the prefetch thread down.
+        A request in progress is not awaited, its page is not needed anymore.
+        """
+        if self._prefetched:
+            self._prefetched[1].cancel()
+            self._prefetched = None
+        if self._executor is not None:
+            # cancel_futures of shutdown needs python 3.9, the pending prefetch is cancelled above
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
 class OAIHarvester(Harvester):
 
     def __init__(self, community, url, oai_metadata_prefix, oai_set, fromdate, clean, limit, outdir, verify,
-                 username, password):
+                 username, password, state=None, resume=False):
         super().__init__(community, url, fromdate, clean, limit, outdir, verify,
                          username, password)
         logging.captureWarnings(True)
         self.mdprefix = oai_metadata_prefix
         self.oai_set = oai_set
+        self.state = state
+        self.resume = resume
+        self._response_date = None
+        # records of the current ListRecords request, including resumed ones
+        self.count = 0
         if self.username:
             auth = (self.username, self.password)
         else:
             auth = None
-        self.sickle = Sickle(self.url, max_retries=3, timeout=120, verify=self.verify,
-                             auth=auth)
+        self.sickle = PrefetchSickle(self.url, max_retries=3, timeout=120, verify=self.verify,
+                                     auth=auth)
 
     def identifier(self, record):
         return record.header.identifier
 
+    def datestamp(self, record):
+        # the responseDate of the first response is preferred as watermark
+        if self._response_date:
+            return None
+        return record.header.datestamp
+
+    def record_datestamp(self, record):
+        return record.header.datestamp
+
+    def response_date(self, response):
+        element = response.xml.find(f'.//{self.sickle.oai_namespace}responseDate')
+        if element is None:
+            return None
+        return element.text
+
+    @property
+    def query(self):
+        return dict(url=self.url, metadataPrefix=self.mdprefix, set=self.oai_set)
+
     def matches(self):
         try:
             records = self.sickle.ListIdentifiers(**{
@@ -56,23 +140,93 @@ class OAIHarvester(Harvester):
             logging.error(
                 f'The metadata format {self.mdprefix} is not supported by the OAI repository. Formats={md_formats}')
 
-    def get_records(self):
-        self.check_metadata_format()
+    def checkpoint(self, resumption_token):
+        """
+        Writes the resumption token to continue with the current page.
+        The state is written after all records of the previous pages.
+        """
+        if not self.state:
+            return
+        if resumption_token and resumption_token.token:
+            resumption = dict(
+                token=resumption_token.token,
+                cursor=resumption_token.cursor,
+                complete_list_size=resumption_token.complete_list_size,
+                expiration_date=resumption_token.expiration_date,
+                records=self.count,
+                response_date=self._response_date,
+                fromdate=self.fromdate,
+                query=self.query,
+                saved=datetime.now().isoformat(timespec='seconds'))
+        else:
+            resumption = None
+        self.defer(self.state.update, resumption=resumption)
+
+    def resumption(self):
+        """Returns the checkpoint of an interrupted harvest, if it can be resumed."""
+        if not self.resume or not self.state:
+            return None
+        resumption = self.state.data.get('resumption')
+        if not resumption or not resumption.get('token'):
+            logging.info(f'No interrupted harvest to resume. community={self.community}')
+            return None
+        if resumption.get('query') != self.query:
+            logging.warning(f'Interrupted harvest has a different query. community={self.community}')
+            return None
+        # continue with the fromdate of the interrupted harvest
+        self.fromdate = resumption.get('fromdate')
+        if is_expired(resumption.get('expiration_date')):
+            logging.warning(f'Resumption token expired, restarting from={self.fromdate}. community={self.community}')
+            return None
+        return resumption
+
+    def list_records(self):
+        resumption = self.resumption()
+        if resumption:
+            try:
+                records = self.sickle.ListRecords(ignore_deleted=True, resumptionToken=resumption['token'])
+                self._response_date = resumption.get('response_date')
+                self.count = resumption.get('records', 0)
+                self.update_watermark(self._response_date)
+                logging.info(f"Resuming harvest at cursor={resumption.get('cursor')}. community={self.community}")
+                return records
+            except BadResumptionToken:
+                logging.warning(f'Resumption token not valid, restarting from={self.fromdate}. '
+                                f'community={self.community}')
         # NOTE: use dict args to pass "from" parameter
         # https://sickle.readthedocs.io/en/latest/tutorial.html#using-the-from-parameter
+        records = self.sickle.ListRecords(**{
+            'metadataPrefix': self.mdprefix,
+            'set': self.oai_set,
+            'ignore_deleted': True,
+            'from': self.fromdate,
+        })
+        # records changed while harvesting are included in the next incremental harvest
+        self._response_date = self.response_date(records.oai_response)
+        self.update_watermark(self._response_date)
+        return records
+
+    def get_records(self):
+        self.check_metadata_format()
         try:
-            records = self.sickle.ListRecords(**{
-                'metadataPrefix': self.mdprefix,
-                'set': self.oai_set,
-                'ignore_deleted': True,
-                'from': self.fromdate,
-            })
+            records = self.list_records()
+            resumption_token = records.resumption_token
             for record in records:
+                # sickle loads the next page when the current page is done
+                if records.resumption_token is not resumption_token:
+                    self.checkpoint(resumption_token)
+                    resumption_token = records.resumption_token
+                self.count += 1
                 yield record
+            self.checkpoint(None)
         except NoRecordsMatch:
             logging.warning(f'No records match the OAI query. from={self.fromdate}')
+            self.checkpoint(None)
         except CannotDisseminateFormat:
             raise HarvesterError(f'The metadata format {self.mdprefix} is not supported by the OAI repository.')
+        finally:
+            # also when the harvest stops early, e.g. at the limit
+            self.sickle.close()
 
     def _write_record(self, fp, record, pretty_print=True):
         xml = etree.tostring(record.xml, pretty_print=pretty_print).decode('utf8')
@@ -0,0 +1,49 @@
+import pathlib
+import json
+
+import logging
+
+
+class HarvestState(object):
+    """
+    Harvesting state of a community, persisted as json file.
+
+    The watermark is the latest datestamp of a completed harvest
+    and is used as fromdate for incremental harvesting.
+    """
+    def __init__(self, filename):
+        self.filename = pathlib.Path(filename)
+        self.data = self.load()
+
+    def load(self):
+        data = {}
+        if self.filename.exists():
+            try:
+                with self.filename.open() as fp:
+                    data = json.load(fp)
+            except Exception:
+                logging.warning(f"Could not read harvest state {self.filename}", exc_info=True)
+        return data
+
+    def save(self):
+        self.filename.parent.mkdir(parents=True, exist_ok=True)
+        # write to temporary file first to not leave a broken state
+        tmp = self.filename.with_suffix('.tmp')
+        with tmp.open(mode='w') as fp:
+            json.dump(self.data, fp, indent=4, sort_keys=True)
+        tmp.replace(self.filename)
+
+    def update(self, **kwargs):
+        self.data.update(kwargs)
+        self.save()
+
+    @property
+    def watermark(self):
+        return self.data.get('watermark')
+
+    @property
+    def fromdate(self):
+        """The day of the watermark. All OAI services support day granularity."""
+        if not self.watermark:
+            return None
+        return self.watermark.split('T')[0]
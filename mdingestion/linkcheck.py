@@ -1,22 +1,26 @@
 import socket
 import queue
+import functools
 import threading
 from os import path
 import requests
 from requests.exceptions import HTTPError
 from requests.utils import requote_uri
 
-from .config import to_ignore
+from .config import ignore_matcher
+
+import logging
 
 import urllib3
 urllib3.disable_warnings()
 
+# size of the cache of ignored and not ignored urls
+IGNORE_CACHE_SIZE = 16384
+
 
+@functools.lru_cache(maxsize=IGNORE_CACHE_SIZE)
 def ignore_url(uri):
-    for rex in to_ignore():
-        if rex.match(uri):
-            return True
-    return False
+    return ignore_matcher()(uri)
 
 
 class LinkChecker(object):
@@ -132,15 +136,23 @@ class LinkChecker(object):
 
         while True:
             uri = self.wqueue.get()
-            if uri is None:
-                break
-            check()
+            try:
+                if uri is None:
+                    break
+                check()
+            except Exception:
+                logging.warning(f"link check failed: {uri}", exc_info=True)
+            finally:
+                self.wqueue.task_done()
             # self.rqueue.put((uri, status))
 
     def add(self, doc):
-        self.wqueue.put(doc.doi, False)
-        self.wqueue.put(doc.pid, False)
-        self.wqueue.put(doc.source, False)
-        for url in doc.related_identifier:
-            self.wqueue.put(url, False)
-        self.wqueue.put(doc.metadata_access, False)
+        # None would stop a worker thread
+        urls = [doc.doi, doc.pid, doc.source] + list(doc.related_identifier) + [doc.metadata_access]
+        for url in urls:
+            if url:
+                self.wqueue.put(url, False)
+
+    def wait(self):
+        """Waits until all added links are checked."""
+        self.wqueue.join()
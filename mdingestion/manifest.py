@@ -0,0 +1,98 @@
+import pathlib
+import json
+
+import logging
+
+
+class Manifest(object):
+    """
+    Record hashes of a community, persisted as json lines file.
+
+    For each record (uid) the hash of the raw record, the version of the mapped
+    record and the version of the last successful upload are stored.
+    Used to map and upload only changed records.
+
+    Each line holds the uid and the entry of one record, a later line replaces an earlier one.
+    Only the changed entries are appended on save, so that a run with few changes
+    writes few lines. The file is rewritten when most of its lines are replaced.
+    """
+    def __init__(self, filename):
+        self.filename = pathlib.Path(filename)
+        self.lines = 0
+        self.changed = set()
+        self.records = self.load()
+
+    def load(self):
+        records = {}
+        if not self.filename.exists():
+            return self.load_json()
+        with self.filename.open() as fp:
+            for number, line in enumerate(fp, start=1):
+                self.lines += 1
+                try:
+                    uid, entry = json.loads(line)
+                except Exception:
+                    # e.g. the last line of an interrupted save, the record is mapped again
+                    logging.warning(f"Could not read line {number} of manifest {self.filename}")
+                    continue
+                records[uid] = entry
+        return records
+
+    def load_json(self):
+        """Reads the manifest of an older version written as one json file."""
+        records = {}
+        filename = self.filename.with_suffix('.json')
+        if filename.exists():
+            try:
+                with filename.open() as fp:
+                    records = json.load(fp)
+            except Exception:
+                logging.warning(f"Could not read manifest {filename}", exc_info=True)
+            self.changed.update(records.keys())
+        return records
+
+    def save(self):
+        if not self.changed:
+            return
+        self.filename.parent.mkdir(parents=True, exist_ok=True)
+        if not self.filename.exists() or self.lines + len(self.changed) > 2 * len(self.records):
+            self.compact()
+        else:
+            with self.filename.open(mode='a') as fp:
+                for uid in sorted(self.changed):
+                    fp.write(self.dumps(uid))
+            self.lines += len(self.changed)
+        self.changed.clear()
+
+    def compact(self):
+        # write to temporary file first to not leave a broken manifest
+        tmp = self.filename.with_suffix('.tmp')
+        with tmp.open(mode='w') as fp:
+            for uid in self.records:
+                fp.write(self.dumps(uid))
+        tmp.replace(self.filename)
+        self.lines = len(self.records)
+        legacy = self.filename.with_suffix('.json')
+        if legacy.exists():
+            legacy.unlink()
+
+    def dumps(self, uid):
+        return json.dumps([uid, self.records[uid]]) + '\n'
+
+    def get(self, uid):
+        return self.records.get(uid, {})
+
+    def update(self, uid, **kwargs):
+        entry = self.records.setdefault(uid, {})
+        if any(entry.get(key, self) != value for key, value in kwargs.items()):
+            entry.update(kwargs)
+            self.changed.add(uid)
+
+    def is_mapped(self, uid, raw, format):
+        """Returns True if the raw record was already mapped to format."""
+        entry = self.get(uid)
+        return bool(raw) and entry.get('raw') == raw and entry.get('format') == format and entry.get('written', False)
+
+    def is_uploaded(self, uid, version):
+        """Returns True if this version of the record was already uploaded."""
+        return bool(version) and self.get(uid).get('uploaded') == version
@@ -1,7 +1,11 @@
 from .xml import XMLParser
+from .xpath import XPathParser
+from .stream import StreamParser
 from .json import JSONParser
 
 __all__ = [
     XMLParser,
+    XPathParser,
+    StreamParser,
     JSONParser,
 ]
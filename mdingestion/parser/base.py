@@ -1,4 +1,50 @@
+import io
+
+# maximum length of the fulltext of a record, CKAN and Solr truncate longer texts anyway
+FULLTEXT_MAX_SIZE = 1024 * 1024
+
+
+class Fulltext(object):
+    """
+    Builds the fulltext of a record from its strings joined by ','.
+    Repeated strings are added once. Strings beyond max_size are cut off and add() returns False,
+    so that the caller can stop.
+    """
+    def __init__(self, max_size=FULLTEXT_MAX_SIZE):
+        self.max_size = max_size
+        self.buffer = io.StringIO()
+        self.size = 0
+        self.seen = set()
+        self.full = False
+
+    def add(self, text):
+        if self.full:
+            return False
+        if not text or text in self.seen:
+            return True
+        self.seen.add(text)
+        if self.size:
+            text = ',' + text
+        if self.max_size is not None and self.size + len(text) >= self.max_size:
+            text = text[:self.max_size - self.size]
+            self.full = True
+        self.buffer.write(text)
+        self.size += len(text)
+        return not self.full
+
+    def extend(self, texts):
+        for text in texts:
+            if not self.add(text):
+                break
+        return self
+
+    def getvalue(self):
+        return self.buffer.getvalue()
+
+
 class DocParser(object):
+    FULLTEXT_MAX_SIZE = FULLTEXT_MAX_SIZE
+
     def __init__(self, filename):
         self.filename = filename
         self._doc = None
@@ -18,3 +64,20 @@ class DocParser(object):
 
     def find(self, name=None, **kwargs):
         raise NotImplementedError
+
+    @classmethod
+    def compile(cls, name, **kwargs):
+        """Compiles the search of find(name, **kwargs) once, to be run by select() on each document."""
+        return (name, kwargs)
+
+    def select(self, query):
+        name, kwargs = query
+        return self.find(name, **kwargs)
+
+    def strings(self):
+        """Yields the strings of the fulltext in document order."""
+        raise NotImplementedError
+
+    @property
+    def fulltext(self):
+        return Fulltext(self.FULLTEXT_MAX_SIZE).extend(self.strings()).getvalue()
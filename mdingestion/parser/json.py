@@ -1,14 +1,80 @@
 import json
 from jsonpath_ng import parse as parse_jsonpath
+from jsonpath_ng.jsonpath import Root, Child, Fields, Index, Slice
 
 from .base import DocParser
+from ..store import open_record
 from .. import format
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+FIELD = 'field'
+INDEX = 'index'
+ALL = 'all'
+NOT_SET = object()
+
+
+def compile_steps(expr):
+    """
+    Compiles a simple jsonpath (fields, indices and [*]) into lookup steps.
+    Returns None for other expressions like filters, which are run by jsonpath_ng.
+    """
+    if isinstance(expr, Child):
+        left = compile_steps(expr.left)
+        right = None if isinstance(expr.right, Root) else compile_steps(expr.right)
+        if left is None or right is None:
+            return None
+        return left + right
+    if isinstance(expr, Root):
+        return []
+    if isinstance(expr, Fields) and len(expr.fields) == 1 and expr.fields[0] not in ('*', '`this`', '`parent`'):
+        return [(FIELD, expr.fields[0])]
+    if isinstance(expr, Index):
+        return [(INDEX, expr.indices)]
+    if isinstance(expr, Slice) and expr.start is None and expr.end is None and expr.step is None:
+        return [(ALL, None)]
+    return None
+
+
+def lookup(steps, doc):
+    """Values of the compiled steps, the same as the values found by jsonpath_ng."""
+    values = [doc]
+    for step, arg in steps:
+        found = []
+        for value in values:
+            if step == FIELD:
+                try:
+                    value = value.get(arg, NOT_SET)
+                except (TypeError, AttributeError):
+                    continue
+                if value is not NOT_SET:
+                    found.append(value)
+            elif step == INDEX:
+                if isinstance(value, dict):
+                    continue
+                for index in arg:
+                    if value and -len(value) <= index < len(value):
+                        found.append(value[index])
+            elif value is None:
+                continue
+            elif isinstance(value, (dict, int, float, str, bool)):
+                # like jsonpath_ng a single value is a list with one item
+                found.append(value)
+            else:
+                found.extend(value)
+        values = found
+    return values
+
 
 class JSONParser(DocParser):
     EXPR_CACHE = {}
+    STEPS_CACHE = {}
 
-    def get_parseexpr(self, name):
+    @staticmethod
+    def get_parseexpr(name):
         if name in JSONParser.EXPR_CACHE:
             expr = JSONParser.EXPR_CACHE[name]
         else:
@@ -17,35 +83,51 @@ class JSONParser(DocParser):
         return expr
 
     def parse_doc(self):
-        return json.load(open(self.filename))
+        with open_record(self.filename, mode='rb') as fp:
+            data = fp.read()
+        if orjson is not None:
+            try:
+                return orjson.loads(data)
+            except orjson.JSONDecodeError:
+                # NaN or integers larger than 64 bit
+                pass
+        return json.loads(data)
 
     def find(self, name=None, **kwargs):
-        expr = self.get_parseexpr(name)
-        tags = expr.find(self.doc)
-        return [format.format(tag.value) for tag in tags]
-
-    @property
-    def fulltext(self):
-        """Pull all values from nested JSON."""
-        arr = []
-
-        def extract(obj, arr):
-            """Recursively search for values in JSON tree."""
-            if isinstance(obj, dict):
-                for k, v in obj.items():
-                    if isinstance(v, (dict, list)):
-                        extract(v, arr)
-                    else:
-                        arr.append(v)
-            elif isinstance(obj, list):
-                for item in obj:
-                    extract(item, arr)
-            return arr
-
-        lines = extract(self.doc, arr)
-        lines_as_str = [str(txt) for txt in lines if txt is not None]
-        lines_not_empty = [txt for txt in lines_as_str if len(txt) > 0]
-        return ','.join(lines_not_empty)
+        return self.select(self.compile(name, **kwargs))
+
+    @classmethod
+    def compile(cls, name, **kwargs):
+        if name not in JSONParser.STEPS_CACHE:
+            expr = cls.get_parseexpr(name)
+            JSONParser.STEPS_CACHE[name] = (expr, compile_steps(expr))
+        return JSONParser.STEPS_CACHE[name]
+
+    def select(self, query):
+        expr, steps = query
+        if steps is None:
+            values = [tag.value for tag in expr.find(self.doc)]
+        else:
+            values = lookup(steps, self.doc)
+        return [format.format(value) for value in values]
+
+    def strings(self):
+        """Yields the values of all objects in the nested JSON in document order."""
+        stack = [(iter([self.doc]), False)]
+        while stack:
+            values, in_object = stack[-1]
+            for value in values:
+                if isinstance(value, dict):
+                    stack.append((iter(value.values()), True))
+                    break
+                if isinstance(value, list):
+                    stack.append((iter(value), False))
+                    break
+                # plain values of lists are not part of the fulltext
+                if in_object and value is not None:
+                    yield str(value)
+            else:
+                stack.pop()
 
     @classmethod
     def extension(cls):
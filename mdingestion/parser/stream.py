@@ -0,0 +1,143 @@
+from lxml import etree
+
+from .base import Fulltext
+from .xpath import XPathParser, Document
+from ..store import open_record
+from ..exceptions import MappingError
+
+import logging
+
+
+class StreamTarget(object):
+    """
+    lxml parser target building a pruned tree while the record is parsed.
+
+    Elements with one of the names are kept with their content. Elements with one of the
+    skeleton names (the parents in dotted paths) and the ancestors of kept elements are kept
+    without text. All other elements are removed when they end. The fulltext is collected
+    in document order like BeautifulSoup doc.find_all(string=True).
+    """
+    def __init__(self, names, skeleton, fulltext):
+        self.names = names
+        self.skeleton = skeleton
+        self.fulltext = fulltext
+        self.builder = etree.TreeBuilder()
+        self.depth = 0
+        self.keep = []
+        self.strings = []
+
+    def flush(self):
+        if self.strings:
+            self.fulltext.add(''.join(self.strings).strip())
+            self.strings = []
+
+    def start(self, tag, attrib, nsmap):
+        self.flush()
+        name = etree.QName(tag).localname
+        if self.depth:
+            self.depth += 1
+        elif name in self.names:
+            self.depth = 1
+        self.keep.append(self.depth > 0 or name in self.skeleton)
+        # the target gets the default namespace with prefix ''
+        self.builder.start(tag, attrib, {prefix or None: uri for prefix, uri in nsmap.items()})
+
+    def end(self, tag):
+        self.flush()
+        element = self.builder.end(tag)
+        keep = self.keep.pop()
+        if self.depth:
+            self.depth -= 1
+        parent = element.getparent()
+        if not keep and parent is not None and len(element) == 0:
+            parent.remove(element)
+
+    def data(self, data):
+        if not self.fulltext.full:
+            self.strings.append(data)
+        if self.depth:
+            self.builder.data(data)
+
+    def comment(self, text):
+        self.flush()
+        self.fulltext.add((text or '').strip())
+        if self.depth:
+            self.builder.comment(text)
+
+    def pi(self, target, data=None):
+        self.flush()
+        self.fulltext.add(f"{target} {data or ''}".strip())
+        if self.depth:
+            self.builder.pi(target, data)
+
+    def close(self):
+        self.flush()
+        return self.builder.close()
+
+
+class StreamParser(XPathParser):
+    """
+    XML parser for large records which keeps only the elements of the declared paths.
+
+    The record is fed to lxml in chunks and the elements not needed by the paths are
+    dropped as soon as they end, so the memory used does not depend on the record size.
+    find() with a name not declared parses the whole record again, logged as warning once per name.
+    With STRICT (used in the tests) a name not declared raises a MappingError.
+    """
+    CHUNK_SIZE = 64 * 1024
+    STRICT = False
+    # names not declared which were already logged
+    UNDECLARED = set()
+
+    def __init__(self, filename, paths=None):
+        super().__init__(filename)
+        self.paths = set(paths or [])
+        self.names = {path.split('.')[-1] for path in self.paths}
+        self.skeleton = {name for path in self.paths for name in path.split('.')[:-1]}
+        self._fulltext = None
+        self._full_doc = None
+
+    def parse_doc(self):
+        target = StreamTarget(self.names, self.skeleton, Fulltext(self.FULLTEXT_MAX_SIZE))
+        parser = etree.XMLParser(target=target, recover=True, resolve_entities=False, huge_tree=True)
+        with open_record(self.filename, mode='rb') as fp:
+            for chunk in iter(lambda: fp.read(self.CHUNK_SIZE), b''):
+                parser.feed(chunk)
+        root = parser.close()
+        self._fulltext = target.fulltext.getvalue()
+        return Document(root.getroottree())
+
+    def declared(self, name):
+        """Returns True if the pruned tree has all elements of the dotted name."""
+        if not isinstance(name, str):
+            return False
+        for _name in name.split('.'):
+            if _name in self.names:
+                # the descendants of a kept element are all kept
+                return True
+            if _name not in self.skeleton:
+                return False
+        return False
+
+    @property
+    def full_doc(self):
+        if self._full_doc is None:
+            self._full_doc = super().parse_doc()
+        return self._full_doc
+
+    def select(self, query):
+        name = query[0]
+        if self.declared(name):
+            return self.search(self.doc, query)
+        if self.STRICT:
+            raise MappingError(f"name={name} is not declared in the paths of the stream parser")
+        if name not in self.UNDECLARED:
+            self.UNDECLARED.add(name)
+            logging.warning(f"name={name} is not declared, parsing the whole record {self.filename}")
+        return self.search(self.full_doc, query)
+
+    @property
+    def fulltext(self):
+        if self.doc is None:
+            return ''
+        return self._fulltext
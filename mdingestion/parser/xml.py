@@ -1,21 +1,147 @@
+from bisect import bisect_left, bisect_right
+
 from bs4 import BeautifulSoup
+from bs4.element import Tag, NavigableString
 
 from .base import DocParser
+from ..store import open_record
 
 import logging
 
 
+class TagIndex(object):
+    """
+    Index of the tags of a document built in one pass.
+
+    The tags are numbered in document order. Each tag name (local and prefixed name)
+    maps to the positions and tags with this name. The descendants of a tag are the
+    tags between its position and the end of its subtree, so a search within a tag
+    is a bisect of the positions of the name.
+    """
+    def __init__(self, doc):
+        self.names = {}
+        self.scopes = {}
+        self.build(doc)
+
+    def build(self, doc):
+        stack = []
+        position = 0
+        for tag in doc.descendants:
+            if not isinstance(tag, Tag):
+                continue
+            while stack and stack[-1][0] is not tag.parent:
+                self.close(stack.pop(), position)
+            stack.append((tag, position))
+            self.add(tag.name, position, tag)
+            if tag.prefix:
+                self.add(f"{tag.prefix}:{tag.name}", position, tag)
+            position += 1
+        while stack:
+            self.close(stack.pop(), position)
+
+    def add(self, name, position, tag):
+        positions, tags = self.names.setdefault(name, ([], []))
+        positions.append(position)
+        tags.append(tag)
+
+    def close(self, entry, end):
+        tag, start = entry
+        self.scopes[id(tag)] = (start, end)
+
+    def find_all(self, name, within=None, attrs=None):
+        """Tags with name and attributes like tag.find_all(name, attrs=attrs) within a tag or the document."""
+        positions, tags = self.names.get(name, ([], []))
+        if within is None:
+            lo, hi = 0, len(positions)
+        else:
+            start, end = self.scopes[id(within)]
+            lo, hi = bisect_right(positions, start), bisect_left(positions, end)
+        found = tags[lo:hi]
+        if attrs:
+            found = [tag for tag in found if self.match(tag, attrs)]
+        return found
+
+    def find(self, name, within=None):
+        found = self.find_all(name, within=within)
+        if found:
+            return found[0]
+        return None
+
+    @staticmethod
+    def match(tag, attrs):
+        for key, value in attrs.items():
+            _value = tag.attrs.get(key)
+            if value is True:
+                if _value is None:
+                    return False
+            elif value is None:
+                if _value is not None:
+                    return False
+            elif _value != value:
+                return False
+        return True
+
+
 class XMLParser(DocParser):
 
+    def __init__(self, filename):
+        super().__init__(filename)
+        self._index = None
+
     def parse_doc(self):
-        return BeautifulSoup(open(self.filename), 'xml')
+        return BeautifulSoup(open_record(self.filename), 'xml')
+
+    @property
+    def index(self):
+        if self._index is None:
+            self._index = TagIndex(self.doc)
+        return self._index
 
     def find(self, name=None, **kwargs):
-        """Just a convienice method for BeautifulSoup doc.find_all()"""
+        """Just a convienice method for BeautifulSoup doc.find_all() answered from the tag index."""
+        return self.select(self.compile(name, **kwargs))
+
+    @classmethod
+    def compile(cls, name, **kwargs):
+        limit = kwargs.get('limit')
+        attrs = dict(kwargs.get('attrs') or {},
+                     **{key: value for key, value in kwargs.items() if key not in ('attrs', 'limit')})
+        if not cls.indexed(name, attrs) or not isinstance(limit, (int, type(None))):
+            return (name, None, kwargs, None)
+        # name=something.very.important
+        # search: doc.something.very.find_all('important', limit=limit)
+        return (name, name.split('.'), attrs, limit)
+
+    def select(self, query):
+        name, names, attrs, limit = query
+        if names is None:
+            return self._find(name, **attrs)
+        tag = None
+        for _name in names[:-1]:
+            tag = self.index.find(_name, within=tag)
+            if tag is None:
+                logging.warning(f"xml parser failed for name={name}.")
+                return []
+        tags = self.index.find_all(names[-1], within=tag, attrs=attrs)
+        if limit:
+            tags = tags[:limit]
+        return [tag.text for tag in tags]
+
+    @staticmethod
+    def indexed(name, attrs):
+        """Returns True if the search is supported by the tag index: a name and plain attribute values."""
+        if not isinstance(name, str):
+            return False
+        for key, value in attrs.items():
+            if key in ('recursive', 'string', 'text'):
+                return False
+            if value is not True and value is not None and not isinstance(value, str):
+                return False
+        return True
+
+    def _find(self, name=None, **kwargs):
         try:
             if '.' in name:
-                # name=something.very.important
-                # run: doc.something.very.find_all('important')
                 _dotted, _name = name.rsplit('.', 1)
                 _doc = eval(f"doc.{_dotted}", dict(doc=self.doc))
             else:
@@ -31,8 +157,8 @@ class XMLParser(DocParser):
     def extension(cls):
         return '.xml'
 
-    @property
-    def fulltext(self):
-        lines = [txt.strip() for txt in self.doc.find_all(string=True)]
-        lines_not_empty = [txt for txt in lines if len(txt) > 0]
-        return ','.join(lines_not_empty)
+    def strings(self):
+        # the strings of doc.find_all(string=True) without collecting them in a list
+        for node in self.doc.descendants:
+            if isinstance(node, NavigableString):
+                yield node.strip()
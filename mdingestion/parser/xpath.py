@@ -0,0 +1,297 @@
+from bisect import bisect_left
+
+from lxml import etree
+
+from .xml import XMLParser
+from ..store import open_record
+
+import logging
+
+XML_NAMESPACE = 'http://www.w3.org/XML/1998/namespace'
+ASCII_SPACES = '\x20\x0a\x09\x0c\x0d'
+TEXT = etree.XPath('descendant-or-self::text()')
+
+
+def text(element):
+    """
+    Text of the element like BeautifulSoup tag.text.
+    BeautifulSoup replaces whitespace-only strings by a newline or a space.
+    """
+    strings = []
+    for string in TEXT(element):
+        if not string.strip(ASCII_SPACES):
+            string = '\n' if '\n' in string else ' '
+        strings.append(string)
+    return ''.join(strings)
+
+
+def name_test(name):
+    """XPath test of an element name, the local name if the name has no prefix."""
+    if name is None:
+        return '*'
+    if ':' in name:
+        return f"*[name()='{name}']"
+    return f"*[local-name()='{name}']"
+
+
+def attrs_test(attrs):
+    """
+    XPath tests and variables of attribute filters.
+    Attribute names are matched with the prefix used in the document, like BeautifulSoup does.
+    """
+    tests = []
+    variables = {}
+    for i, (key, value) in enumerate(sorted(attrs.items())):
+        variables[f'k{i}'] = key
+        if value is True:
+            tests.append(f"[@*[name()=$k{i}]]")
+        elif value is None:
+            tests.append(f"[not(@*[name()=$k{i}])]")
+        else:
+            variables[f'v{i}'] = value
+            tests.append(f"[@*[name()=$k{i}]=$v{i}]")
+    return ''.join(tests), variables
+
+
+def qualified_name(element, key):
+    """Attribute name with the prefix used in the document, like XPath name()."""
+    qname = etree.QName(key)
+    if not qname.namespace:
+        return key
+    if qname.namespace == XML_NAMESPACE:
+        return f"xml:{qname.localname}"
+    for prefix, uri in element.nsmap.items():
+        if uri == qname.namespace and prefix:
+            return f"{prefix}:{qname.localname}"
+    return qname.localname
+
+
+class ElementIndex(object):
+    """
+    Index of the elements of a document built in one pass, like the TagIndex of XMLParser.
+
+    Each local name and prefixed name maps to the positions and elements with this name in
+    document order. A search within an element is a bisect over the positions of its subtree,
+    which includes the element itself like the descendant-or-self axis.
+    """
+    def __init__(self, root):
+        self.names = {}
+        self.scopes = {}
+        self.build(root)
+
+    def build(self, root):
+        stack = []
+        position = 0
+        for element in root.iter(tag=etree.Element):
+            parent = element.getparent()
+            while stack and stack[-1][0] is not parent:
+                self.close(stack.pop(), position)
+            stack.append((element, position))
+            localname = etree.QName(element).localname
+            self.add(localname, position, element)
+            if element.prefix:
+                self.add(f"{element.prefix}:{localname}", position, element)
+            position += 1
+        while stack:
+            self.close(stack.pop(), position)
+
+    def add(self, name, position, element):
+        positions, elements = self.names.setdefault(name, ([], []))
+        positions.append(position)
+        elements.append(element)
+
+    def close(self, entry, end):
+        element, start = entry
+        self.scopes[element] = (start, end)
+
+    def find_all(self, name, within=None, attrs=None):
+        positions, elements = self.names.get(name, ([], []))
+        if within is None:
+            lo, hi = 0, len(positions)
+        else:
+            start, end = self.scopes[within]
+            lo, hi = bisect_left(positions, start), bisect_left(positions, end)
+        found = elements[lo:hi]
+        if attrs:
+            found = [element for element in found if self.match(element, attrs)]
+        return found
+
+    def find(self, name, within=None):
+        found = self.find_all(name, within=within)
+        if found:
+            return found[0]
+        return None
+
+    @staticmethod
+    def match(element, attrs):
+        values = {qualified_name(element, key): value for key, value in element.attrib.items()}
+        for key, value in attrs.items():
+            _value = values.get(key)
+            if value is True:
+                if _value is None:
+                    return False
+            elif value is None:
+                if _value is not None:
+                    return False
+            elif _value != value:
+                return False
+        return True
+
+
+class Element(object):
+    """
+    BeautifulSoup like access to an lxml element
+    for readers using parser.doc.find(), find_all(), get() and text.
+    """
+    AXIS = 'descendant'
+    EXPR_CACHE = {}
+
+    def __init__(self, element):
+        self.element = element
+
+    @classmethod
+    def xpath(cls, axis, name, attrs):
+        test, variables = attrs_test(attrs)
+        key = (axis, name, tuple(sorted(variables)), test)
+        if key not in cls.EXPR_CACHE:
+            cls.EXPR_CACHE[key] = etree.XPath(f"{axis}::{name_test(name)}{test}")
+        return cls.EXPR_CACHE[key], variables
+
+    def find_all(self, name=None, attrs=None, limit=None, **kwargs):
+        attrs = dict(attrs or {}, **kwargs)
+        expr, variables = self.xpath(self.AXIS, name, attrs)
+        elements = expr(self.element, **variables)
+        if limit:
+            elements = elements[:limit]
+        return [Element(element) for element in elements]
+
+    def find(self, name=None, attrs=None, **kwargs):
+        elements = self.find_all(name, attrs=attrs, limit=1, **kwargs)
+        if elements:
+            return elements[0]
+        return None
+
+    @property
+    def name(self):
+        return etree.QName(self.element).localname
+
+    @property
+    def text(self):
+        return text(self.element)
+
+    @property
+    def attrs(self):
+        attrs = {}
+        parent = self.element.getparent()
+        for prefix, uri in self.element.nsmap.items():
+            if parent is None or parent.nsmap.get(prefix) != uri:
+                attrs[f'xmlns:{prefix}' if prefix else 'xmlns'] = uri
+        prefixes = {uri: prefix for prefix, uri in self.element.nsmap.items()}
+        prefixes[XML_NAMESPACE] = 'xml'
+        for key, value in self.element.attrib.items():
+            qname = etree.QName(key)
+            if qname.namespace:
+                key = f"{prefixes.get(qname.namespace)}:{qname.localname}"
+            attrs[key] = value
+        return attrs
+
+    def get(self, key, default=None):
+        return self.attrs.get(key, default)
+
+    def __getitem__(self, key):
+        return self.attrs[key]
+
+    def __getattr__(self, name):
+        # like BeautifulSoup: tag.name returns the first descendant with this name
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return self.find(name)
+
+
+class Document(Element):
+    """The document also matches the root element."""
+    AXIS = 'descendant-or-self'
+
+    def __init__(self, tree):
+        super().__init__(tree.getroot())
+        self.tree = tree
+        self._index = None
+
+    @property
+    def index(self):
+        if self._index is None:
+            self._index = ElementIndex(self.tree.getroot())
+        return self._index
+
+
+class XPathParser(XMLParser):
+    """
+    XML parser using lxml.
+    It has the same find() results as XMLParser, names are matched by local name.
+    The searches are answered from an index of the elements built in one pass over the record,
+    so all fields of a reader plan are extracted with one traversal.
+    """
+    PARSER = etree.XMLParser(recover=True, resolve_entities=False, huge_tree=True)
+
+    def parse_doc(self):
+        with open_record(self.filename, mode='rb') as fp:
+            return Document(etree.parse(fp, self.PARSER))
+
+    def find(self, name=None, **kwargs):
+        return self.select(self.compile(name, **kwargs))
+
+    @classmethod
+    def compile(cls, name, **kwargs):
+        """
+        Compiles the search for name and attribute filters.
+        A dotted name a.b.c selects all c within the first b within the first a.
+        """
+        limit = kwargs.pop('limit', None)
+        attrs = dict(kwargs.pop('attrs', None) or {}, **kwargs)
+        if not isinstance(name, str) or not isinstance(limit, (int, type(None))):
+            logging.warning(f"xml parser failed for name={name}.")
+            return (name, None, attrs, limit)
+        return (name, name.split('.'), attrs, limit)
+
+    def select(self, query):
+        return self.search(self.doc, query)
+
+    def search(self, doc, query):
+        name, names, attrs, limit = query
+        if names is None:
+            return []
+        try:
+            element = None
+            for _name in names[:-1]:
+                element = doc.index.find(_name, within=element)
+                if element is None:
+                    return []
+            elements = doc.index.find_all(names[-1], within=element, attrs=attrs)
+            if limit:
+                elements = elements[:limit]
+            results = [text(element) for element in elements]
+        except Exception:
+            logging.warning(f"xml parser failed for name={name}.", exc_info=True)
+            results = []
+        return results
+
+    def strings(self):
+        """Yields the strings like BeautifulSoup doc.find_all(string=True) in document order."""
+        root = self.doc.tree.getroot()
+        stack = [root]
+        stack.extend(root.itersiblings(preceding=True))
+        stack[:0] = reversed(list(root.itersiblings()))
+        while stack:
+            node = stack.pop()
+            if isinstance(node, str):
+                yield node.strip()
+                continue
+            if isinstance(node, etree._ProcessingInstruction):
+                yield f"{node.target} {node.text or ''}".strip()
+            elif isinstance(node, etree._Comment):
+                yield (node.text or '').strip()
+            elif not isinstance(node, etree._Entity) and node.text:
+                yield node.text.strip()
+            if node.tail:
+                stack.append(node.tail)
+            stack.extend(reversed(node))
@@ -9,9 +9,20 @@ from .ddi25 import DDI25Reader
 
 from ..service_types import SchemaType
 from ..sniffer import sniffer
+from ..parser import XPathParser, StreamParser
 
+from functools import partial
 
-def build_reader(reader_type=None, service_type=None):
+# schemas with the same results of the lxml XPath parser as of the BeautifulSoup parser
+XPATH_SCHEMAS = [
+    SchemaType.DataCite,
+    SchemaType.DublinCore,
+    SchemaType.ISO19139,
+    SchemaType.FGDC,
+]
+
+
+def build_reader(reader_type=None, service_type=None, xpath=False, stream=False, paths=None):
     if reader_type == SchemaType.DDI25:
         reader = DDI25Reader()
     elif reader_type == SchemaType.Eudatcore:
@@ -28,7 +39,12 @@ def build_reader(reader_type=None, service_type=None):
         reader = JSONReader()
     else:
         reader = DublinCoreReader()
+    if xpath and reader_type in XPATH_SCHEMAS:
+        reader.DOC_PARSER = XPathParser
     reader.SNIFFER = sniffer(service_type)
+    if stream and reader.PATHS:
+        # the streaming parser keeps only the elements searched by reader, sniffer and community
+        reader.DOC_PARSER = partial(StreamParser, paths=reader.PATHS + reader.SNIFFER.PATHS + list(paths or []))
     return reader
 
 
@@ -2,7 +2,7 @@ from ..core import B2FDoc
 from ..parser import XMLParser
 from ..parser import JSONParser
 from ..format import format_url
-from ..classify import Classify
+from ..classify import get_classifier
 
 import logging
 
@@ -10,16 +10,22 @@ import logging
 class Reader(object):
     DOC_PARSER = None
     SNIFFER = None
+    # declared fields, a Plan
+    FIELDS = None
+    # names searched by the reader, needed by the streaming parser
+    PATHS = []
 
     def __init__(self):
         self.filename = None
         self.parser = None
         self.sniffer = None
         self.errors = dict(invalid_geometry=[])
+        self.timings = {}
 
     def read(self, filename, community=None, url=None, oai_metadata_prefix=None):
         self.filename = filename
         self.parser = self.DOC_PARSER(filename)
+        self.timings = {}
         # TODO: handling of oai_metadata_prefix parameter needs to be refactored
         doc = B2FDoc(filename, community, url, oai_metadata_prefix)
         self._parse(doc)
@@ -33,7 +39,13 @@ class Reader(object):
         doc.fulltext = self.parser.fulltext
 
     def parse(self, doc):
-        raise NotImplementedError
+        if self.FIELDS is None:
+            raise NotImplementedError
+        self.extract(doc)
+
+    def extract(self, doc):
+        """Sets the declared fields and keeps the extraction time of each field."""
+        self.timings.update(self.FIELDS.extract(self, doc))
 
     def find(self, name=None, **kwargs):
         return self.parser.find(name=name, **kwargs)
@@ -44,16 +56,26 @@ class Reader(object):
         return False
 
     def find_doi(self, name=None, **kwargs):
-        urls = [url for url in self.find(name, **kwargs) if 'doi' in format_url(url)]
-        return urls
+        return self.doi_urls(self.find(name, **kwargs))
 
     def find_pid(self, name=None, **kwargs):
-        urls = [url for url in self.find(name, **kwargs) if 'hdl.handle.net' in format_url(url)]
-        return urls
+        return self.pid_urls(self.find(name, **kwargs))
 
     def find_source(self, name=None, **kwargs):
+        return self.source_urls(self.find(name, **kwargs))
+
+    @staticmethod
+    def doi_urls(urls):
+        return [url for url in urls if 'doi' in format_url(url)]
+
+    @staticmethod
+    def pid_urls(urls):
+        return [url for url in urls if 'hdl.handle.net' in format_url(url)]
+
+    @staticmethod
+    def source_urls(values):
         urls = []
-        for url in self.find(name, **kwargs):
+        for url in values:
             f_url = format_url(url)
             if not f_url:
                 continue
@@ -65,7 +87,7 @@ class Reader(object):
         return urls
 
     def discipline(self, doc, default=None):
-        classifier = Classify()
+        classifier = get_classifier()
         return classifier.map_discipline(doc.keywords, default)
 
     def find_geometry(self):
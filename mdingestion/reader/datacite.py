@@ -1,6 +1,7 @@
 import shapely
 
 from .base import XMLReader
+from .plan import Plan, Field, Method
 from ..sniffer import OAISniffer
 from ..format import format_value
 from ..util import convert_to_lon_180
@@ -8,31 +9,31 @@ from ..util import convert_to_lon_180
 
 class DataCiteReader(XMLReader):
     SNIFFER = OAISniffer
-
-    def parse(self, doc):
-        doc.title = self.find('title')
-        doc.description = self.find('description')
-        doc.doi = self.find_doi('resource.identifier')
-        doc.pid = self.pid()
-        doc.source = self.find_source('resource.identifier')
-        doc.keywords = self.find('subject')
-        doc.discipline = self.discipline(doc)
-        doc.related_identifier = self.find('relatedIdentifier')
-        doc.creator = self.creator()
-        doc.publisher = self.find('publisher')
-        doc.contributor = self.find('contributorName')
-        doc.funding_reference = self.funding_reference()
-        doc.publication_year = self.publication_year()
-        doc.rights = self.rights()
-        doc.contact = self.contact()
-        doc.language = self.find('language')
-        doc.resource_type = self.resource_type()
-        doc.format = self.find('format')
-        doc.size = self.find('size')
-        doc.version = self.find('metadata.version')
-        doc.temporal_coverage = self.find('date')
-        doc.geometry = self.find_geometry()
-        doc.places = self.find('geoLocationPlace')
+    FIELDS = Plan([
+        ('title', 'title'),
+        ('description', 'description'),
+        ('doi', Field('resource.identifier', select='doi')),
+        ('pid', Method('pid')),
+        ('source', Field('resource.identifier', select='source')),
+        ('keywords', 'subject'),
+        ('discipline', Method('discipline', doc=True)),
+        ('related_identifier', 'relatedIdentifier'),
+        ('creator', Method('creator')),
+        ('publisher', 'publisher'),
+        ('contributor', 'contributorName'),
+        ('funding_reference', Method('funding_reference')),
+        ('publication_year', Method('publication_year')),
+        ('rights', Method('rights')),
+        ('contact', Method('contact')),
+        ('language', 'language'),
+        ('resource_type', Method('resource_type')),
+        ('format', 'format'),
+        ('size', 'size'),
+        ('version', 'metadata.version'),
+        ('temporal_coverage', 'date'),
+        ('geometry', Method('find_geometry')),
+        ('places', 'geoLocationPlace'),
+    ])
 
     def pid(self):
         urls = self.find_pid('alternateIdentifier')
@@ -28,10 +28,10 @@ class DublinCoreReader(XMLReader):
         doc.resource_type = self.find('type')
         doc.format = self.find('format')
         temporal = self.temporal_coverage()
-        if 'start' in temporal.keys(): 
-            doc.temporal_coverage_end = string_aux['start']       
-        if 'end' in temporal.keys(): 
-            doc.temporal_coverage_end = string_aux['end']
+        if 'start' in temporal:
+            doc.temporal_coverage_begin_date = temporal['start']
+        if 'end' in temporal:
+            doc.temporal_coverage_end_date = temporal['end']
         doc.geometry = self.find_geometry()
         doc.places = self.places()
         doc.size = self.find('extent')
@@ -52,36 +52,38 @@ class DublinCoreReader(XMLReader):
         return places
 
     def _dc_item_to_dict(self, string_aux):
-        string_list = string_aux.replace('; ',',').replace(';',',').replace('=',',').split(',')
-        string_dict = {string_list[i]: string_list[i + 1] for i in range(0, len(string_list)-1, 2)}
+        string_dict = {}
+        for item in string_aux.split(';'):
+            if '=' in item:
+                key, value = item.split('=', 1)
+                string_dict[key.strip()] = value.strip()
         return string_dict
-    
+
     def temporal_coverage(self):
         string_aux = None
         string_dict = {}
-        if self.parser.doc.find('coverage', attrs={'xsi:type': 'dcterms:Period'}): 
-            string_aux = self.parser.doc.find('temporal', attrs={'xsi:type': 'dcterms:Period'}).text
+        if self.parser.doc.find('coverage', attrs={'xsi:type': 'dcterms:Period'}):
+            string_aux = self.parser.doc.find('coverage', attrs={'xsi:type': 'dcterms:Period'}).text
         if self.parser.doc.find('temporal', attrs={'xsi:type': 'dcterms:Period'}):
             string_aux = self.parser.doc.find('temporal', attrs={'xsi:type': 'dcterms:Period'}).text
-                
+
         if string_aux:
             # https://www.dublincore.org/specifications/dublin-core/dcmi-period/
             # <dc:coverage xsi:type="dcterms:Period">name=Perth International Arts Festival, 2000; start=2000-01-26; end=2000-02-20; scheme=W3C-DTF;</dc:coverage>
             # <dcterms:temporal xsi:type="dcterms:Period">name=Perth International Arts Festival, 2000; start=2000-01-26; end=2000-02-20; scheme=W3C-DTF;</dcterms:temporal>
-            if string_aux.find('start'): 
+            if '=' in string_aux:
                 string_dict = self._dc_item_to_dict(string_aux)
-            elif not string_aux.find('='):
+            else:
                 # DC non-normative, dangerous without keys
                 # <dcterms:temporal xsi:type="dcterms:Period">2000-01-26,2000-02-20</dcterms:temporal>
                 # <dcterms:temporal xsi:type="dcterms:Period">2000-01-26 2000-02-20</dcterms:temporal>
-                string_list= string_aux.string_aux.replace(',',' ').split()
-                string_dict['start'] = string_list[0]
-                if len(string_list) > 1 : 
+                string_list = string_aux.replace(',', ' ').split()
+                if string_list:
+                    string_dict['start'] = string_list[0]
+                if len(string_list) > 1:
                     string_dict['end'] = string_list[1]
-                    
-         return string_dict 
-    
-    
+        return string_dict
+
     def _geometry_point(self, point):
         lon = float(point[0])
         lon = convert_to_lon_180(lon)
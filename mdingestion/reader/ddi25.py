@@ -1,35 +1,40 @@
 from .base import XMLReader
+from .plan import Plan, Method
 from ..sniffer import OAISniffer
 
 
 class DDI25Reader(XMLReader):
     """TODO: https://ddialliance.org/resources/ddi-profiles/dc"""
     SNIFFER = OAISniffer
-
-    def parse(self, doc):
-        self.identifier(doc)
-        doc.title = self.find('titl')
-        doc.creator = self.find('AuthEnty')
-        self.keywords(doc)
-        self.description(doc)
-        doc.publisher = self.find('producer')
-#        self.publisher(doc)
-        doc.contributor = self.find('othId')
-        self.publication_year(doc)
-        doc.resource_type = self.find('dataKind')
-        doc.format = self.find('fileType')
-        doc.discipline = self.discipline(doc)
-        self.related_identifier(doc)
-        self.rights(doc)
-        self.contact(doc)
-        self.language(doc)
-        self.temporal_coverage(doc)
-#       doc.geometry = self.find_geometry('geogCover')
-        self.places(doc)
-#       doc.size = self.find('extent')
-#       doc.version = self.find('hasVersion')
-        doc.funding_reference = self.find('fundAg')
-#       doc.instrument = self.find('')
+    FIELDS = Plan([
+        (None, Method('identifier', doc=True)),
+        ('title', 'titl'),
+        ('creator', 'AuthEnty'),
+        (None, Method('keywords', doc=True)),
+        (None, Method('description', doc=True)),
+        ('publisher', 'producer'),
+        # (None, Method('publisher', doc=True)),
+        ('contributor', 'othId'),
+        (None, Method('publication_year', doc=True)),
+        ('resource_type', 'dataKind'),
+        ('format', 'fileType'),
+        ('discipline', Method('discipline', doc=True)),
+        (None, Method('related_identifier', doc=True)),
+        (None, Method('rights', doc=True)),
+        (None, Method('contact', doc=True)),
+        (None, Method('language', doc=True)),
+        (None, Method('temporal_coverage', doc=True)),
+        # ('geometry', Method('find_geometry')),
+        (None, Method('places', doc=True)),
+        # ('size', 'extent'),
+        # ('version', 'hasVersion'),
+        ('funding_reference', 'fundAg'),
+        # ('instrument', ''),
+    ])
+    PATHS = FIELDS.paths + [
+        'holdings', 'IDNo', 'keyword', 'topcClas', 'abstract', 'sampProc', 'collMode', 'distDate',
+        'othrStdyMat', 'sources', 'copyright', 'restrctn', 'distrbtr', 'timePrd', 'geogCover', 'nation',
+    ]
 
     def identifier(self, doc):
         for holdings in self.parser.doc.find_all('holdings'):
@@ -1,6 +1,7 @@
 import shapely
 
 from .base import XMLReader
+from .plan import Plan, Field, Method
 from ..sniffer import OAISniffer
 from ..format import format_value
 from ..util import convert_to_lon_180
@@ -8,32 +9,32 @@ from ..util import convert_to_lon_180
 
 class EudatcoreReader(XMLReader):
     SNIFFER = OAISniffer
-
-    def parse(self, doc):
-        doc.title = self.find('title')
-        doc.description = self.find('description')
-        doc.doi = self.find_doi('identifier', identifierType="DOI")
-        doc.pid = self.find_pid('identifier', identifierType="PID")
-        doc.source = self.find_source('identifier', identifierType="URL")
-        doc.keywords = self.find('keyword')
-        doc.discipline = self.find('discipline')
-        doc.related_identifier = self.find('relatedIdentifier')
-        doc.creator = self.find('creator')
-        doc.publisher = self.find('publisher')
-        doc.contributor = self.find('contributor')
-        doc.funding_reference = self.find('fundingReference')
-        doc.publication_year = self.find('publicationYear')
-        doc.rights = self.find('rights')
-        doc.contact = self.find('contact')
-        doc.language = self.find('language')
-        doc.resource_type = self.find('resourceType')
-        doc.format = self.find('format')
-        doc.size = self.find('size')
-        doc.version = self.find('version')
-        doc.instrument = self.find('instrument')
-        doc.temporal_coverage = self.find('temporalCoverage')
-        doc.geometry = self.find_geometry()
-        doc.places = self.find('geoLocationPlace')
+    FIELDS = Plan([
+        ('title', 'title'),
+        ('description', 'description'),
+        ('doi', Field('identifier', select='doi', identifierType="DOI")),
+        ('pid', Field('identifier', select='pid', identifierType="PID")),
+        ('source', Field('identifier', select='source', identifierType="URL")),
+        ('keywords', 'keyword'),
+        ('discipline', 'discipline'),
+        ('related_identifier', 'relatedIdentifier'),
+        ('creator', 'creator'),
+        ('publisher', 'publisher'),
+        ('contributor', 'contributor'),
+        ('funding_reference', 'fundingReference'),
+        ('publication_year', 'publicationYear'),
+        ('rights', 'rights'),
+        ('contact', 'contact'),
+        ('language', 'language'),
+        ('resource_type', 'resourceType'),
+        ('format', 'format'),
+        ('size', 'size'),
+        ('version', 'version'),
+        ('instrument', 'instrument'),
+        ('temporal_coverage', 'temporalCoverage'),
+        ('geometry', Method('find_geometry')),
+        ('places', 'geoLocationPlace'),
+    ])
 
     def geometry(self):
         """
@@ -1,6 +1,7 @@
 import shapely
 
 from .base import XMLReader
+from .plan import Plan, Field, Method
 from ..sniffer import OAISniffer
 from ..format import format_value
 from ..util import convert_to_lon_180
@@ -8,35 +9,41 @@ from ..util import convert_to_lon_180
 
 class FFReader(XMLReader):
     SNIFFER = OAISniffer
+    FIELDS = Plan([
+        ('title', 'name'),
+        # ('description', 'description'),
+        # ('doi', Field('resource.identifier', select='doi')),
+        # ('pid', Field('alternateIdentifier', select='pid')),
+        ('source', Field('site.id', select='source')),
+        ('keywords', Method('keywords')),
+        # ('discipline', Method('discipline', doc=True)),
+        ('related_identifier', Method('related_identifier')),
+        ('creator', 'supervision.term'),
+        # ('publisher', 'publisher'),
+        ('contributor', 'museum.term'),
+        # ('funding_reference', 'fundingReference.funderName'),
+        ('publication_year', 'site.date'),
+        # ('rights', 'rights'),
+        # ('contact', Method('contact')),
+        # ('language', 'language'),
+        # ('resource_type', 'resourceType'),
+        # ('format', 'format'),
+        # ('size', 'size'),
+        # ('version', 'metadata.version'),
+        ('temporal_coverage', Method('temporal_coverage')),
+        ('temporal_coverage_begin_date', 'primaryObject.date.fromYear'),
+        ('temporal_coverage_end_date', 'primaryObject.date.toYear'),
+        ('geometry', Method('find_geometry')),
+        ('places', 'geoLocationPlace'),
+    ])
 
-    def parse(self, doc):
-        doc.title = self.find('name')
-        # doc.description = self.find('description')
-        # doc.doi = self.find_doi('resource.identifier')
-        # doc.pid = self.find_pid('alternateIdentifier')
-        doc.source = self.find_source('site.id')
+    def keywords(self):
         keywords = self.find('placeName.term')
         keywords.extend(self.find('objectType.term'))
-        doc.keywords = keywords
-        # doc.discipline = self.discipline(doc)
-        doc.related_identifier = []
-        doc.creator = self.find('supervision.term')
-        # doc.publisher = self.find('publisher')
-        doc.contributor = self.find('museum.term')
-        # doc.funding_reference = self.find('fundingReference.funderName')
-        doc.publication_year = self.find('site.date')
-        # doc.rights = self.find('rights')
-        # doc.contact = self.contact()
-        # doc.language = self.find('language')
-        # doc.resource_type = self.find('resourceType')
-        # doc.format = self.find('format')
-        # doc.size = self.find('size')
-        # doc.version = self.find('metadata.version')
-        doc.temporal_coverage = self.temporal_coverage()
-        doc.temporal_coverage_begin_date = self.find('primaryObject.date.fromYear')
-        doc.temporal_coverage_end_date = self.find('primaryObject.date.toYear')
-        doc.geometry = self.find_geometry()
-        doc.places = self.find('geoLocationPlace')
+        return keywords
+
+    def related_identifier(self):
+        return []
 
     def temporal_coverage(self):
         from_year = format_value(self.find('primaryObject.date.fromYear'), one=True)
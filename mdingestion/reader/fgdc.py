@@ -1,6 +1,7 @@
 import shapely
 
 from .base import XMLReader
+from .plan import Plan, Method
 from ..sniffer import OAISniffer
 from ..format import format_value
 from ..util import convert_to_lon_180
@@ -10,30 +11,30 @@ import logging
 
 class FGDCReader(XMLReader):
     SNIFFER = OAISniffer
-
-    def parse(self, doc):
-        doc.title = self.find('title')
-        doc.description = self.find('abstract')
-        doc.keywords = self.find('themekey')
-        # doc.discipline = format_value(self.find('subject'), type='string_words')
-        doc.source = self.find('onlink')
-        # doc.related_identifier = self.find('relatedIdentifier')
-        doc.creator = self.find('origin')
-        doc.publisher = self.find('distinfo.cntorg')
-        # doc.contributor = self.find('idinfo.cntorg')
-        # doc.funding_reference = self.find('fundingReference.funderName')
-        doc.publication_year = self.find('pubdate')
-        doc.rights = self.find('distliab')
-        doc.contact = self.find('cntemail')
-        # doc.language = self.find('language')
-        # doc.resource_type = self.find('resourceType')
-        doc.format = self.find('geoform')
-        # doc.size = self.find('size')
-        # doc.version = self.find('metadata.version')
-        doc.temporal_coverage_begin_date = self.find('begdate')
-        doc.temporal_coverage_end_date = self.find('enddate')
-        doc.geometry = self.find_geometry()
-        # doc.places = self.find('placekt')
+    FIELDS = Plan([
+        ('title', 'title'),
+        ('description', 'abstract'),
+        ('keywords', 'themekey'),
+        # ('discipline', 'subject'),
+        ('source', 'onlink'),
+        # ('related_identifier', 'relatedIdentifier'),
+        ('creator', 'origin'),
+        ('publisher', 'distinfo.cntorg'),
+        # ('contributor', 'idinfo.cntorg'),
+        # ('funding_reference', 'fundingReference.funderName'),
+        ('publication_year', 'pubdate'),
+        ('rights', 'distliab'),
+        ('contact', 'cntemail'),
+        # ('language', 'language'),
+        # ('resource_type', 'resourceType'),
+        ('format', 'geoform'),
+        # ('size', 'size'),
+        # ('version', 'metadata.version'),
+        ('temporal_coverage_begin_date', 'begdate'),
+        ('temporal_coverage_end_date', 'enddate'),
+        ('geometry', Method('find_geometry')),
+        # ('places', 'placekt'),
+    ])
 
     def geometry(self):
         if self.parser.doc.find('bounding'):
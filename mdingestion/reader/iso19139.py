@@ -1,6 +1,7 @@
 import shapely
 
 from .base import XMLReader
+from .plan import Plan, Method
 from ..sniffer import CSWSniffer
 from ..format import format_value
 from ..util import convert_to_lon_180
@@ -10,29 +11,25 @@ import logging
 
 class ISO19139Reader(XMLReader):
     SNIFFER = CSWSniffer
-
-    def parse(self, doc):
+    FIELDS = Plan([
         # 'identifier' always defined in community mapfile!
-        doc.related_identifier = self.find('linkage')
-        doc.title = self.find('CI_Citation.title')
-        doc.description = self.find('abstract')
-        doc.keywords = self.find('keyword')
-        doc.creator = self.find('CI_ResponsibleParty.individualName')
-        # doc.instrument = self.find('')
-        doc.publisher = self.find('CI_ResponsibleParty.organisationName')
-        # doc.contributor = self.find('')
-        doc.publication_year = self.find('CI_Citation.date')
-        doc.rights = self.find('MD_LegalConstraints')
-        doc.contact = self.find('contact.electronicMailAddress')
-        # doc.funding_reference = self.find('')
-        doc.language = self.find('MD_Metadata.language')
-        doc.resource_type = self.find('contentInfo.contentType')
-        doc.format = self.find('MD_Format.name')
-        # doc.size = self.find('')
-        # doc.version = self.find('distributionFormat.version')
-        doc.temporal_coverage_begin_date = self.find('EX_TemporalExtent.beginPosition')
-        doc.temporal_coverage_end_date = self.find('EX_TemporalExtent.endPosition')
-        doc.geometry = self.find_geometry()
+        ('related_identifier', 'linkage'),
+        ('title', 'CI_Citation.title'),
+        ('description', 'abstract'),
+        ('keywords', 'keyword'),
+        ('creator', 'CI_ResponsibleParty.individualName'),
+        ('publisher', 'CI_ResponsibleParty.organisationName'),
+        ('publication_year', 'CI_Citation.date'),
+        ('rights', 'MD_LegalConstraints'),
+        ('contact', 'contact.electronicMailAddress'),
+        ('language', 'MD_Metadata.language'),
+        ('resource_type', 'contentInfo.contentType'),
+        ('format', 'MD_Format.name'),
+        ('temporal_coverage_begin_date', 'EX_TemporalExtent.beginPosition'),
+        ('temporal_coverage_end_date', 'EX_TemporalExtent.endPosition'),
+        ('geometry', Method('find_geometry')),
+    ])
+    PATHS = FIELDS.paths + ['EX_GeographicBoundingBox']
 
     def geometry(self):
         geometry = None
@@ -0,0 +1,83 @@
+import time
+
+
+class Field(object):
+    """
+    Field found by a path like reader.find(path, **attrs).
+    select='doi', 'pid' or 'source' filters the urls like find_doi(), find_pid() and find_source().
+    """
+    def __init__(self, path, select=None, **attrs):
+        self.path = path
+        self.select = select
+        self.attrs = attrs
+
+    @property
+    def name(self):
+        return self.path
+
+    def compile(self, parser_class):
+        return parser_class.compile(self.path, **self.attrs)
+
+    def extract(self, reader, doc, query):
+        values = reader.parser.select(query)
+        if self.select == 'doi':
+            values = reader.doi_urls(values)
+        elif self.select == 'pid':
+            values = reader.pid_urls(values)
+        elif self.select == 'source':
+            values = reader.source_urls(values)
+        return values
+
+
+class Method(object):
+    """Field computed by a method of the reader, called with the doc if doc=True."""
+    def __init__(self, method, doc=False):
+        self.method = method
+        self.doc = doc
+
+    @property
+    def name(self):
+        return self.method
+
+    def compile(self, parser_class):
+        return None
+
+    def extract(self, reader, doc, query):
+        method = getattr(reader, self.method)
+        if self.doc:
+            return method(doc)
+        return method()
+
+
+class Plan(object):
+    """
+    Declared fields of a reader, a list of (field, path or Field or Method).
+    The fields are set in the declared order. A Method with field None updates the doc itself.
+
+    The paths are compiled once for each parser class and the extraction time of each field
+    is returned by extract(). The XML parsers answer the compiled paths from an index of the
+    elements built in one pass, so all fields of a record are extracted with one traversal.
+    """
+    def __init__(self, fields):
+        self.fields = [(name, Field(field) if isinstance(field, str) else field) for name, field in fields]
+        self._compiled = {}
+
+    @property
+    def paths(self):
+        return [field.path for _, field in self.fields if isinstance(field, Field)]
+
+    def compile(self, parser_class):
+        if parser_class not in self._compiled:
+            self._compiled[parser_class] = [
+                (name, field, field.compile(parser_class)) for name, field in self.fields]
+        return self._compiled[parser_class]
+
+    def extract(self, reader, doc):
+        timings = {}
+        for name, field, query in self.compile(type(reader.parser)):
+            start = time.perf_counter()
+            value = field.extract(reader, doc, query)
+            if name:
+                setattr(doc, name, value)
+            timings[name or field.name] = time.perf_counter() - start
+        return timings
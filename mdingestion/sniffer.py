@@ -14,6 +14,8 @@ def sniffer(service_type=None):
 
 
 class CatalogSniffer(object):
+    PATHS = []
+
     def __init__(self, parser):
         self.parser = parser
 
@@ -22,6 +24,8 @@ class CatalogSniffer(object):
 
 
 class OAISniffer(CatalogSniffer):
+    PATHS = ['setSpec', 'identifier']
+
     def update(self, doc):
         doc.oai_set = self.parser.find('setSpec', limit=1)
         doc.oai_identifier = self.parser.find('identifier', limit=1)
@@ -37,6 +41,8 @@ class OAISniffer(CatalogSniffer):
 
 
 class CSWSniffer(CatalogSniffer):
+    PATHS = ['fileIdentifier']
+
     def update(self, doc):
         doc.file_identifier = self.parser.find('fileIdentifier', limit=1)
         doc.metadata_access = self.metadata_access(doc)
@@ -0,0 +1,169 @@
+import os
+import io
+import json
+import zlib
+import hashlib
+import pathlib
+from datetime import datetime
+
+import logging
+
+# folder of the record store within the raw folder of a community
+STORE_DIR = '_store'
+# opened record stores
+STORES = {}
+
+
+def content_hash(data):
+    return hashlib.sha1(data).hexdigest()
+
+
+class RecordStore(object):
+    """
+    Append-only store for the raw records of a community.
+
+    The records are compressed and appended to segment files. The index is a JSON lines
+    file with an entry for each record keyed by uid with segment, offset, length,
+    datestamp and content hash. A later entry of a uid replaces an earlier one.
+    """
+    INDEX = 'index.jsonl'
+    SEGMENT_SIZE = 256 * 1024 * 1024
+
+    def __init__(self, path):
+        self.path = pathlib.Path(path)
+        self._index = None
+        self._index_size = None
+
+    @property
+    def index_file(self):
+        return self.path.joinpath(self.INDEX)
+
+    def exists(self):
+        return self.index_file.exists()
+
+    @property
+    def index(self):
+        if self._index is None:
+            self._index = self.load()
+        return self._index
+
+    def load(self):
+        index = {}
+        if not self.exists():
+            return index
+        with self.index_file.open() as fp:
+            for line in fp:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # incomplete entry of an interrupted write
+                    logging.warning(f"skipping invalid entry in record store index {self.index_file}")
+                    continue
+                index[entry['uid']] = entry
+        self._index_size = self.index_file.stat().st_size
+        return index
+
+    def is_outdated(self):
+        """Returns True if the index was written since it was loaded."""
+        if self._index is None or not self.exists():
+            return False
+        return self.index_file.stat().st_size != self._index_size
+
+    def segment(self, length):
+        segments = sorted(self.path.glob('segment-*.dat'))
+        if segments and segments[-1].stat().st_size + length <= self.SEGMENT_SIZE:
+            return segments[-1].name
+        return f"segment-{len(segments):05d}.dat"
+
+    def put(self, uid, data, ext='xml', datestamp=None):
+        """
+        Appends the record data (bytes) to the store.
+        Returns False if the record is already stored with the same content.
+        """
+        _hash = content_hash(data)
+        entry = self.index.get(uid)
+        if entry and entry['hash'] == _hash and entry['ext'] == ext:
+            return False
+        self.path.mkdir(parents=True, exist_ok=True)
+        blob = zlib.compress(data)
+        segment = self.segment(len(blob))
+        with self.path.joinpath(segment).open('ab') as fp:
+            offset = fp.tell()
+            fp.write(blob)
+        entry = dict(
+            uid=uid,
+            ext=ext,
+            segment=segment,
+            offset=offset,
+            length=len(blob),
+            datestamp=datestamp,
+            hash=_hash,
+            modified=datetime.now().isoformat(timespec='seconds'))
+        # the index entry is written after the record
+        with self.index_file.open('a') as fp:
+            fp.write(json.dumps(entry) + '\n')
+        self.index[uid] = entry
+        self._index_size = self.index_file.stat().st_size
+        return True
+
+    def get(self, uid):
+        """Returns the record data (bytes) or None."""
+        entry = self.index.get(uid)
+        if not entry:
+            return None
+        with self.path.joinpath(entry['segment']).open('rb') as fp:
+            fp.seek(entry['offset'])
+            blob = fp.read(entry['length'])
+        return zlib.decompress(blob)
+
+    def __contains__(self, uid):
+        return uid in self.index
+
+    def __len__(self):
+        return len(self.index)
+
+    def entries(self, ext=None, fromdate=None):
+        """Yields the index entries, optionally filtered by extension and modification date."""
+        for entry in self.index.values():
+            if ext and entry['ext'] != ext.lstrip('.'):
+                continue
+            if fromdate and datetime.fromisoformat(entry['modified']) < fromdate:
+                continue
+            yield entry
+
+
+def get_store(path):
+    """Returns the record store of the raw folder path, reloaded if it was changed."""
+    path = pathlib.Path(path).absolute().joinpath(STORE_DIR)
+    key = path.as_posix()
+    store = STORES.get(key)
+    if store is None or store.is_outdated():
+        store = RecordStore(path)
+        STORES[key] = store
+    return store
+
+
+def record_hash(filename):
+    """Returns the content hash of the raw record file or of the record in the record store."""
+    if not os.path.exists(filename):
+        path = pathlib.Path(filename)
+        entry = get_store(path.parent).index.get(path.stem)
+        if entry:
+            return entry['hash']
+    with open(filename, 'rb') as fp:
+        return content_hash(fp.read())
+
+
+def open_record(filename, mode='r'):
+    """
+    Opens the raw record file. If the file does not exist the record is read
+    from the record store in the same folder.
+    """
+    if not os.path.exists(filename):
+        path = pathlib.Path(filename)
+        store = get_store(path.parent)
+        if path.stem in store:
+            if 'b' in mode:
+                return io.BytesIO(store.get(path.stem))
+            return io.StringIO(store.get(path.stem).decode('utf8'))
+    return open(filename, mode)
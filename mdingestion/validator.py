@@ -31,6 +31,7 @@ class Validator(object):
             'total': 0,
             'valid': 0,
             'written': 0,
+            'skipped': 0,
             'broken_links': [],
             'required': {
                 'community': 0,
@@ -44,29 +45,57 @@ class Validator(object):
             'invalid': {},
             'values': {},
             'invalid_values': {},
-            'missing': [field.name for field in self.schema.children]
+            'missing': [field.name for field in self.schema.children],
         }
+        # seconds spent on the extraction of each declared field and hits and misses of the memoized formatters,
+        # only in the short summary to keep the summary the same in each run
+        self.extraction_time = {}
+        self.format_cache = {}
 
     def validate(self, doc):
+        return self.update(self.check(doc))
+
+    def check(self, doc):
+        """
+        Validates the doc without updating the summary.
+        The result can be passed to update(), also in another process.
+        """
         # TODO: use counter? https://pymotw.com/2/collections/counter.html
         if self.linkcheck:
             self.lc.add(doc)
             self.summary['broken_links'] = self.lc.broken
-        jsondoc = self.writer.json(doc)
-        self.summary['total'] += 1
+        result = dict(valid=False, fields=self.writer.json(doc), invalid=None)
         try:
-            self.schema.deserialize(jsondoc)
-            self.summary['valid'] += 1
-            valid = True
+            self.schema.deserialize(result['fields'])
+            result['valid'] = True
         except colander.Invalid as e:
             logging.warning(f"{e}")
-            valid = False
-            self._update_summary(e.asdict(), valid=False)
+            result['invalid'] = e.asdict()
         except Exception as e:
             logging.warning(f"{e}")
-            valid = False
-        self._update_summary(jsondoc)
-        return valid
+        return result
+
+    def update(self, result):
+        self.summary['total'] += 1
+        if result.get('skipped'):
+            # unchanged records are not mapped again, their fields of the last map are counted
+            self.summary['skipped'] += 1
+        if result['valid']:
+            self.summary['valid'] += 1
+        elif result['invalid']:
+            self._update_summary(result['invalid'], valid=False)
+        self._update_summary(result['fields'])
+        self._update_timings(result.get('timings') or {})
+        self._update_format_cache(result.get('format_cache') or {})
+        return result['valid']
+
+    @staticmethod
+    def summary_fields(fields, max_value_length=250):
+        """
+        The fields as they are counted in the summary.
+        Stored in the manifest to count the fields of records which are skipped in the next map.
+        """
+        return {key: str(value)[:max_value_length] for key, value in fields.items() if value}
 
     def concise_summary(self):
         return dict(
@@ -99,6 +128,16 @@ class Validator(object):
                     self.summary['invalid'][key] += 1
                 self._update_values(key, value, valid=valid)
 
+    def _update_timings(self, timings):
+        for key, seconds in timings.items():
+            self.extraction_time[key] = self.extraction_time.get(key, 0) + seconds
+
+    def _update_format_cache(self, stats):
+        for name, counts in stats.items():
+            _counts = self.format_cache.setdefault(name, dict(hits=0, misses=0))
+            _counts['hits'] += counts['hits']
+            _counts['misses'] += counts['misses']
+
     def _update_values(self, key, value, valid=True, max_value_length=250, max_values=25):
         if valid:
             values_key = 'values'
@@ -123,6 +162,8 @@ class Validator(object):
             fh.write("\nSummary:\n")
             fh.write(f"\tvalid={self.summary['valid']}/{self.summary['total']}\n")
             fh.write(f"\twritten={self.summary['written']}\n")
+            if self.summary['skipped']:
+                fh.write(f"\tskipped={self.summary['skipped']}\n")
             fh.write(f"\tbroken links={len(self.summary['broken_links'])}\n")
             fh.write(f"\tinvalid geometry={len(self.summary['_errors_']['invalid_geometry'])}\n")
             fh.write("\nRequired Fields:\n")
@@ -144,6 +185,15 @@ class Validator(object):
                 fh.write("\nMissing Fields:\n")
                 for key in self.summary['missing']:
                     fh.write(f"\t{key}\n")
+            if self.extraction_time:
+                fh.write("\nExtraction Time (slowest fields):\n")
+                timings = sorted(self.extraction_time.items(), key=lambda item: item[1], reverse=True)
+                for key, seconds in timings[:5]:
+                    fh.write(f"\t{key}={seconds:.3f}s\n")
+            if self.format_cache:
+                fh.write("\nFormat Cache:\n")
+                for name, counts in self.format_cache.items():
+                    fh.write(f"\t{name}: hits={counts['hits']} misses={counts['misses']}\n")
         if show is True:
             with out.open(mode='r') as fh:
                 for line in fh:
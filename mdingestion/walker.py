@@ -3,6 +3,8 @@ import pathlib
 import datetime
 from dateutil import parser as date_parser
 
+from .store import STORE_DIR, get_store
+
 import logging
 
 
@@ -37,9 +39,19 @@ class Walker(object):
         if path:
             root_path = root_path.joinpath(path)
 
+        # records of a record store are yielded as files of the folder of the store
+        stored = set()
+        for store_path in root_path.rglob(STORE_DIR):
+            store = get_store(store_path.parent)
+            for entry in store.entries(ext=ext, fromdate=date):
+                stored.add(entry['uid'])
+                yield store_path.parent.joinpath(f"{entry['uid']}.{entry['ext']}").absolute().as_posix()
+
         for found_path in root_path.rglob(ext_filter):
             # TODO: ignore validation result
             if 'summary' in found_path.name:
                 continue
+            if found_path.stem in stored:
+                continue
             if filter_after_date(found_path, date):
                 yield found_path.absolute().as_posix()
@@ -1,31 +1,15 @@
-import os
-import pathlib
-import json
-
 from .base import Writer, clean_fields
 
-import logging
-
 
 class B2FWriter(Writer):
     format = 'b2f'
 
-    def write(self, doc, filename):
-        data = clean_fields(self.json(doc))
+    def write(self, doc, filename, fields=None):
+        if fields is None:
+            fields = self.json(doc)
+        data = clean_fields(fields)
         self.write_output(data, filename)
-
-    def write_output(self, data, filename):
-        source_path = pathlib.Path(filename)
-        path_parts = list(source_path.parts)
-        path_parts[-2] = self.format
-        path_parts[-1] = source_path.name.replace(source_path.suffix, '.json')
-        out = pathlib.Path(*path_parts)
-        out.parent.mkdir(parents=True, exist_ok=True)
-        # TODO: fix outdir
-        self.outdir = out.parent.absolute()
-        with out.open(mode='w') as outfile:
-            json.dump(data, outfile, indent=4, sort_keys=True, ensure_ascii=False)
-            logging.info(f'map output written to {out}')
+        return data
 
     def json(self, doc):
         data = {
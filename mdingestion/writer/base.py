@@ -1,3 +1,9 @@
+import json
+import pathlib
+
+import logging
+
+
 def clean_fields(data):
     new_data = dict()
     for key, value in data.items():
@@ -10,8 +16,31 @@ class Writer(object):
     # TODO: fix usage of outdir
     outdir = None
 
-    def write(self, doc, filename):
+    def write(self, doc, filename, fields=None):
+        """
+        Writes the doc mapped from the raw record filename and returns the written data.
+        The B2F fields of the doc (B2FWriter.json) are passed as fields if they are already built.
+        """
         raise NotImplementedError
 
+    def write_output(self, data, filename):
+        out = self.output(filename)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        # TODO: fix outdir
+        self.outdir = out.parent.absolute()
+        # serialized in one piece, json.dump() writes many small chunks
+        text = json.dumps(data, indent=4, sort_keys=True, ensure_ascii=False)
+        with out.open(mode='w') as outfile:
+            outfile.write(text)
+            logging.info(f'map output written to {out}')
+
+    def output(self, filename):
+        """Returns the output path for the raw record filename."""
+        source_path = pathlib.Path(filename)
+        path_parts = list(source_path.parts)
+        path_parts[-2] = self.format
+        path_parts[-1] = source_path.name.replace(source_path.suffix, '.json')
+        return pathlib.Path(*path_parts)
+
     def json(self, doc):
         raise NotImplementedError
@@ -1,11 +1,8 @@
-import os
-import pathlib
 import json
 import hashlib
 
-from .base import Writer, clean_fields
-
-import logging
+from .base import Writer
+from .b2f import B2FWriter
 
 
 def map_ckan_fields(fields):
@@ -35,27 +32,21 @@ def map_extra_fields(fields):
 class CKANWriter(Writer):
     format = 'ckan'
 
-    def write(self, doc, filename):
-        data = self.json(doc)
+    def write(self, doc, filename, fields=None):
+        data = self.json(doc, fields=fields)
         self.update_version(data)
         self.write_output(data, filename)
+        return data
 
-    def write_output(self, data, filename):
-        source_path = pathlib.Path(filename)
-        path_parts = list(source_path.parts)
-        path_parts[-2] = self.format
-        path_parts[-1] = source_path.name.replace(source_path.suffix, '.json')
-        out = pathlib.Path(*path_parts)
-        out.parent.mkdir(parents=True, exist_ok=True)
-        # TODO: fix outdir
-        self.outdir = out.parent.absolute()
-        with out.open(mode='w') as outfile:
-            json.dump(data, outfile, indent=4, sort_keys=True, ensure_ascii=False)
-            logging.info(f'map output written to {out}')
-
-    def json(self, doc):
-        data = map_ckan_fields(self._ckan_fields(doc))
-        data['extras'] = map_extra_fields(self._extra_fields(doc))
+    def json(self, doc, fields=None):
+        """
+        The CKAN fields are mapped from the B2F fields of the doc (B2FWriter.json).
+        Only the name, the fulltext and the simple geometries are read from the doc itself.
+        """
+        if fields is None:
+            fields = B2FWriter().json(doc)
+        data = map_ckan_fields(self._ckan_fields(doc, fields))
+        data['extras'] = map_extra_fields(self._extra_fields(doc, fields))
         return data
 
     def update_version(self, data):
@@ -63,62 +54,64 @@ class CKANWriter(Writer):
             json.dumps(data, sort_keys=True).encode()).hexdigest()
         data['version'] = checksum
 
-    def _extra_fields(self, doc):
+    def _extra_fields(self, doc, fields):
         data = {
-            # 'Creator': doc.creator,
-            'DOI': doc.doi,
-            'PID': doc.pid,
-            'RelatedIdentifier': doc.related_identifier,
-            'MetaDataAccess': doc.metadata_access,
-            'Contributor': doc.contributor,
-            'Instrument': doc.instrument,
-            'Publisher': doc.publisher,
-            'PublicationYear': doc.publication_year,
-            'FundingReference': doc.funding_reference,
-            'Rights': doc.rights,
-            'OpenAccess': 'true' if doc.open_access else 'false',
-            'Contact': doc.contact,
-            'Language': doc.language,
-            'ResourceType': doc.resource_type,
-            'Format': doc.format,
-            'Size': doc.size,
-            'Version': doc.version,
-            'Discipline': doc.discipline,
-            'SpatialCoverage': doc.spatial_coverage,
-            'spatial': doc.wkt,
+            # 'Creator': fields['creator'],
+            'DOI': fields['doi'],
+            'PID': fields['pid'],
+            'RelatedIdentifier': fields['related_identifier'],
+            'MetaDataAccess': fields['metadata_access'],
+            'Contributor': fields['contributor'],
+            'Instrument': fields['instrument'],
+            'Publisher': fields['publisher'],
+            'PublicationYear': fields['publication_year'],
+            'FundingReference': fields['funding_reference'],
+            'Rights': fields['rights'],
+            'OpenAccess': 'true' if fields['open_access'] else 'false',
+            'Contact': fields['contact'],
+            'Language': fields['language'],
+            'ResourceType': fields['resource_type'],
+            'Format': fields['format'],
+            'Size': fields['size'],
+            'Version': fields['version'],
+            'Discipline': fields['discipline'],
+            'SpatialCoverage': fields['spatial_coverage'],
+            'spatial': fields['spatial'],
             'geom': doc.wkt_simple,
             'bbox': doc.envelope,
-            'TemporalCoverage': doc.temporal_coverage,
-            'TemporalCoverage:BeginDate': doc.temporal_coverage_begin_date,
-            'TemporalCoverage:EndDate': doc.temporal_coverage_end_date,
+            'TemporalCoverage': fields['temporal_coverage'],
+            'TemporalCoverage:BeginDate': fields['temporal_coverage_begin_date'],
+            'TemporalCoverage:EndDate': fields['temporal_coverage_end_date'],
             "fulltext": doc.fulltext,
         }
         # build date range field for temporal coverage
         # https://solr.apache.org/guide/6_6/working-with-dates.html
-        if doc.temporal_coverage_begin_date or doc.temporal_coverage_end_date:
+        begin_date = fields['temporal_coverage_begin_date']
+        end_date = fields['temporal_coverage_end_date']
+        if begin_date or end_date:
             begin = end = '*'
-            if doc.temporal_coverage_begin_date:
+            if begin_date:
                 # keep the day 2021-08-06 ... not hours, secs
-                begin = doc.temporal_coverage_begin_date.split('T')[0]
+                begin = begin_date.split('T')[0]
             else:
                 begin = '*'
-            if doc.temporal_coverage_end_date:
-                end = doc.temporal_coverage_end_date.split('T')[0]
+            if end_date:
+                end = end_date.split('T')[0]
             else:
                 end = '*'
             data['TempCoverage'] = f"[{begin} TO {end}]"
         return data
 
-    def _ckan_fields(self, doc):
+    def _ckan_fields(self, doc, fields):
         data = {}
-        data['title'] = doc.title
-        data['author'] = doc.creator
-        data['notes'] = doc.description
-        data['tags'] = [dict(name=tag) for tag in doc.keywords]
-        data['url'] = doc.source
-        data['owner_org'] = doc.community
+        data['title'] = fields['title']
+        data['author'] = fields['creator']
+        data['notes'] = fields['description']
+        data['tags'] = [dict(name=tag) for tag in fields['keywords']]
+        data['url'] = fields['source']
+        data['owner_org'] = fields['community']
         data['name'] = doc.name
-        data['groups'] = [dict(name=group) for group in doc.groups]
+        data['groups'] = [dict(name=group) for group in fields['groups']]
         data['state'] = 'active'
         # data['fulltext'] = doc.fulltext
         return data
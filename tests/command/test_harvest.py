@@ -0,0 +1,88 @@
+import time
+import threading
+
+import pytest
+from click.testing import CliRunner
+
+from mdingestion.cli import cli
+from mdingestion.command import harvest as harvest_module
+from mdingestion.command.harvest import Scheduler, Harvest
+from mdingestion.exceptions import HarvesterError
+
+
+def test_scheduler():
+    lock = threading.Lock()
+    running = {}
+    max_running = {}
+    urls = {
+        'a1': 'http://a.org/oai',
+        'a2': 'http://a.org/oai',
+        'a3': 'http://a.org/csw',
+        'b1': 'http://b.org/oai',
+        'c1': 'http://c.org/oai',
+        'c2': 'http://c.org/oai',
+    }
+
+    def func(identifier):
+        url = urls[identifier]
+        with lock:
+            running[url] = running.get(url, 0) + 1
+            max_running[url] = max(max_running.get(url, 0), running[url])
+        time.sleep(0.05)
+        with lock:
+            running[url] -= 1
+        if identifier == 'b1':
+            raise Exception('connection failed')
+        return len(identifier)
+
+    scheduler = Scheduler(workers=3, per_host=2)
+    report = scheduler.run(list(urls.items()), func, silent=True)
+    assert sorted(report.keys()) == sorted(urls.keys())
+    assert report['a1'] == dict(status='ok', records=2, error=None)
+    assert report['b1']['status'] == 'failed'
+    assert report['b1']['error'] == 'connection failed'
+    # same URL is never harvested concurrently
+    assert max(max_running.values()) == 1
+
+
+def test_scheduler_is_ready():
+    scheduler = Scheduler(workers=4, per_host=2)
+    assert scheduler.is_ready('http://a.org/oai', []) is True
+    assert scheduler.is_ready('http://a.org/oai', ['http://a.org/oai']) is False
+    assert scheduler.is_ready('http://a.org/csw', ['http://a.org/oai']) is True
+    assert scheduler.is_ready('http://a.org/csw', ['http://a.org/oai', 'http://a.org/rest']) is False
+    assert scheduler.is_ready('http://b.org/oai', ['http://a.org/oai', 'http://a.org/rest']) is True
+
+
+def test_scheduler_invalid():
+    with pytest.raises(ValueError):
+        Scheduler(workers=1, per_host=0)
+    with pytest.raises(ValueError):
+        Scheduler(workers=0, per_host=1)
+
+
+def test_harvest_serial_continues(monkeypatch, tmpdir):
+    monkeypatch.setattr(harvest_module, 'communities', lambda name: ['darus', 'pangaea', 'envidat'])
+    harvested = []
+
+    def _harvest(self, identifier, **kwargs):
+        harvested.append(identifier)
+        if identifier == 'darus':
+            raise Exception('connection failed')
+        return 1
+
+    monkeypatch.setattr(Harvest, '_harvest', _harvest)
+    cmd = Harvest(community='test', outdir=tmpdir.strpath)
+    with pytest.raises(HarvesterError) as excinfo:
+        cmd.harvest(silent=True)
+    # the default serial harvest reports the failed community and harvests the others
+    assert sorted(harvested) == ['darus', 'envidat', 'pangaea']
+    assert 'darus' in str(excinfo.value)
+    assert 'pangaea' not in str(excinfo.value)
+
+
+@pytest.mark.parametrize('option', ['--workers', '--per-host'])
+def test_harvest_options_min(option):
+    result = CliRunner().invoke(cli, ['harvest', '-c', 'darus', option, '0'])
+    assert result.exit_code == 2
+    assert 'Invalid value' in result.output
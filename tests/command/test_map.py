@@ -0,0 +1,94 @@
+import os
+import json
+import functools
+import shutil
+import pathlib
+
+from mdingestion.command import Map
+from mdingestion.command import map as map_command
+from mdingestion.community import community
+from mdingestion.validator import Validator
+
+from tests.common import TESTDATA_DIR
+
+
+def read_summary(outdir, identifier):
+    path = next(pathlib.Path(outdir, 'summary', identifier).glob('*_summary.json'))
+    with path.open() as fp:
+        return json.load(fp)
+
+
+def test_map_workers(tmp_path, monkeypatch):
+    shutil.copytree(os.path.join(TESTDATA_DIR, 'pangaea'), tmp_path / 'oaidata' / 'pangaea')
+    outdir = tmp_path.as_posix()
+    Map(community='pangaea', outdir=outdir).run(format='ckan', linkcheck=False, silent=True)
+    serial = read_summary(outdir, 'pangaea')
+    # use several chunks per worker
+    monkeypatch.setattr(map_command, 'CHUNK_SIZE', 2)
+    Map(community='pangaea', outdir=outdir).run(format='ckan', linkcheck=False, silent=True, workers=2)
+    parallel = read_summary(outdir, 'pangaea')
+    assert serial['total'] == 6
+    assert parallel == serial
+    assert len(list(pathlib.Path(tmp_path, 'oaidata', 'pangaea', 'ckan').glob('*.json'))) == serial['written']
+    # the extraction times and format cache counts are only in the short summary
+    short = next(pathlib.Path(outdir, 'summary', 'pangaea').glob('*_summary_short.txt')).read_text()
+    assert 'Extraction Time' in short
+    assert 'Format Cache' in short
+
+
+def test_map_incremental(tmp_path):
+    shutil.copytree(os.path.join(TESTDATA_DIR, 'pangaea'), tmp_path / 'oaidata' / 'pangaea')
+    outdir = tmp_path.as_posix()
+    Map(community='pangaea', outdir=outdir).run(format='ckan', linkcheck=False, silent=True, incremental=True)
+    first = read_summary(outdir, 'pangaea')
+    assert first['skipped'] == 0
+    # change one raw record
+    raw = sorted(pathlib.Path(tmp_path, 'oaidata', 'pangaea', 'raw').glob('*.xml'))[0]
+    raw.write_text(raw.read_text().replace('</record>', '</record>\n'))
+    Map(community='pangaea', outdir=outdir).run(format='ckan', linkcheck=False, silent=True, incremental=True)
+    second = read_summary(outdir, 'pangaea')
+    assert second['total'] == first['total']
+    assert second['valid'] == first['valid']
+    # only the changed record is written again
+    assert second['written'] == 1
+    assert second['skipped'] == first['written'] - 1
+    # the fields of the skipped records are counted as in the last map
+    for key in ('required', 'optional', 'values', 'invalid', 'invalid_values', 'missing'):
+        assert second[key] == first[key]
+
+
+def test_map_parallel_order(tmp_path, monkeypatch):
+    shutil.copytree(os.path.join(TESTDATA_DIR, 'pangaea'), tmp_path / 'oaidata' / 'pangaea')
+    monkeypatch.setattr(map_command, 'CHUNK_SIZE', 4)
+    cmd = Map(community='pangaea', outdir=tmp_path.as_posix())
+    cmd._community = community('pangaea')
+    filenames = list(cmd.walk())
+    # every other record is skipped with the result of the last map
+    records = [(filename, dict(skipped=True) if i % 2 else None) for i, filename in enumerate(filenames)]
+    results = list(cmd.map_parallel(iter(records), 'ckan', linkcheck=False, workers=2))
+    assert [filename for filename, _ in results] == filenames
+    assert [bool(result.get('skipped')) for _, result in results] == [bool(i % 2) for i in range(len(filenames))]
+
+
+def map_incremental_changes(outdir, workers=1):
+    Map(community='pangaea', outdir=outdir).run(format='ckan', linkcheck=False, silent=True, incremental=True)
+    # change two of the raw records
+    for raw in sorted(pathlib.Path(outdir, 'oaidata', 'pangaea', 'raw').glob('*.xml'))[1::3]:
+        raw.write_text(raw.read_text().replace('</record>', '</record>\n'))
+    Map(community='pangaea', outdir=outdir).run(format='ckan', linkcheck=False, silent=True, incremental=True,
+                                                workers=workers)
+    return read_summary(outdir, 'pangaea')
+
+
+def test_map_workers_incremental(tmp_path, monkeypatch):
+    # keep only the first value of each field, so that the values depend on the order of the records
+    monkeypatch.setattr(Validator, '_update_values',
+                        functools.partialmethod(Validator._update_values, max_values=1))
+    monkeypatch.setattr(map_command, 'CHUNK_SIZE', 2)
+    shutil.copytree(os.path.join(TESTDATA_DIR, 'pangaea'), tmp_path / 'serial' / 'oaidata' / 'pangaea')
+    shutil.copytree(os.path.join(TESTDATA_DIR, 'pangaea'), tmp_path / 'parallel' / 'oaidata' / 'pangaea')
+    serial = map_incremental_changes((tmp_path / 'serial').as_posix())
+    parallel = map_incremental_changes((tmp_path / 'parallel').as_posix(), workers=2)
+    assert serial['written'] == 2
+    assert serial['skipped'] == 4
+    assert parallel == serial
@@ -0,0 +1,62 @@
+import re
+import threading
+import functools
+import pytest
+from ckanapi import NotFound
+from click.testing import CliRunner
+
+from mdingestion.cli import cli
+from mdingestion.command import Purge
+from mdingestion.command import purge as purge_command
+
+
+class FakeCKAN(object):
+    def __init__(self, names, fail_after=None):
+        self.names = set(names)
+        self.purged = []
+        self.fail_after = fail_after
+        self.lock = threading.Lock()
+
+    def call_action(self, action, data_dict=None, requests_kwargs=None):
+        if action == 'package_search':
+            match = re.search(r'name:\{"(.*)" TO \*\]', data_dict['fq'])
+            names = sorted(name for name in self.names if not match or name > match.group(1))
+            return dict(count=len(names), results=[dict(name=name) for name in names[:data_dict['rows']]])
+        if action == 'dataset_purge':
+            with self.lock:
+                if self.fail_after is not None and len(self.purged) >= self.fail_after:
+                    raise ConnectionError('interrupted')
+                if data_dict['id'] not in self.names:
+                    raise NotFound()
+                self.names.remove(data_dict['id'])
+                self.purged.append(data_dict['id'])
+
+    def close(self):
+        pass
+
+
+def test_purge_group_resume(tmp_path, monkeypatch):
+    names = [f'dataset-{i:03d}' for i in range(25)]
+    ckan = FakeCKAN(names, fail_after=12)
+    monkeypatch.setattr(purge_command, 'connect', lambda **kwargs: ckan)
+    monkeypatch.setattr(purge_command, 'dataset_pages', functools.partial(purge_command.dataset_pages, rows=5))
+    with pytest.raises(ConnectionError):
+        Purge(community='test', outdir=tmp_path.as_posix()).run(iphost='localhost', auth='key', silent=True,
+                                                                workers=3)
+    assert len(ckan.purged) == 12
+    log = purge_command.PurgeLog(tmp_path / 'state' / 'purge_test.jsonl')
+    assert log.last == 'dataset-009'
+    # continue where it stopped
+    ckan.fail_after = None
+    ckan.purged = []
+    Purge(community='test', outdir=tmp_path.as_posix()).run(iphost='localhost', auth='key', silent=True, workers=3)
+    assert ckan.names == set()
+    assert len(ckan.purged) == 13
+    assert ckan.purged[0] >= 'dataset-010'
+    assert not (tmp_path / 'state' / 'purge_test.jsonl').exists()
+
+
+def test_purge_workers_min():
+    result = CliRunner().invoke(cli, ['purge', '-c', 'darus', '-i', 'localhost', '--auth', 'key', '--workers', '0'])
+    assert result.exit_code == 2
+    assert 'Invalid value' in result.output
@@ -0,0 +1,147 @@
+import os
+import json
+import shutil
+import pathlib
+import pytest
+from requests.exceptions import ConnectionError
+from ckanapi import NotFound, ValidationError
+from click.testing import CliRunner
+
+from mdingestion.cli import cli
+from mdingestion.command import Map, Upload
+from mdingestion.command import upload as upload_command
+
+from tests.common import TESTDATA_DIR
+
+
+def test_upload_incremental(tmp_path, monkeypatch):
+    shutil.copytree(os.path.join(TESTDATA_DIR, 'pangaea'), tmp_path / 'oaidata' / 'pangaea')
+    outdir = tmp_path.as_posix()
+    Map(community='pangaea', outdir=outdir).run(format='ckan', linkcheck=False, silent=True)
+    uploaded = []
+    monkeypatch.setattr(upload_command, 'upload', lambda ckan, data, **kwargs: uploaded.append(data['name']) or 1)
+    Upload(community='pangaea', outdir=outdir).run(iphost='localhost', auth='key', silent=True, incremental=True)
+    written = len(list(pathlib.Path(tmp_path, 'oaidata', 'pangaea', 'ckan').glob('*.json')))
+    assert len(uploaded) == written
+    # nothing changed
+    uploaded.clear()
+    Upload(community='pangaea', outdir=outdir).run(iphost='localhost', auth='key', silent=True, incremental=True)
+    assert uploaded == []
+    # upload all records without incremental
+    Upload(community='pangaea', outdir=outdir).run(iphost='localhost', auth='key', silent=True)
+    assert len(uploaded) == written
+
+
+def test_upload_workers(tmp_path, monkeypatch):
+    shutil.copytree(os.path.join(TESTDATA_DIR, 'pangaea'), tmp_path / 'oaidata' / 'pangaea')
+    outdir = tmp_path.as_posix()
+    Map(community='pangaea', outdir=outdir).run(format='ckan', linkcheck=False, silent=True)
+    files = sorted(pathlib.Path(tmp_path, 'oaidata', 'pangaea', 'ckan').glob('*.json'))
+    failing = json.loads(files[0].read_text())['name']
+    uploaded = []
+
+    def _upload(ckan, data, **kwargs):
+        if data['name'] == failing:
+            raise ValueError('invalid')
+        uploaded.append(data['name'])
+        return 1
+
+    monkeypatch.setattr(upload_command, 'upload', _upload)
+    with pytest.raises(Exception, match='upload of 1 files failed'):
+        Upload(community='pangaea', outdir=outdir).run(iphost='localhost', auth='key', silent=True,
+                                                       incremental=True, workers=4)
+    assert len(uploaded) == len(files) - 1
+    # the failed record is uploaded again
+    monkeypatch.setattr(upload_command, 'upload', lambda ckan, data, **kwargs: uploaded.append(data['name']) or 1)
+    Upload(community='pangaea', outdir=outdir).run(iphost='localhost', auth='key', silent=True,
+                                                   incremental=True, workers=4)
+    assert uploaded[-1] == failing
+
+
+def test_upload_workers_connection_error(tmp_path, monkeypatch):
+    shutil.copytree(os.path.join(TESTDATA_DIR, 'pangaea'), tmp_path / 'oaidata' / 'pangaea')
+    outdir = tmp_path.as_posix()
+    Map(community='pangaea', outdir=outdir).run(format='ckan', linkcheck=False, silent=True)
+
+    def _upload(ckan, data, **kwargs):
+        raise ConnectionError('refused')
+
+    monkeypatch.setattr(upload_command, 'upload', _upload)
+    with pytest.raises(ConnectionError):
+        Upload(community='pangaea', outdir=outdir).run(iphost='localhost', auth='key', silent=True, workers=2)
+
+
+class FakeCKAN(object):
+    def __init__(self, datasets, rows=2):
+        self.datasets = dict(datasets)
+        self.rows = rows
+        self.actions = []
+        self.data_dicts = []
+
+    def call_action(self, action, data_dict=None, requests_kwargs=None):
+        self.actions.append((action, data_dict.get('name')))
+        self.data_dicts.append(data_dict)
+        if action == 'package_search':
+            names = sorted(self.datasets)[data_dict['start']:data_dict['start'] + self.rows]
+            return dict(count=len(self.datasets),
+                        results=[dict(name=name, version=self.datasets[name]) for name in names])
+        if action == 'package_update' and data_dict['name'] not in self.datasets:
+            raise NotFound()
+        if action == 'package_create' and data_dict['name'] in self.datasets:
+            raise ValidationError({'name': ['That URL is already in use.'], '__type': 'Validation Error'})
+        self.datasets[data_dict['name']] = data_dict.get('version')
+
+    def close(self):
+        pass
+
+
+def test_upload_prefetch(tmp_path, monkeypatch):
+    shutil.copytree(os.path.join(TESTDATA_DIR, 'pangaea'), tmp_path / 'oaidata' / 'pangaea')
+    outdir = tmp_path.as_posix()
+    Map(community='pangaea', outdir=outdir).run(format='ckan', linkcheck=False, silent=True)
+    records = [json.loads(path.read_text())
+               for path in sorted(pathlib.Path(tmp_path, 'oaidata', 'pangaea', 'ckan').glob('*.json'))]
+    datasets = {records[0]['name']: records[0]['version'], records[1]['name']: 'old', 'other': None}
+    ckan = FakeCKAN(datasets)
+    monkeypatch.setattr(upload_command, 'connect', lambda **kwargs: ckan)
+    Upload(community='pangaea', outdir=outdir).run(iphost='localhost', auth='key', silent=True, prefetch=True)
+    actions = [action for action, _ in ckan.actions]
+    # 3 datasets in pages of 2
+    assert actions.count('package_search') == 2
+    assert all(data_dict['include_private'] for data_dict in ckan.data_dicts if 'start' in data_dict)
+    assert ('package_update', records[1]['name']) in ckan.actions
+    assert actions.count('package_update') == 1
+    assert actions.count('package_create') == len(records) - 2
+    assert ckan.datasets[records[1]['name']] == records[1]['version']
+
+
+def test_upload_create_conflict():
+    ckan = FakeCKAN({'dataset': 'old'})
+    # the dataset was created since the existing datasets were fetched
+    assert upload_command.upload(ckan, dict(name='dataset', version='new'), exists=False) == 2
+    assert ckan.actions == [('package_create', 'dataset'), ('package_update', 'dataset')]
+    assert ckan.datasets['dataset'] == 'new'
+
+
+def test_upload_create_invalid():
+    class InvalidCKAN(FakeCKAN):
+        def call_action(self, action, data_dict=None, requests_kwargs=None):
+            self.actions.append((action, data_dict.get('name')))
+            raise ValidationError({'title': ['Missing value'], '__type': 'Validation Error'})
+
+    ckan = InvalidCKAN({})
+    with pytest.raises(ValidationError):
+        upload_command.upload(ckan, dict(name='dataset'), exists=False)
+    # a real validation error is not retried as update and create
+    assert ckan.actions == [('package_create', 'dataset')]
+
+
+@pytest.mark.parametrize('command,option', [
+    ('upload', '--workers'),
+    ('upload', '--pool-size'),
+    ('combine', '--upload-workers'),
+])
+def test_upload_options_min(command, option):
+    result = CliRunner().invoke(cli, [command, '-c', 'darus', '-i', 'localhost', '--auth', 'key', option, '0'])
+    assert result.exit_code == 2
+    assert 'Invalid value' in result.output
@@ -1,4 +1,8 @@
+import pytest
+import shapely
+
 from mdingestion.core import B2FDoc
+from mdingestion.core import doc as doc_module
 
 
 def test_doc_temporal_coverage():
@@ -26,3 +30,48 @@ def test_doc_temporal_coverage():
     # string
     doc.temporal_coverage = 'Viking Age'
     assert 'Viking Age' == doc.temporal_coverage
+
+
+def test_doc_lazy_format(monkeypatch):
+    calls = []
+    format_value = doc_module.format_value
+
+    def _format_value(value, **kwargs):
+        calls.append(value)
+        return format_value(value, **kwargs)
+
+    monkeypatch.setattr(doc_module, 'format_value', _format_value)
+    doc = B2FDoc('test.json')
+    titles = [' First ']
+    doc.title = titles
+    doc.discipline = ['Other']
+    doc.discipline = ['Archaeology']
+    titles.append('Second')
+    assert calls == []
+    assert doc.title == ['First']
+    assert doc.discipline == ['Archaeology']
+    assert doc.title == ['First']
+    assert calls == [[' First '], ['Archaeology']]
+
+
+def test_doc_slots():
+    doc = B2FDoc('test.json')
+    doc.keywords = ['ice, snow', 'a']
+    assert doc.keywords == ['ice', 'snow']
+    with pytest.raises(AttributeError):
+        doc.unknown_field = 'value'
+
+
+def test_doc_geometry_cache():
+    doc = B2FDoc('test.json')
+    assert doc.wkt is None
+    assert doc.envelope is None
+    doc.geometry = shapely.geometry.box(8.123456, 50.987654, 9.5, 51.25)
+    assert doc.wkt is doc.wkt
+    assert doc.envelope == 'ENVELOPE(8.123456, 9.5, 51.25, 50.987654)'
+    doc.wkt_precision = 2
+    assert doc.wkt == 'POLYGON ((9.5 50.99, 9.5 51.25, 8.12 51.25, 8.12 50.99, 9.5 50.99))'
+    assert doc.wkt_simple == 'POINT (8.81 51.12)'
+    assert doc.envelope == 'ENVELOPE(8.12, 9.5, 51.25, 50.99)'
+    doc.geometry = shapely.geometry.Point(1.2345, 2.3456)
+    assert doc.wkt == 'POINT (1.23 2.35)'
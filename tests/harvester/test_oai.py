@@ -0,0 +1,163 @@
+from mdingestion.harvester.oai import OAIHarvester, is_expired
+from mdingestion.harvester.state import HarvestState
+
+URL = 'https://example.org/oai'
+
+RECORD = """
+<record><header><identifier>oai:example.org:{id}</identifier><datestamp>2022-01-0{id}</datestamp></header>
+<metadata><dc><title>Record {id}</title></dc></metadata></record>
+"""
+
+PAGE = """<?xml version="1.0" encoding="UTF-8"?>
+<OAI-PMH xmlns="http://www.openarchives.org/OAI/2.0/">
+<responseDate>{response_date}</responseDate>
+<request verb="ListRecords">{url}</request>
+<ListRecords>{records}<resumptionToken cursor="{cursor}" completeListSize="5">{token}</resumptionToken></ListRecords>
+</OAI-PMH>
+"""
+
+BAD_TOKEN = """<?xml version="1.0" encoding="UTF-8"?>
+<OAI-PMH xmlns="http://www.openarchives.org/OAI/2.0/">
+<responseDate>2022-05-03T12:00:00Z</responseDate>
+<request verb="ListRecords">{url}</request>
+<error code="badResumptionToken">expired</error>
+</OAI-PMH>
+"""
+
+# resumption token -> (record ids, next token)
+PAGES = {
+    None: ([1, 2], 't1'),
+    't1': ([3, 4], 't2'),
+    't2': ([5], ''),
+}
+
+
+class FakeHTTPResponse(object):
+    status_code = 200
+
+    def __init__(self, text):
+        self.text = text
+        self.content = text.encode('utf8')
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeOAI(object):
+    def __init__(self, expired=False):
+        self.requests = []
+        self.expired = expired
+
+    def request(self, kwargs):
+        self.requests.append(kwargs)
+        token = kwargs.get('resumptionToken')
+        if token and self.expired:
+            self.expired = False
+            return FakeHTTPResponse(BAD_TOKEN.format(url=URL))
+        ids, next_token = PAGES[token]
+        text = PAGE.format(
+            response_date='2022-05-03T10:00:00Z' if token is None else '2022-05-03T11:00:00Z',
+            url=URL,
+            records=''.join([RECORD.format(id=id) for id in ids]),
+            cursor=min(ids) - 1,
+            token=next_token)
+        return FakeHTTPResponse(text)
+
+
+def build_harvester(tmp_path, fake, resume=False):
+    harvester = OAIHarvester('test', URL, 'oai_dc', None, '2022-01-01', False, None, tmp_path.as_posix(), True,
+                             None, None, state=HarvestState(tmp_path / 'state.json'), resume=resume)
+    harvester.sickle._request = fake.request
+    harvester.check_metadata_format = lambda: None
+    return harvester
+
+
+def test_checkpoint_and_resume(tmp_path):
+    fake = FakeOAI()
+    harvester = build_harvester(tmp_path, fake)
+    records = harvester.get_records()
+    # interrupt at the first record of the second page
+    identifiers = [harvester.identifier(next(records)) for _ in range(3)]
+    assert identifiers[-1] == 'oai:example.org:3'
+    resumption = HarvestState(tmp_path / 'state.json').data['resumption']
+    assert resumption['token'] == 't1'
+    assert resumption['cursor'] == '0'
+    assert resumption['records'] == 2
+    assert resumption['fromdate'] == '2022-01-01'
+    # resume with the second page
+    fake = FakeOAI()
+    harvester = build_harvester(tmp_path, fake, resume=True)
+    identifiers = [harvester.identifier(record) for record in harvester.get_records()]
+    assert identifiers == ['oai:example.org:3', 'oai:example.org:4', 'oai:example.org:5']
+    assert fake.requests[0]['resumptionToken'] == 't1'
+    assert harvester.count == 5
+    # watermark is the response date of the interrupted harvest
+    assert harvester.watermark == '2022-05-03T10:00:00Z'
+    assert HarvestState(tmp_path / 'state.json').data['resumption'] is None
+
+
+def test_resume_expired_token(tmp_path):
+    harvester = build_harvester(tmp_path, FakeOAI())
+    records = harvester.get_records()
+    [next(records) for _ in range(3)]
+    fake = FakeOAI(expired=True)
+    harvester = build_harvester(tmp_path, fake, resume=True)
+    identifiers = [harvester.identifier(record) for record in harvester.get_records()]
+    assert len(identifiers) == 5
+    assert fake.requests[0]['resumptionToken'] == 't1'
+    assert fake.requests[1]['from'] == '2022-01-01'
+
+
+def test_prefetch_next_page(tmp_path):
+    fake = FakeOAI()
+    harvester = build_harvester(tmp_path, fake)
+    records = harvester.get_records()
+    next(records)
+    # the second page is requested while the first one is processed
+    params, future = harvester.sickle._prefetched
+    assert params == {'resumptionToken': 't1', 'verb': 'ListRecords'}
+    future.result()
+    assert [request.get('resumptionToken') for request in fake.requests] == [None, 't1']
+    assert len(list(records)) == 4
+    # each page is requested only once
+    assert [request.get('resumptionToken') for request in fake.requests] == [None, 't1', 't2']
+    # the prefetch thread is shut down when the records are done
+    assert harvester.sickle._executor is None
+
+
+def test_prefetch_close_at_limit(tmp_path):
+    fake = FakeOAI()
+    harvester = build_harvester(tmp_path, fake)
+    harvester.limit = 1
+    assert len(list(harvester.harvest())) == 1
+    # the prefetch of the second page is dropped with the stopped harvest
+    assert harvester.sickle._prefetched is None
+    assert harvester.sickle._executor is None
+
+
+def test_write_behind(tmp_path):
+    harvester = build_harvester(tmp_path, FakeOAI())
+    with harvester.write_behind(maxsize=2):
+        for record in harvester.harvest():
+            harvester.write_record(record)
+    assert len(list((tmp_path / 'test' / 'raw').glob('*.xml'))) == 5
+    assert HarvestState(tmp_path / 'state.json').data['resumption'] is None
+
+
+def test_is_expired():
+    assert is_expired(None) is False
+    assert is_expired('2000-01-01T00:00:00Z') is True
+    assert is_expired('2999-01-01T00:00:00Z') is False
+
+
+def test_write_store(tmp_path):
+    harvester = build_harvester(tmp_path, FakeOAI())
+    harvester.use_store()
+    with harvester.write_behind():
+        for record in harvester.harvest():
+            harvester.write_record(record)
+    assert not list((tmp_path / 'test' / 'raw').glob('*.xml'))
+    assert len(harvester.record_store) == 5
+    entry = harvester.record_store.index[harvester.uid(record)]
+    assert entry['datestamp'] == '2022-01-05'
+    assert b'Record 5' in harvester.record_store.get(entry['uid'])
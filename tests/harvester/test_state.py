@@ -0,0 +1,46 @@
+from mdingestion.harvester.base import Harvester
+from mdingestion.harvester.state import HarvestState
+
+
+def test_harvest_state(tmp_path):
+    filename = tmp_path / 'state' / 'darus.json'
+    state = HarvestState(filename)
+    assert state.watermark is None
+    assert state.fromdate is None
+    state.update(watermark='2022-05-03T10:12:00Z', records=10)
+    state = HarvestState(filename)
+    assert state.watermark == '2022-05-03T10:12:00Z'
+    assert state.fromdate == '2022-05-03'
+    assert state.data['records'] == 10
+
+
+def test_harvest_state_broken(tmp_path):
+    filename = tmp_path / 'darus.json'
+    filename.write_text('{"watermark": ')
+    assert HarvestState(filename).watermark is None
+
+
+def test_update_watermark():
+    harvester = Harvester('darus', 'https://darus.uni-stuttgart.de/oai', None, False, None, '.')
+    assert harvester.watermark is None
+    harvester.update_watermark(None)
+    assert harvester.watermark is None
+    harvester.update_watermark('2021-01-02')
+    assert harvester.watermark == '2021-01-02T00:00:00Z'
+    harvester.update_watermark('2022-03-04T05:06:07Z')
+    harvester.update_watermark('2020-12-31')
+    assert harvester.watermark == '2022-03-04T05:06:07Z'
+
+
+def test_update_watermark_timezone():
+    harvester = Harvester('herbadrop', 'https://opendata.cines.fr', None, False, None, '.')
+    harvester.update_watermark('2019-06-18T20:17:33+0200')
+    assert harvester.watermark == '2019-06-18T18:17:33Z'
+    # later in UTC, although the local time is earlier
+    harvester.update_watermark('2019-06-18T19:00:00-05:00')
+    assert harvester.watermark == '2019-06-19T00:00:00Z'
+    # earlier in UTC, although the local time is later
+    harvester.update_watermark('2019-06-19T01:30:00+0200')
+    assert harvester.watermark == '2019-06-19T00:00:00Z'
+    harvester.update_watermark('not a date')
+    assert harvester.watermark == '2019-06-19T00:00:00Z'
@@ -0,0 +1,31 @@
+from mdingestion.parser.base import Fulltext
+
+
+def test_fulltext_dedupe():
+    fulltext = Fulltext().extend(['a', '', 'b', 'a', 'c', 'b'])
+    assert fulltext.getvalue() == 'a,b,c'
+
+
+def test_fulltext_max_size():
+    fulltext = Fulltext(max_size=5)
+    assert fulltext.add('abc') is True
+    assert fulltext.add('defg') is False
+    assert fulltext.full is True
+    assert fulltext.add('h') is False
+    assert fulltext.getvalue() == 'abc,d'
+
+
+def test_fulltext_stops_early():
+    consumed = []
+
+    def strings():
+        for i in range(100):
+            consumed.append(i)
+            yield str(i)
+
+    assert Fulltext(max_size=4).extend(strings()).getvalue() == '0,1,'
+    assert consumed == [0, 1, 2]
+
+
+def test_fulltext_unlimited():
+    assert Fulltext(max_size=None).extend(['x' * 10, 'y']).getvalue() == 'x' * 10 + ',y'
@@ -0,0 +1,62 @@
+import os
+import json
+
+import pytest
+from jsonpath_ng import parse
+
+from mdingestion.parser import JSONParser
+from mdingestion.parser.json import compile_steps, lookup
+
+from tests.common import TESTDATA_DIR
+
+JSON_FILE = os.path.join(TESTDATA_DIR, 'herbadrop', 'raw', '0d9e8478-3d92-5a5f-92cb-eb678e8e48dd.json')
+
+DOCS = [
+    {'a': [{'b': 1}, {'b': 2}]},
+    {'a': {'b': 1, 'c': 2}},
+    {'a': None},
+    {'a': 'xyz'},
+    {'a': [[1, 2], [3]]},
+    [{'a': 1}, {'a': 2}],
+]
+
+
+@pytest.mark.parametrize('path', [
+    'a', '$.a', 'a.b', 'a[*]', 'a[*].b', 'a[0]', 'a[-1]', 'a[5]', 'a[0].b', 'a[*][*]', '[*].a', 'a."b"',
+])
+def test_lookup(path):
+    expr = parse(path)
+    steps = compile_steps(expr)
+    assert steps is not None
+    for doc in DOCS:
+        assert lookup(steps, doc) == [match.value for match in expr.find(doc)]
+
+
+def test_compile_fallback():
+    assert compile_steps(parse('a..b')) is None
+    assert compile_steps(parse('a.*')) is None
+
+
+def test_find():
+    parser = JSONParser(JSON_FILE)
+    with open(JSON_FILE) as fp:
+        doc = json.load(fp)
+    assert parser.doc == doc
+    for path in ['metadata."aip.dc.title".lat', 'images[*].ocr.lat', 'metadata."aip.files"[*].sizeInBytes']:
+        # same values as jsonpath_ng
+        assert parser.find(path) == parser.select((parse(path), None))
+        assert parser.find(path)
+
+
+def test_parse_nan(tmp_path):
+    filename = tmp_path.joinpath('record.json')
+    filename.write_text('{"value": NaN, "big": 123456789012345678901234567890}')
+    doc = JSONParser(str(filename)).doc
+    assert doc['big'] == 123456789012345678901234567890
+
+
+def test_strings():
+    parser = JSONParser(None)
+    parser._doc = {'a': [{'b': 1}, {'b': None, 'c': 'x'}], 'd': ['plain', 'list'], 'e': {'f': True}}
+    assert list(parser.strings()) == ['1', 'x', 'True']
+    assert parser.fulltext == '1,x,True'
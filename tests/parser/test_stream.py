@@ -0,0 +1,101 @@
+import os
+import glob
+
+import pytest
+
+from mdingestion.parser import XMLParser, StreamParser
+from mdingestion.reader import build_reader
+from mdingestion.service_types import SchemaType
+from mdingestion.community import community
+from mdingestion.exceptions import MappingError
+
+from tests.common import TESTDATA_DIR
+
+DDI = """<?xml version="1.0" encoding="UTF-8"?>
+<!-- ddi record -->
+<codeBook xmlns="ddi:codebook:2_5" xmlns:xml="http://www.w3.org/XML/1998/namespace">
+  <stdyDscr>
+    <citation>
+      <titlStmt><titl>Survey &amp; Panel</titl><IDNo agency="datacite">10.1234/abc</IDNo></titlStmt>
+      <rspStmt><AuthEnty>Doe, Jane</AuthEnty></rspStmt>
+      <distStmt><distrbtr URI="https://example.org">Archive</distrbtr><distDate date="2020-05-01"/></distStmt>
+      <holdings URI="https://hdl.handle.net/1/2" xml:lang="en"/>
+    </citation>
+    <stdyInfo>
+      <subject><keyword>income</keyword><topcClas>Economics</topcClas></subject>
+      <abstract>An <b>abstract</b> with markup.</abstract>
+      <sumDscr><timePrd event="start" date="2019"/><timePrd event="end" date="2020"/><nation>Norway</nation></sumDscr>
+    </stdyInfo>
+  </stdyDscr>
+  <fileDscr><fileTxt><fileType>text/csv</fileType></fileTxt></fileDscr>
+</codeBook>
+"""
+
+
+@pytest.fixture
+def ddi_file(tmp_path):
+    filename = tmp_path.joinpath('record.xml')
+    filename.write_text(DDI)
+    return str(filename)
+
+
+@pytest.mark.parametrize('filename', sorted(glob.glob(os.path.join(TESTDATA_DIR, '**', '*.xml'), recursive=True)))
+def test_fulltext(filename):
+    assert StreamParser(filename).fulltext == XMLParser(filename).fulltext
+
+
+def test_find(ddi_file):
+    parser = StreamParser(ddi_file, paths=['titl', 'citation.holdings', 'timePrd', 'rspStmt'])
+    bs4 = XMLParser(ddi_file)
+    for name, kwargs in [('titl', {}), ('citation.holdings', {}), ('timePrd', {'event': 'end'}),
+                         ('rspStmt.AuthEnty', {}), ('keyword', {})]:
+        assert parser.find(name, **kwargs) == bs4.find(name, **kwargs)
+    assert parser.doc.find('holdings')['URI'] == 'https://hdl.handle.net/1/2'
+    assert parser.doc.find('timePrd', event='start').get('date') == '2019'
+
+
+def test_pruned(ddi_file):
+    parser = StreamParser(ddi_file, paths=['titl', 'stdyInfo.keyword'])
+    assert parser.doc.find('titl').text == 'Survey & Panel'
+    assert parser.doc.find('stdyInfo').text == 'income'
+    assert parser.doc.find('subject').text == 'income'
+    assert parser.doc.find('abstract') is None
+    assert parser.doc.find('fileDscr') is None
+    # not declared, answered from the whole record
+    assert parser.find('abstract') == ['An abstract with markup.']
+
+
+def test_strict(ddi_file, monkeypatch):
+    monkeypatch.setattr(StreamParser, 'STRICT', True)
+    parser = StreamParser(ddi_file, paths=['titl'])
+    assert parser.find('titl') == ['Survey & Panel']
+    with pytest.raises(MappingError):
+        parser.find('abstract')
+
+
+@pytest.mark.parametrize('identifier,path', [
+    ('deims', 'deims'),
+    ('enes', 'enes-iso'),
+    ('envidat_iso19139', 'envidat-iso19139'),
+])
+def test_stream_communities(identifier, path, monkeypatch):
+    # all names searched by the streaming communities are declared in their paths
+    monkeypatch.setattr(StreamParser, 'STRICT', True)
+    _community = community(identifier)
+    assert _community.STREAM
+    filenames = sorted(glob.glob(os.path.join(TESTDATA_DIR, path, '**', '*.xml'), recursive=True))
+    assert filenames
+    for filename in filenames:
+        doc = _community.read(filename)
+        assert doc.fulltext
+
+
+def test_ddi25_reader(ddi_file):
+    reader = build_reader(SchemaType.DDI25)
+    stream_reader = build_reader(SchemaType.DDI25, stream=True)
+    assert stream_reader.DOC_PARSER.func is StreamParser
+    doc = reader.read(ddi_file, url='https://example.org/oai')
+    stream_doc = stream_reader.read(ddi_file, url='https://example.org/oai')
+    for name in ['title', 'creator', 'doi', 'pid', 'keywords', 'description', 'contact', 'publication_year',
+                 'language', 'temporal_coverage_begin_date', 'temporal_coverage_end_date', 'format', 'fulltext']:
+        assert getattr(stream_doc, name) == getattr(doc, name)
@@ -0,0 +1,54 @@
+import pytest
+
+from mdingestion.parser import XMLParser
+
+XML = """<?xml version="1.0" encoding="UTF-8"?>
+<record xmlns:dc="http://purl.org/dc/elements/1.1/" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">
+  <header><identifier>oai:1</identifier></header>
+  <metadata>
+    <dc:title xml:lang="en">First</dc:title>
+    <dc:coverage xsi:type="dcterms:Box">1 2 3 4</dc:coverage>
+    <dc:coverage>Berlin</dc:coverage>
+    <nested><dc:title>Second</dc:title><identifier>md:1</identifier></nested>
+  </metadata>
+</record>
+"""
+
+
+@pytest.fixture
+def parser(tmp_path):
+    filename = tmp_path.joinpath('record.xml')
+    filename.write_text(XML)
+    return XMLParser(str(filename))
+
+
+@pytest.mark.parametrize('name,kwargs,expected', [
+    ('title', {}, ['First', 'Second']),
+    ('dc:title', {}, ['First', 'Second']),
+    ('identifier', {}, ['oai:1', 'md:1']),
+    ('header.identifier', {}, ['oai:1']),
+    ('metadata.nested.identifier', {}, ['md:1']),
+    ('metadata.missing.identifier', {}, []),
+    ('coverage', {'xsi:type': 'dcterms:Box'}, ['1 2 3 4']),
+    ('coverage', {'attrs': {'xsi:type': True}}, ['1 2 3 4']),
+    ('coverage', {'attrs': {'xsi:type': None}}, ['Berlin']),
+    ('title', {'limit': 1}, ['First']),
+    ('identifier', {'limit': 1}, ['oai:1']),
+    ('identifier', {'limit': 5}, ['oai:1', 'md:1']),
+    ('coverage', {'attrs': {'xsi:type': None}, 'limit': 1}, ['Berlin']),
+])
+def test_find(parser, name, kwargs, expected):
+    assert parser.find(name, **kwargs) == expected
+    assert parser._find(name, **kwargs) == expected
+
+
+def test_compile_limit():
+    # searches with a limit are answered from the index
+    assert XMLParser.compile('identifier', limit=1) == ('identifier', ['identifier'], {}, 1)
+
+
+def test_index(parser):
+    metadata = parser.index.find('metadata')
+    assert parser.index.find('record') is parser.doc.record
+    assert [tag.text for tag in parser.index.find_all('title', within=metadata.nested)] == ['Second']
+    assert parser.index.find_all('header', within=metadata) == []
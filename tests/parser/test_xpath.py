@@ -0,0 +1,89 @@
+import os
+import glob
+
+import pytest
+
+from mdingestion.parser import XMLParser, XPathParser
+from mdingestion.parser.xpath import text
+from mdingestion.community import community
+from mdingestion.writer import B2FWriter
+
+from tests.common import TESTDATA_DIR
+
+XML = """<?xml version="1.0" encoding="UTF-8"?>
+<?xml-stylesheet href="a.xsl"?>
+<!-- top comment -->
+<record xmlns:dc="http://purl.org/dc/elements/1.1/" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">
+  <metadata>
+    <dc:title xml:lang="en">A &amp; B<!--c--> tail <![CDATA[cd<x>]]></dc:title>
+    <dc:spatial xmlns:q="urn:q"><q:box xsi:type="dcterms:Box">s</q:box></dc:spatial>
+    <dc:title>plain</dc:title>
+  </metadata>
+</record>
+"""
+
+
+@pytest.fixture
+def xml_file(tmp_path):
+    filename = tmp_path.joinpath('record.xml')
+    filename.write_text(XML)
+    return str(filename)
+
+
+@pytest.mark.parametrize('name,kwargs', [
+    ('title', {}),
+    ('dc:title', {}),
+    ('title', {'xml:lang': 'en'}),
+    ('title', {'xml:lang': None}),
+    ('box', {'xsi:type': True}),
+    ('metadata.spatial.box', {}),
+    ('metadata.title', {'limit': 1}),
+    ('missing', {}),
+    ('missing.title', {}),
+])
+def test_find(xml_file, name, kwargs):
+    assert XPathParser(xml_file).find(name, **kwargs) == XMLParser(xml_file).find(name, **kwargs)
+
+
+def test_index(xml_file):
+    parser = XPathParser(xml_file)
+    index = parser.doc.index
+    assert [text(element) for element in index.find_all('title')] == ['A & B tail cd<x>', 'plain']
+    assert index.find_all('dc:title', attrs={'xml:lang': 'en'}) == index.find_all('title')[:1]
+    spatial = index.find('spatial')
+    assert [text(element) for element in index.find_all('box', within=spatial)] == ['s']
+    assert index.find_all('title', within=spatial) == []
+    # like the descendant-or-self axis the search within an element includes the element
+    assert index.find_all('spatial', within=spatial) == [spatial]
+    # the record is indexed once for all searches
+    parser.find('title')
+    parser.find('metadata.spatial.box')
+    assert parser.doc.index is index
+
+
+def test_doc(xml_file):
+    doc = XPathParser(xml_file).doc
+    bs4 = XMLParser(xml_file).doc
+    assert doc.find('title').attrs == bs4.find('title').attrs
+    assert doc.find('spatial').attrs == bs4.find('spatial').attrs
+    assert doc.find('box')['xsi:type'] == 'dcterms:Box'
+    assert doc.metadata.spatial.text == bs4.metadata.spatial.text
+    assert [tag.text for tag in doc.find_all('title')] == [tag.text for tag in bs4.find_all('title')]
+    assert doc.find('missing') is None
+
+
+def test_fulltext(xml_file):
+    assert XPathParser(xml_file).fulltext == XMLParser(xml_file).fulltext
+
+
+@pytest.mark.parametrize('identifier', ['darus', 'seanoe', 'deims', 'pdc'])
+def test_same_b2f_json(identifier):
+    reader = community(identifier)
+    xpath_reader = community(identifier)
+    reader.STREAM = xpath_reader.STREAM = False
+    reader.XPATH = False
+    assert reader.reader.DOC_PARSER is XMLParser
+    assert xpath_reader.reader.DOC_PARSER is XPathParser
+    writer = B2FWriter()
+    for filename in glob.glob(os.path.join(TESTDATA_DIR, identifier, 'raw', '*.xml')):
+        assert writer.json(xpath_reader.read(filename)) == writer.json(reader.read(filename))
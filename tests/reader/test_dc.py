@@ -2,7 +2,8 @@ import os
 
 import pytest
 
-from mdingestion.reader import DublinCoreReader
+from mdingestion.reader import DublinCoreReader, build_reader
+from mdingestion.service_types import SchemaType
 
 from tests.common import TESTDATA_DIR
 
@@ -40,3 +41,34 @@ def test_dc_seanoe_bbox():
     doc = reader.read(xml_file)
     # <dc:coverage>North 37.30134, South 37.2888, East -32.275618, West -32.27982</dc:coverage>
     assert doc.spatial_coverage == '(-32.280W, 37.289S, -32.276E, 37.301N)'
+
+
+PERIOD = """<?xml version="1.0" encoding="UTF-8"?>
+<record xmlns="http://www.openarchives.org/OAI/2.0/">
+  <header><identifier>oai:example.org:1</identifier><datestamp>2020-01-01</datestamp></header>
+  <metadata>
+    <oai_dc:dc xmlns:oai_dc="http://www.openarchives.org/OAI/2.0/oai_dc/" xmlns:dc="http://purl.org/dc/elements/1.1/"
+        xmlns:dcterms="http://purl.org/dc/terms/" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">
+      <dc:title>Festival</dc:title>
+      <{tag} xsi:type="dcterms:Period">{period}</{tag}>
+    </oai_dc:dc>
+  </metadata>
+</record>
+"""
+
+
+@pytest.mark.parametrize('xpath', [False, True])
+@pytest.mark.parametrize('tag,period,begin,end', [
+    ('dcterms:temporal', 'name=Perth International Arts Festival, 2000; start=2000-01-26; end=2000-02-20; '
+                         'scheme=W3C-DTF;', '2000-01-26T00:00:00Z', '2000-02-20T00:00:00Z'),
+    ('dc:coverage', 'start=2000-01-26; end=2000-02-20;', '2000-01-26T00:00:00Z', '2000-02-20T00:00:00Z'),
+    ('dcterms:temporal', '2000-01-26, 2000-02-20', '2000-01-26T00:00:00Z', '2000-02-20T00:00:00Z'),
+    ('dcterms:temporal', 'start=2000-01-26', '2000-01-26T00:00:00Z', ''),
+])
+def test_dc_period(tmp_path, xpath, tag, period, begin, end):
+    xml_file = tmp_path / 'period.xml'
+    xml_file.write_text(PERIOD.format(tag=tag, period=period))
+    reader = build_reader(SchemaType.DublinCore, xpath=xpath)
+    doc = reader.read(xml_file.as_posix(), url='https://example.org/oai')
+    assert doc.temporal_coverage_begin_date == begin
+    assert doc.temporal_coverage_end_date == end
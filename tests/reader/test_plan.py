@@ -0,0 +1,51 @@
+import os
+
+from mdingestion.reader import DataCiteReader
+from mdingestion.reader.plan import Plan, Field, Method
+from mdingestion.parser import XMLParser, XPathParser
+
+from tests.common import TESTDATA_DIR
+
+XML_FILE = os.path.join(TESTDATA_DIR, 'darus', 'raw', '02baec53-8e79-5611-981e-11df59b824e4.xml')
+
+
+class PlanReader(DataCiteReader):
+    FIELDS = Plan([
+        ('title', 'title'),
+        ('doi', Field('resource.identifier', select='doi')),
+        ('keywords', 'subject'),
+        ('discipline', Method('discipline', doc=True)),
+        (None, Method('update_version', doc=True)),
+    ])
+
+    def update_version(self, doc):
+        doc.version = 'v1'
+
+
+def test_plan():
+    reader = PlanReader()
+    doc = reader.read(XML_FILE, url='https://darus.uni-stuttgart.de/oai')
+    assert 'Deep enzymology data' in doc.title[0]
+    assert doc.doi == 'https://doi.org/10.18419/darus-629'
+    assert 'Medicine' in doc.discipline
+    assert doc.version == 'v1'
+    assert list(reader.timings) == ['title', 'doi', 'keywords', 'discipline', 'update_version']
+    assert PlanReader.FIELDS.paths == ['title', 'resource.identifier', 'subject']
+
+
+def test_compiled_once_per_parser():
+    plan = PlanReader.FIELDS
+    assert plan.compile(XMLParser) is plan.compile(XMLParser)
+    assert plan.compile(XPathParser) is not plan.compile(XMLParser)
+    reader = PlanReader()
+    reader.DOC_PARSER = XPathParser
+    doc = reader.read(XML_FILE, url='https://darus.uni-stuttgart.de/oai')
+    assert doc.doi == 'https://doi.org/10.18419/darus-629'
+    assert XPathParser in plan._compiled
+
+
+def test_datacite_timings():
+    reader = DataCiteReader()
+    reader.read(XML_FILE, url='https://darus.uni-stuttgart.de/oai')
+    assert list(reader.timings) == [name for name, _ in DataCiteReader.FIELDS.fields]
+    assert 'geometry' in reader.timings
@@ -32,6 +32,11 @@ def test_load_list():
     assert 'Humanities' in classifier.discipines
 
 
+def test_get_classifier():
+    assert classify.get_classifier() is classify.get_classifier()
+    assert 'Humanities' in classify.get_classifier().discipines
+
+
 def test_tokenize():
     assert classify.tokenize('Social Sciences') == [
         'sciences',
@@ -96,3 +101,31 @@ def test_map_discipline():
         'Life Sciences',
         'Natural Sciences',
     ]
+
+
+def test_map_discipline_memoized():
+    classifier = classify.Classify()
+    expected = [
+        'Astrophysics and Astronomy',
+        'Natural Sciences',
+        'Physics',
+    ]
+    assert classifier.map_discipline('Astrophysics and Astronomy') == expected
+    misses = classifier._token_matches.cache_info().misses
+    assert classifier.map_discipline('Astrophysics and Astronomy') == expected
+    assert classifier._token_matches.cache_info().misses == misses
+    assert classifier._token_matches.cache_info().maxsize == classify.TOKEN_CACHE_SIZE
+    assert classifier.map_discipline('Astronomy', default='Physics') == ['Physics']
+
+
+def test_discipline_index():
+    classifier = classify.Classify()
+    index = classify.DisciplineIndex(classifier.discipines)
+    texts = [
+        'Humanities', 'Astrophysics and Astronomy', 'Engineering', 'Scientific satellites',
+        'Aerospace telemetry', 'Antarctica', 'Sampling drilling ice', 'Earth and Environmental Sciences',
+        'Medicine', 'Health and Life Sciences', 'Chemistry', 'Life Science', 'rock mechanics',
+    ]
+    for token in classify.tokenize(texts):
+        expected = [name for name in classifier.discipines if classify.similarity(token, name) >= 0.9]
+        assert sorted(index.match(token)) == sorted(expected)
@@ -3,3 +3,31 @@ from mdingestion import config
 
 def test_to_ignore():
     assert len(config.to_ignore()) > 0
+
+
+def test_to_ignore_empty(monkeypatch):
+    calls = []
+
+    def read_ignore_list():
+        calls.append(1)
+        return []
+
+    monkeypatch.setattr(config, 'TO_IGNORE', None)
+    monkeypatch.setattr(config, 'read_ignore_list', read_ignore_list)
+    assert config.to_ignore() == []
+    assert config.to_ignore() == []
+    assert len(calls) == 1
+
+
+def test_compile_matcher():
+    patterns = config.to_ignore()
+    matcher = config.compile_matcher(patterns)
+    urls = [
+        'https://www.leo.org',
+        'http://ebd.csic.es/eubon/datasets/Census/be322409-0f52-489f-96bd-b4d990f076db',
+        'http://ebd.csic.es/eubon/datasets/Census/other',
+        'https://www.umweltbundesamt.at/en/services/services_pollutants/services_airquality/en_ref_zoebelboden/',
+    ]
+    for url in urls:
+        assert matcher(url) == any(pattern.match(url) for pattern in patterns)
+    assert config.compile_matcher([])('https://www.leo.org') is False
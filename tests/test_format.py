@@ -1,3 +1,6 @@
+import pytest
+from dateutil import parser as date_parser
+
 from mdingestion import format
 
 
@@ -26,6 +29,22 @@ def test_format_datetime():
     assert '2020-05-19T00:00:00Z' == format.format_datetime('2020-05-19T00:00:00')
 
 
+@pytest.mark.parametrize('text', [
+    # dates of the test records
+    '2019', '2018-12-06', '\n2018-12-31\n', '20140918', '1968-07-17T00:00:00+0100', '2020-06-26T12:15:39Z',
+    '1985-12-18T23:15:00', '2019-04-30T10:20:27.000+02:00', '2016-2019', 'None-12-31',
+    '2021-02', '2020-02-30', '0099', '2020-05-19 10:00', '2020-05-19T10:00:00-05:30', '2020/05/19',
+])
+def test_parse_datetime(text):
+    try:
+        expected = date_parser.parse(text)
+    except Exception:
+        with pytest.raises(Exception):
+            format.parse_datetime(text)
+    else:
+        assert format.parse_datetime(text) == expected
+
+
 def test_format_date():
     assert '2020-05-19' == format.format_date('2020-05-19')
 
@@ -96,3 +115,15 @@ def test_is_null_value():
     assert format.is_null_value(0) is False
     assert format.is_null_value(False) is False
     assert format.is_null_value(True) is False
+
+
+def test_memoized_formatters():
+    assert [func.__name__ for func in format.MEMOIZED] == \
+        ['format_datetime', 'format_language', 'format_email', 'format_url']
+    stats = format.cache_stats()
+    assert format.format_language('de') == 'German'
+    assert format.format_language('de') == 'German'
+    assert format.cache_stats(since=stats)['format_language'] == dict(hits=1, misses=1)
+    # unhashable values are formatted without the cache
+    assert format.format_url(['https://b2find.eudat.eu']) == ''
+    assert format.cache_stats(since=stats)['format_url'] == dict(hits=0, misses=0)
@@ -1,5 +1,10 @@
 import os
+import time
 
+import requests
+
+from mdingestion import linkcheck
+from mdingestion.core import B2FDoc
 from mdingestion.reader import DataCiteReader
 from mdingestion.linkcheck import LinkChecker, ignore_url
 
@@ -21,3 +26,19 @@ def test_ignore_url():
     assert ignore_url(
         'http://ebd.csic.es/eubon/datasets/Censo+aéreo+1993/be322409-0f52-489f-96bd-b4d990f076db'
     )
+
+
+def test_linkcheck_wait(monkeypatch):
+    def head(url, **kwargs):
+        time.sleep(0.05)
+        raise requests.ConnectionError('refused')
+
+    monkeypatch.setattr(linkcheck.requests, 'head', head)
+    lc = LinkChecker()
+    for i in range(10):
+        # docs without metadata access must not stop the worker threads
+        doc = B2FDoc('test.xml')
+        doc.doi = f'https://doi.org/10.1234/{i}'
+        lc.add(doc)
+    lc.wait()
+    assert len(lc.broken) == 10
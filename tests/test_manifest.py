@@ -0,0 +1,58 @@
+import json
+
+from mdingestion.manifest import Manifest
+
+
+def read_lines(filename):
+    return [json.loads(line) for line in filename.read_text().splitlines()]
+
+
+def test_manifest_append_changes(tmp_path):
+    filename = tmp_path / 'test.manifest.jsonl'
+    manifest = Manifest(filename)
+    for uid in ('a', 'b', 'c', 'd'):
+        manifest.update(uid, raw=f'hash-{uid}', written=True)
+    manifest.save()
+    assert len(read_lines(filename)) == 4
+    manifest = Manifest(filename)
+    # unchanged entries are not written again
+    manifest.update('a', raw='hash-a', written=True)
+    manifest.update('b', raw='hash-b2')
+    manifest.save()
+    assert read_lines(filename)[-1] == ['b', dict(raw='hash-b2', written=True)]
+    assert len(read_lines(filename)) == 5
+    manifest = Manifest(filename)
+    assert manifest.get('b') == dict(raw='hash-b2', written=True)
+
+
+def test_manifest_compact(tmp_path):
+    filename = tmp_path / 'test.manifest.jsonl'
+    manifest = Manifest(filename)
+    manifest.update('a', version='1')
+    manifest.save()
+    for version in ('2', '3', '4'):
+        manifest = Manifest(filename)
+        manifest.update('a', version=version)
+        manifest.save()
+    # the replaced lines are dropped
+    assert len(read_lines(filename)) <= 2
+    assert Manifest(filename).get('a') == dict(version='4')
+
+
+def test_manifest_broken_line(tmp_path):
+    filename = tmp_path / 'test.manifest.jsonl'
+    filename.write_text('["a", {"version": "1"}]\n["b", {"vers')
+    manifest = Manifest(filename)
+    assert manifest.get('a') == dict(version='1')
+    assert manifest.get('b') == {}
+
+
+def test_manifest_legacy_json(tmp_path):
+    legacy = tmp_path / 'test.manifest.json'
+    legacy.write_text(json.dumps({'a': {'version': '1'}}))
+    filename = tmp_path / 'test.manifest.jsonl'
+    manifest = Manifest(filename)
+    assert manifest.get('a') == dict(version='1')
+    manifest.save()
+    assert read_lines(filename) == [['a', dict(version='1')]]
+    assert not legacy.exists()
@@ -0,0 +1,54 @@
+import os
+import shutil
+from datetime import datetime
+
+from mdingestion.store import RecordStore, STORE_DIR, get_store, open_record
+from mdingestion.walker import Walker
+from mdingestion.community import community
+
+from .common import TESTDATA_DIR
+
+
+def test_put_and_get(tmp_path):
+    store = RecordStore(tmp_path / STORE_DIR)
+    assert store.put('a', b'<record>a</record>', datestamp='2022-01-01') is True
+    assert store.put('b', b'<record>b</record>') is True
+    # unchanged record is not appended
+    assert store.put('a', b'<record>a</record>') is False
+    assert store.put('a', b'<record>A</record>') is True
+    assert store.get('a') == b'<record>A</record>'
+    assert store.get('c') is None
+    # reload index
+    store = RecordStore(tmp_path / STORE_DIR)
+    assert len(store) == 2
+    assert store.get('a') == b'<record>A</record>'
+    assert store.get('b') == b'<record>b</record>'
+    assert len(list(store.entries(ext='.xml'))) == 2
+    assert len(list(store.entries(ext='.json'))) == 0
+    assert len(list(store.entries(fromdate=datetime(2120, 5, 1)))) == 0
+
+
+def test_segments(tmp_path):
+    store = RecordStore(tmp_path / STORE_DIR)
+    store.SEGMENT_SIZE = 100
+    for i in range(10):
+        store.put(f'{i}', os.urandom(50))
+    assert len(list(store.path.glob('segment-*.dat'))) == 10
+    assert store.get('3') is not None
+
+
+def test_walk_and_read_store(tmp_path):
+    raw = tmp_path / 'darus' / 'raw'
+    store = get_store(raw)
+    for filename in Walker(TESTDATA_DIR).walk(path=os.path.join('darus', 'raw'), ext='.xml'):
+        with open(filename, 'rb') as fp:
+            store.put(os.path.basename(filename)[:-4], fp.read())
+    # a record file with the same uid is not walked twice
+    shutil.copy(os.path.join(TESTDATA_DIR, 'darus', 'raw', '02baec53-8e79-5611-981e-11df59b824e4.xml'), raw)
+    files = list(Walker(tmp_path.as_posix()).walk(path=os.path.join('darus', 'raw'), ext='.xml'))
+    assert len(files) == 2
+    assert raw.joinpath('02baec53-8e79-5611-981e-11df59b824e4.xml').as_posix() in files
+    with open_record(sorted(files)[-1]) as fp:
+        assert fp.read().startswith('<record')
+    doc = community('darus').read(sorted(files)[-1])
+    assert doc.title
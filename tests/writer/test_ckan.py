@@ -1,10 +1,12 @@
 import os
+import json
 
 import pytest
 
 from mdingestion.community.darus import DarusDatacite
 from mdingestion.community.herbadrop import Herbadrop
 from mdingestion.writer import CKANWriter
+from mdingestion.validator import Validator
 
 from tests.common import TESTDATA_DIR
 
@@ -43,3 +45,18 @@ def test_herbdrop_json():
         fields[field['key']] = field['value']
     assert 'Gentiana ×marcailhouana Rouy' in fields['fulltext']
     assert 'StillImage|PRESERVED_SPECIMEN' in fields['fulltext']
+
+
+def test_write_validated_fields(tmp_path):
+    xmlfile = os.path.join(TESTDATA_DIR, 'darus', 'raw', '02baec53-8e79-5611-981e-11df59b824e4.xml')
+    doc = DarusDatacite().read(xmlfile)
+    fields = Validator(linkcheck=False).check(doc)['fields']
+    writer = CKANWriter()
+    assert writer.json(doc, fields=fields) == writer.json(doc)
+    filename = tmp_path.joinpath('raw', '02baec53-8e79-5611-981e-11df59b824e4.xml').as_posix()
+    data = writer.write(doc, filename, fields=fields)
+    with writer.output(filename).open() as fp:
+        assert json.load(fp) == data
+    expected = writer.json(doc)
+    writer.update_version(expected)
+    assert data['version'] == expected['version']